@@ -0,0 +1,175 @@
+import json
+
+from Package import parse_time_of_day
+from StatusTimeline import AT_HUB, CANCELLED, DELIVERED, EN_ROUTE, format_time_of_day
+
+# Names used for the delivery statuses in query results
+status_names = {AT_HUB: "at_hub", EN_ROUTE: "en_route", DELIVERED: "delivered", CANCELLED: "cancelled"}
+
+
+# Returns the JSON-ready status and delivery time of the Package at the position in the timeline
+def package_status_result(timeline, position, status):
+    result = {
+        "package_id": timeline.package_ids[position],
+        "status": status_names[status],
+    }
+    if status == CANCELLED:
+        result["cancelled_time"] = timeline.cancelled_text[position]
+    elif status != AT_HUB and timeline.delivered_text[position] is None:
+        # A Package cancelled while it is on a Truck is en route until the cancellation, and is never delivered
+        result["cancelled_time"] = timeline.cancelled_text[position]
+    elif status != AT_HUB:
+        result["delivery_time"] = timeline.delivered_text[position]
+    return result
+
+
+# Returns the JSON-ready mileage of every Truck and of the whole fleet at the provided time
+def fleet_mileage_result(timeline, seconds):
+    trucks = []
+    total_mileage = 0
+    for truck_id, mileage in timeline.get_fleet_mileage(seconds):
+        trucks.append({"truck_id": truck_id, "mileage": round(mileage, 2)})
+        total_mileage += mileage
+    return {"trucks": trucks, "total_mileage": round(total_mileage, 2)}
+
+
+# Returns the JSON-ready list of stops the Truck had reached at the provided time, in the order it drove them
+def truck_route_result(timeline, truck_id, seconds):
+    stops = [{"time": format_time_of_day(stop_seconds), "mileage": round(mileage, 2), "address": address}
+             for stop_seconds, mileage, address in timeline.get_truck_route(truck_id, seconds)]
+    return {"truck_id": truck_id, "stops": stops}
+
+
+# Space-Time Complexity: O(1) for a cached result, otherwise the time of compute_result
+# Returns the result cached under the key, or computes it with compute_result and caches it if the cache is provided
+def get_cached_result(cache, key, compute_result):
+    if cache is None:
+        return compute_result()
+    result = cache.get(key)
+    if result is None:
+        result = compute_result()
+        cache.put(key, result)
+    return result
+
+
+# Space-Time Complexity: O(1)
+# Returns the time of the query in seconds since midnight, or None if its time is missing or not a time of day
+def get_query_seconds(query):
+    time_of_day = parse_time_of_day(str(query.get("time", "")))
+    if time_of_day is None or time_of_day.days > 0:
+        return None
+    return time_of_day.total_seconds()
+
+
+# Space-Time Complexity: O(1) for package_status, O(T log M) for fleet_mileage, O(log M + S) for truck_route, O(N) for
+# report
+# Answers a single query and returns the result as a dictionary. Supported query types are:
+#   {"type": "package_status", "package_id": 9, "time": "10:30 AM"}
+#   {"type": "fleet_mileage", "time": "10:30 AM"}
+#   {"type": "truck_route", "truck_id": 1, "time": "10:30 AM"}
+#   {"type": "report", "time": "10:30 AM"}
+# An optional "id" field is copied to the result so callers can match results to queries
+# If a QueryCache is provided, package_status results are cached under (package ID, minute of the day) and
+# fleet_mileage results under (None, minute of the day), so repeated lookups are answered without touching the timeline
+# If report_statuses is provided, report queries take every Package's status from it, keyed by the time of the report
+def answer_query(timeline, query, cache=None, report_statuses=None):
+    result = {}
+    if "id" in query:
+        result["id"] = query["id"]
+    query_type = query.get("type")
+    result["type"] = query_type
+
+    seconds = get_query_seconds(query)
+    if seconds is None:
+        result["error"] = "Invalid or missing time, expected the format [HOUR:MINUTE AM/PM]"
+        return result
+    result["time"] = format_time_of_day(seconds)
+
+    if query_type == "package_status":
+        package_id = query.get("package_id")
+        if not isinstance(package_id, int) or not timeline.has_package(package_id):
+            result["error"] = "No package found with the provided ID"
+            return result
+        position = timeline.package_positions[package_id]
+        result.update(get_cached_result(cache, (package_id, int(seconds // 60)),
+                                        lambda: package_status_result(timeline, position,
+                                                                      timeline.get_status(position, seconds))))
+    elif query_type == "fleet_mileage":
+        result.update(get_cached_result(cache, (None, int(seconds // 60)),
+                                        lambda: fleet_mileage_result(timeline, seconds)))
+    elif query_type == "truck_route":
+        truck_id = query.get("truck_id")
+        if not isinstance(truck_id, int) or truck_id not in timeline.truck_route_addresses:
+            result["error"] = "No truck found with the provided ID"
+            return result
+        result.update(truck_route_result(timeline, truck_id, seconds))
+    elif query_type == "report":
+        if report_statuses is not None and seconds in report_statuses:
+            statuses = report_statuses[seconds]
+        else:
+            statuses = [timeline.get_status(position, seconds) for position in range(len(timeline.package_ids))]
+        result["packages"] = [package_status_result(timeline, position, status)
+                              for position, status in enumerate(statuses)]
+        result.update(fleet_mileage_result(timeline, seconds))
+    else:
+        result["error"] = "Unknown query type, expected package_status, fleet_mileage, truck_route or report"
+
+    return result
+
+
+# Space-Time Complexity: O(L), where L is the length of the line
+# Returns the JSON query on the line as a dictionary, or None if the line is not a valid JSON object
+def parse_query_line(line):
+    try:
+        query = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(query, dict):
+        return query
+    return None
+
+
+# Space-Time Complexity: as described in answer_query
+# Answers the parsed query and returns the JSON result, where a query of None produces an error result
+def format_query_result(timeline, query, cache=None, report_statuses=None):
+    if query is None:
+        return json.dumps({"error": "Query is not a JSON object"})
+    return json.dumps(answer_query(timeline, query, cache, report_statuses))
+
+
+# Space-Time Complexity: as described in answer_query
+# Answers the JSON query on the line and returns the JSON result, or None if the line is blank. A line that is not a
+# valid JSON object produces an error result
+def answer_query_line(timeline, line, cache=None):
+    line = line.strip()
+    if line == "":
+        return None
+    return format_query_result(timeline, parse_query_line(line), cache)
+
+
+# Space-Time Complexity: O(N log N + R log R + N * R) for the R distinct report times, then O(Q) queries, each answered
+# as described in answer_query
+# Reads one JSON query per line from the input file and writes one JSON result per line to the output file. Blank
+# lines are skipped and lines that are not valid JSON objects produce an error result. When flush is True every result
+# is flushed as soon as it is written, so a caller streaming queries through a pipe receives each answer right away.
+# Otherwise the whole file is read first, and the statuses for every report time it asks for are found in one sweep
+# through the timeline rather than one pass over every Package per report
+def run_batch_queries(timeline, input_file, output_file, flush=False):
+    if flush:
+        for line in input_file:
+            result_line = answer_query_line(timeline, line)
+            if result_line is None:
+                continue
+
+            output_file.write(result_line + "\n")
+            output_file.flush()
+        return
+
+    queries = [parse_query_line(line) for line in (line.strip() for line in input_file) if line != ""]
+    report_seconds = {get_query_seconds(query) for query in queries
+                      if query is not None and query.get("type") == "report"}
+    report_seconds.discard(None)
+    report_statuses = dict(timeline.get_statuses_at_times(report_seconds))
+
+    for query in queries:
+        output_file.write(format_query_result(timeline, query, report_statuses=report_statuses) + "\n")
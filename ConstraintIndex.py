@@ -0,0 +1,234 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+
+# Record of a group of Packages that must be delivered together and can be loaded onto a Truck: the representative
+# Package ID of the group, its Packages that are still waiting at the hub, the number of them, the time the last of them
+# arrives at the hub (None if none of them are delayed) and the Truck the group is restricted to (None for any Truck)
+AssignableGroup = namedtuple("AssignableGroup", ["group_id", "packages", "size", "arrival_time", "required_truck"])
+
+
+class ConstraintIndex:
+    # ConstraintIndex constructor which is built once after the Packages are loaded into the HashTable
+    # The index stores:
+    #   - union-find groups of Packages that must be delivered together on the same Truck and trip
+    #   - the Truck each group is restricted to, if any of its Packages can only be on a specific Truck
+    #   - for every Truck restriction, the groups with waiting Packages that are all available at the hub and a list of
+    #     the delayed groups sorted by the time the last of their Packages arrives at the hub
+    # Groups are removed from the pools as they are assigned, so the groups a Truck can load at a given time are found
+    # without rescanning the HashTable or reading any special notes, and a group is never offered before all of its
+    # Packages have arrived
+    def __init__(self, ht):
+        self.parent = {}
+        self.group_members = {}
+        self.group_required_trucks = {}
+        self.packages = {}
+
+        # IDs of Packages whose special notes name a Package that has not been added yet, keyed by the missing ID
+        self.pending_associations = {}
+
+        # Dictionaries keyed by a Truck ID (or None for groups that can be on any Truck) holding the representative IDs
+        # of the groups available from the start of the day, and (arrival time, representative ID) pairs of the groups
+        # delayed until a later time
+        self.available_groups = {}
+        self.delayed_groups = {}
+
+        # The pool each group with waiting Packages is stored in, along with the time its last Package arrives (None if
+        # none of them are delayed), keyed by representative ID
+        self.group_pool = {}
+        self.group_arrival_time = {}
+
+        # Space-Time Complexity: O(N)
+        # Union every Package with the Packages its special notes say it must be delivered with
+        for package in ht.values():
+            self.register(package)
+
+        # Space-Time Complexity: O(N log N)
+        # Place every group with unassigned Packages in the pool of the Truck it is restricted to
+        for package in ht.values():
+            self.place_in_pool(package)
+
+
+    # Space-Time Complexity: O(G log N), where G is the size of the Package's group
+    # Adds a Package that arrived after the index was built, such as one from a manifest received during the day, to
+    # its group and to the pool of assignable Packages
+    def add_package(self, package):
+        self.register(package)
+
+        # Joining a group can change the Truck the whole group is restricted to and the time it arrives, so the group is
+        # placed in its pool again
+        self.update_group(package.id_number)
+
+
+    # Space-Time Complexity: O(G log N)
+    # Adds the Package to the union-find groups without placing it in a pool
+    def register(self, package):
+        package_id = package.id_number
+        self.packages[package_id] = package
+        self.parent[package_id] = package_id
+        self.group_members[package_id] = [package_id]
+        if package.required_truck is not None:
+            self.group_required_trucks[package_id] = {package.required_truck}
+
+        # Link the Package with the Packages its notes name and with the earlier Packages whose notes named it
+        for associated_package_id in list(package.co_delivery_ids) + self.pending_associations.pop(package_id, []):
+            if associated_package_id in self.parent:
+                self.union(package_id, associated_package_id)
+            else:
+                self.pending_associations.setdefault(associated_package_id, []).append(package_id)
+
+
+    # Space-Time Complexity: O(log N) amortized
+    # Returns the representative Package ID of the group the Package belongs to
+    def find(self, package_id):
+        root = package_id
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        # Compress the path so later lookups reach the representative directly
+        while self.parent[package_id] != root:
+            self.parent[package_id], package_id = root, self.parent[package_id]
+        return root
+
+
+    # Space-Time Complexity: O(G) amortized, O(N) worst-case for a delayed group
+    # Merges the groups of the two Packages along with their member lists and Truck restrictions
+    def union(self, package1_id, package2_id):
+        root1 = self.find(package1_id)
+        root2 = self.find(package2_id)
+        if root1 == root2:
+            return
+
+        # Merge the smaller group into the larger one
+        if len(self.group_members[root1]) < len(self.group_members[root2]):
+            root1, root2 = root2, root1
+        # The merged group is kept under root1, so it has to be placed in its pool again by the caller
+        self.remove_group_from_pool(root2)
+        self.parent[root2] = root1
+        self.group_members[root1].extend(self.group_members.pop(root2))
+        if root2 in self.group_required_trucks:
+            self.group_required_trucks.setdefault(root1, set()).update(self.group_required_trucks.pop(root2))
+
+
+    # Space-Time Complexity: O(G log N)
+    # Places the group of the Package in the pool of the Truck it is restricted to, along with the time the last of its
+    # waiting Packages arrives at the hub. Groups with no waiting Packages are left out of every pool
+    def place_in_pool(self, package):
+        group_id = self.find(package.id_number)
+        if group_id in self.group_pool:
+            return
+
+        waiting_packages = self.get_waiting_packages(group_id)
+        if len(waiting_packages) == 0:
+            return
+        required_trucks = self.group_required_trucks.get(group_id, ())
+        if len(required_trucks) > 1:
+            # The group is split across different required Trucks, so no Truck can take the whole group
+            return
+        pool = None
+        if len(required_trucks) == 1:
+            pool = next(iter(required_trucks))
+
+        # The group can only be loaded once every one of its Packages is at the hub
+        arrival_time = None
+        for waiting_package in waiting_packages:
+            if waiting_package.available_at is not None and \
+                    (arrival_time is None or waiting_package.available_at > arrival_time):
+                arrival_time = waiting_package.available_at
+
+        self.group_pool[group_id] = pool
+        self.group_arrival_time[group_id] = arrival_time
+        if arrival_time is None:
+            self.available_groups.setdefault(pool, {})[group_id] = None
+        else:
+            insort(self.delayed_groups.setdefault(pool, []), (arrival_time, group_id))
+
+
+    # Space-Time Complexity: O(G)
+    # Returns the Packages of the group that are neither assigned to a Truck nor cancelled
+    def get_waiting_packages(self, group_id):
+        waiting_packages = []
+        for package_id in self.group_members[group_id]:
+            package = self.packages[package_id]
+            if not package.is_truck_assigned() and package.cancelled_timestamp is None:
+                waiting_packages.append(package)
+        return waiting_packages
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the IDs of all Packages that must be delivered together with the provided Package, including itself
+    def get_group(self, package_id):
+        return self.group_members[self.find(package_id)]
+
+
+    # Space-Time Complexity: O(log N + K), where K is the number of Packages returned
+    # Returns the list of AssignableGroups that can be assigned to the Truck with the provided ID at the provided time,
+    # which are the groups whose waiting Packages have all arrived at the hub, without considering whether the Truck has
+    # room for them
+    def get_assignable_groups(self, truck_id, time):
+        assignable_groups = []
+
+        for pool in (None, truck_id):
+            group_ids = list(self.available_groups.get(pool, ()))
+
+            # Delayed groups are sorted by the time their last Package arrives, so only the ones that have arrived by
+            # the provided time are visited
+            if pool in self.delayed_groups:
+                delayed_groups = self.delayed_groups[pool]
+                num_arrived = bisect_right(delayed_groups, (time, float("inf")))
+                group_ids.extend(delayed_groups[index][1] for index in range(num_arrived))
+
+            for group_id in group_ids:
+                waiting_packages = self.get_waiting_packages(group_id)
+                assignable_groups.append(AssignableGroup(group_id, waiting_packages, len(waiting_packages),
+                                                         self.group_arrival_time[group_id], pool))
+
+        return assignable_groups
+
+
+    # Space-Time Complexity: O(G log N), O(N) worst-case for delayed groups
+    # Records that the Package was assigned to a Truck. Its group leaves the pool, and any of the group's Packages that
+    # are still waiting are placed back in it
+    def mark_assigned(self, package_id):
+        self.update_group(package_id)
+
+
+    # Space-Time Complexity: O(G log N), O(N) worst-case for delayed groups
+    # Places the group of the Package in its pool again after the arrival time, assignment or cancellation of one of its
+    # Packages changed
+    def update_group(self, package_id):
+        self.remove_from_pool(package_id)
+        self.place_in_pool(self.packages[package_id])
+
+
+    # Space-Time Complexity: O(1) for groups available at the start of the day, O(N) worst-case for delayed ones
+    # Removes the group of the Package from its pool, if it is in one
+    def remove_from_pool(self, package_id):
+        self.remove_group_from_pool(self.find(package_id))
+
+
+    # Space-Time Complexity: O(1) for groups available at the start of the day, O(N) worst-case for delayed ones
+    # Removes the group with the provided representative ID from its pool, if it is in one
+    def remove_group_from_pool(self, group_id):
+        if group_id not in self.group_pool:
+            return
+
+        pool = self.group_pool.pop(group_id)
+        arrival_time = self.group_arrival_time.pop(group_id)
+        if arrival_time is None:
+            del self.available_groups[pool][group_id]
+        else:
+            delayed_groups = self.delayed_groups[pool]
+            del delayed_groups[bisect_left(delayed_groups, (arrival_time, group_id))]
+
+
+    # Space-Time Complexity: O(T), where T is the number of Truck restrictions
+    # Returns the earliest time a delayed group has all of its Packages at the hub, or None if no groups are delayed
+    def get_earliest_delayed_arrival_time(self):
+        earliest_arrival_time = None
+
+        for delayed_groups in self.delayed_groups.values():
+            if len(delayed_groups) > 0:
+                if earliest_arrival_time is None or delayed_groups[0][0] < earliest_arrival_time:
+                    earliest_arrival_time = delayed_groups[0][0]
+
+        return earliest_arrival_time
@@ -0,0 +1,182 @@
+# Deadline of a Package without one, which is also the slack of stops with no deadline after them
+no_deadline = float("inf")
+
+
+class RouteSchedule:
+    # RouteSchedule constructor which evaluates the arrival time at every stop of a route
+    # The route is a list of address indices that starts and ends at the hub, and packages is the parallel list of the
+    # Package delivered at each stop (None for the hub). Along with the arrival times, the schedule stores the slack of
+    # every stop: the longest delay that can be added before reaching the stop without making any Package from that
+    # stop onwards late. Together they answer whether inserting a stop keeps every deadline in O(1) time
+    def __init__(self, distance_matrix, route, packages, start_time, mph):
+        self.distance_matrix = distance_matrix
+        self.route = route
+        self.packages = packages
+        self.start_seconds = round(start_time.total_seconds())
+        self.mph = mph
+        self.arrival_seconds = []
+        self.slack_seconds = []
+        self.update()
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the number of seconds it takes to travel between the two addresses, rounded the same way as the Truck
+    def travel_seconds(self, address1_index, address2_index):
+        return round(self.distance_matrix.distance(address1_index, address2_index) / self.mph * 3600)
+
+
+    # Space-Time Complexity: O(N)
+    # Recomputes the arrival time and slack of every stop after the route changes
+    def update(self):
+        route = self.route
+        arrival_seconds = [self.start_seconds]
+        for stop in range(1, len(route)):
+            arrival_seconds.append(arrival_seconds[stop - 1] + self.travel_seconds(route[stop - 1], route[stop]))
+
+        slack_seconds = [no_deadline] * len(route)
+        for stop in range(len(route) - 2, 0, -1):
+            slack = slack_seconds[stop + 1]
+            deadline = self.packages[stop].deadline
+            # Stops that are already late are left out, so they do not block every insertion ahead of them
+            if deadline is not None and deadline.total_seconds() >= arrival_seconds[stop]:
+                slack = min(slack, deadline.total_seconds() - arrival_seconds[stop])
+            slack_seconds[stop] = slack
+        slack_seconds[0] = slack_seconds[1] if len(route) > 1 else no_deadline
+
+        self.arrival_seconds = arrival_seconds
+        self.slack_seconds = slack_seconds
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the extra miles of inserting the address between the stop at position and the stop after it
+    def insertion_miles(self, position, address_index):
+        distance = self.distance_matrix.distance
+        previous_stop = self.route[position]
+        next_stop = self.route[position + 1]
+        return distance(previous_stop, address_index) + distance(address_index, next_stop) - \
+            distance(previous_stop, next_stop)
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the time the inserted Package would arrive if its address were inserted after the stop at position
+    def insertion_arrival_seconds(self, position, address_index):
+        return self.arrival_seconds[position] + self.travel_seconds(self.route[position], address_index)
+
+
+    # Space-Time Complexity: O(1)
+    # Returns True if inserting the Package after the stop at position delivers it by its deadline without making any
+    # later stop miss its deadline
+    def can_insert(self, position, address_index, package):
+        arrival = self.insertion_arrival_seconds(position, address_index)
+        if package.deadline is not None and arrival > package.deadline.total_seconds():
+            return False
+
+        next_stop = self.route[position + 1]
+        delay = arrival + self.travel_seconds(address_index, next_stop) - self.arrival_seconds[position + 1]
+        return delay <= self.slack_seconds[position + 1]
+
+
+    # Space-Time Complexity: O(N)
+    # Inserts the Package's address after the stop at position
+    def insert(self, position, address_index, package):
+        self.route.insert(position + 1, address_index)
+        self.packages.insert(position + 1, package)
+        self.update()
+
+
+    # Space-Time Complexity: O(N)
+    # Returns the list of Packages on the route that are delivered after their deadline
+    def get_late_packages(self):
+        late_packages = []
+        for stop in range(1, len(self.route) - 1):
+            deadline = self.packages[stop].deadline
+            if deadline is not None and self.arrival_seconds[stop] > deadline.total_seconds():
+                late_packages.append(self.packages[stop])
+        return late_packages
+
+
+# Space-Time Complexity: O(N)
+# Returns the RouteSchedule of the Packages loaded onto the Truck, in the order they are loaded
+def get_truck_schedule(ht, truck, distance_matrix):
+    hub_index = distance_matrix.index_of(truck.hub_address)
+    packages = truck.get_package_list(ht)
+    route = [hub_index] + [distance_matrix.index_of(package.delivery_address) for package in packages] + [hub_index]
+    return RouteSchedule(distance_matrix, route, [None] + packages + [None], truck.time_obj, truck.mph)
+
+
+# Space-Time Complexity: O(N)
+# Returns the position after which inserting the Package's address adds the fewest miles while keeping every deadline on
+# the schedule. If no position keeps every deadline, returns the position where the Package arrives the earliest
+def find_insertion_position(schedule, address_index, package):
+    best_position = None
+    best_miles = None
+    earliest_position = 0
+    earliest_arrival = None
+
+    for position in range(len(schedule.route) - 1):
+        if schedule.can_insert(position, address_index, package):
+            miles = schedule.insertion_miles(position, address_index)
+            if best_miles is None or miles < best_miles:
+                best_position = position
+                best_miles = miles
+
+        arrival = schedule.insertion_arrival_seconds(position, address_index)
+        if earliest_arrival is None or arrival < earliest_arrival:
+            earliest_position = position
+            earliest_arrival = arrival
+
+    if best_position is None:
+        return earliest_position
+    return best_position
+
+
+# Space-Time Complexity: O(N^2)
+# Builds a schedule by cheapest feasible insertion, placing the Packages with the earliest deadlines first so the later
+# insertions have to fit around them. A Package with no feasible position is inserted where it arrives the earliest
+def build_deadline_schedule(ht, truck, distance_matrix):
+    hub_index = distance_matrix.index_of(truck.hub_address)
+    schedule = RouteSchedule(distance_matrix, [hub_index, hub_index], [None, None], truck.time_obj, truck.mph)
+
+    # Packages with deadlines are inserted by earliest deadline, then the rest keep their current relative order
+    packages = truck.get_package_list(ht)
+    deadline_packages = sorted([package for package in packages if package.deadline is not None],
+                               key=lambda package: package.deadline)
+    other_packages = [package for package in packages if package.deadline is None]
+
+    for package in deadline_packages + other_packages:
+        address_index = distance_matrix.index_of(package.delivery_address)
+        schedule.insert(find_insertion_position(schedule, address_index, package), address_index, package)
+
+    return schedule
+
+
+# Space-Time Complexity: O(N) when the current order meets every deadline, O(N^2) when it has to be repaired
+# Checks the Truck's delivery order against the Package deadlines and, if any Package would be late, replaces it with
+# a deadline-aware order built by cheapest feasible insertion when that order has fewer late Packages. Returns the list
+# of Packages that are still scheduled to be delivered late
+def schedule_deadlines(ht, truck, distance_matrix):
+    schedule = get_truck_schedule(ht, truck, distance_matrix)
+    late_packages = schedule.get_late_packages()
+    if len(late_packages) == 0:
+        return late_packages
+
+    repaired_schedule = build_deadline_schedule(ht, truck, distance_matrix)
+    repaired_late_packages = repaired_schedule.get_late_packages()
+    if len(repaired_late_packages) < len(late_packages):
+        truck.packages_id_list = [package.id_number for package in repaired_schedule.packages[1:-1]]
+        return repaired_late_packages
+
+    return late_packages
+
+
+# Space-Time Complexity: O(N)
+# Returns a copy of the list of Packages with the Package inserted at its cheapest feasible position, where the list is
+# the remaining stops of a Truck that reaches the start address at the start time and returns to the hub afterwards
+def insert_remaining_stop(distance_matrix, truck, start_address, start_time, packages, package):
+    hub_index = distance_matrix.index_of(truck.hub_address)
+    route = [distance_matrix.index_of(start_address)] + \
+        [distance_matrix.index_of(remaining_package.delivery_address) for remaining_package in packages] + [hub_index]
+    schedule = RouteSchedule(distance_matrix, route, [None] + list(packages) + [None], start_time, truck.mph)
+
+    position = find_insertion_position(schedule, distance_matrix.index_of(package.delivery_address), package)
+    return packages[:position] + [package] + packages[position:]
@@ -0,0 +1,363 @@
+import heapq
+
+from DeadlineScheduler import insert_remaining_stop
+from Package import AddressCorrection, Cancellation, LateArrival
+from PackageStore import PackageStore
+from Stop import group_stops
+
+# Types of events processed by the simulation. At the same time of day, manifests, Package arrivals and Package updates
+# are processed before Truck events so a Truck at the hub loads the Packages as they are at that moment
+MANIFEST_ARRIVAL = 0
+PACKAGE_ARRIVAL = 1
+ADDRESS_CORRECTION = 2
+LATE_ARRIVAL = 3
+CANCELLATION = 4
+TRUCK_AT_HUB = 5
+STOP_ARRIVAL = 6
+HUB_RETURN = 7
+
+
+class DeliverySimulation:
+    # DeliverySimulation constructor
+    # The simulation is a discrete-event engine that processes stop arrivals, hub returns, Package arrivals and address
+    # corrections in global time order from a priority queue, so every Truck moves on the same clock
+    # load_truck is called with a Truck whenever it is at the hub and its time_obj is the current time. It loads the
+    # Truck with the Packages that can be delivered on its next trip
+    # Address corrections, late arrivals and cancellations received during the day are applied by their events. A
+    # Package that is still at the hub only has its pool in the constraint index updated, and a Package on a Truck
+    # only changes the remaining stops of that Truck, so no other part of the day's plan is recomputed
+    # Every assignment, departure, delivery and update is also recorded in a PackageStore, which answers whether every
+    # Package has been delivered, or any is left to load, in O(1) time, and the late and undelivered Packages once the
+    # simulation has run
+    # Only Trucks with a Driver go out. Whenever a Driver is at the depot ready for a trip, they may hand their Truck
+    # off and take a Truck at the same depot that has no Driver, if it can load more of the Packages waiting there, or
+    # as many on a faster or larger vehicle, so a fleet with more Trucks than Drivers keeps every Driver busy
+    def __init__(self, ht, truck_list, distance_matrix, load_truck, constraint_index=None):
+        self.ht = ht
+        self.truck_list = truck_list
+        self.distance_matrix = distance_matrix
+        self.load_truck = load_truck
+        self.constraint_index = constraint_index
+        self.package_store = PackageStore(ht, distance_matrix)
+
+        # Priority queue of (time, event type, sequence number, payload) tuples. The sequence number keeps events with
+        # the same time and type in the order they were scheduled
+        self.event_queue = []
+        self.num_events_scheduled = 0
+
+        # Address each Truck is currently at, and the Trucks waiting at the hub with nothing to deliver
+        self.truck_address = {}
+        self.idle_trucks = []
+
+        # (address, arrival time) of the stop each Truck is driving to. The Truck keeps driving to the stop even if the
+        # Package it was going to deliver there is cancelled or corrected to another address on the way
+        self.next_stop = {}
+
+
+    # Space-Time Complexity: O(log E)
+    # Adds an event to the priority queue
+    def schedule(self, time, event_type, payload):
+        heapq.heappush(self.event_queue, (time, event_type, self.num_events_scheduled, payload))
+        self.num_events_scheduled += 1
+
+
+    # Space-Time Complexity: O(log E)
+    # Schedules a manifest received during the day. load_manifest is called at the provided time and returns the list
+    # of new Packages it added to the HashTable and the pool of unassigned Packages
+    def schedule_manifest(self, time, load_manifest):
+        self.schedule(time, MANIFEST_ARRIVAL, load_manifest)
+
+
+    # Space-Time Complexity: O(log E)
+    # Schedules an update to the Package with the provided ID received during the day, which is an AddressCorrection,
+    # LateArrival or Cancellation record. The Package is looked up when the update is received, so an update can refer
+    # to a Package from a manifest received later in the day
+    def schedule_update(self, package_id, update):
+        if isinstance(update, AddressCorrection):
+            self.schedule(update.time, ADDRESS_CORRECTION, (package_id, update))
+        elif isinstance(update, LateArrival):
+            self.schedule(update.time, LATE_ARRIVAL, (package_id, update))
+        elif isinstance(update, Cancellation):
+            self.schedule(update.time, CANCELLATION, (package_id, update))
+        else:
+            raise ValueError("Unknown Package update: %r" % (update,))
+
+
+    # Space-Time Complexity: O(E log E)
+    # Runs the simulation until there are no more events to process
+    def run(self):
+        # Every Truck starts the day at its depot, and the Trucks with a Driver are ready at the start of their shift
+        for truck in self.truck_list:
+            self.truck_address[truck.id] = truck.hub_address
+            if truck.driver is not None:
+                self.schedule(truck.time_obj, TRUCK_AT_HUB, truck)
+
+        # Packages that are delayed or waiting on an address correction become available later in the day
+        for package in self.ht.values():
+            if package.address_correction is not None:
+                self.schedule(package.address_correction.time, ADDRESS_CORRECTION,
+                              (package.id_number, package.address_correction))
+            elif package.available_at is not None:
+                self.schedule(package.available_at, PACKAGE_ARRIVAL, package)
+
+        while len(self.event_queue) > 0:
+            time, event_type, _, payload = heapq.heappop(self.event_queue)
+
+            if event_type == MANIFEST_ARRIVAL:
+                self.receive_manifest(time, payload)
+            elif event_type == PACKAGE_ARRIVAL:
+                self.wake_idle_trucks(time)
+            elif event_type == ADDRESS_CORRECTION:
+                self.correct_address(time, *payload)
+            elif event_type == LATE_ARRIVAL:
+                self.delay_arrival(time, *payload)
+            elif event_type == CANCELLATION:
+                self.cancel_package(time, *payload)
+            elif event_type == TRUCK_AT_HUB:
+                self.start_trip(payload)
+            elif event_type == STOP_ARRIVAL:
+                self.deliver_next_stop(payload)
+            elif event_type == HUB_RETURN:
+                self.return_to_hub(payload)
+
+
+    # Space-Time Complexity: O(P log E), where P is the number of new Packages
+    # Loads the new Packages of a manifest, schedules the arrivals and address corrections of those that are not
+    # available yet, and gives the Trucks waiting at the hub the chance to load the rest
+    def receive_manifest(self, time, load_manifest):
+        for package in load_manifest():
+            self.package_store.add_package(package)
+            if package.address_correction is not None and package.address_correction.time > time:
+                self.schedule(package.address_correction.time, ADDRESS_CORRECTION,
+                              (package.id_number, package.address_correction))
+            elif package.address_correction is not None:
+                self.apply_address_correction(package)
+            elif package.available_at is not None and package.available_at > time:
+                self.schedule(package.available_at, PACKAGE_ARRIVAL, package)
+        self.wake_idle_trucks(time)
+
+
+    # Space-Time Complexity: O(1) for a Package at the hub, O(N) for a Package on a Truck
+    # Updates the delivery address of the Package. A Package that is still at the hub can then be loaded, and a Package
+    # on a Truck is moved to its cheapest position among the Truck's remaining stops
+    def correct_address(self, time, package_id, correction):
+        package = self.find_outstanding_package(package_id, "address correction")
+        if package is None:
+            return
+
+        package.address_correction = correction
+        truck = self.find_carrying_truck(package)
+        if truck is None:
+            self.apply_address_correction(package)
+            self.wake_idle_trucks(time)
+            return
+
+        fixed_packages, remaining_packages = self.split_stops(truck, package)
+        self.apply_address_correction(package)
+        start_address, start_time = self.next_stop[truck.id]
+        remaining_packages = insert_remaining_stop(self.distance_matrix, truck, start_address, start_time,
+                                                   remaining_packages, package)
+        truck.set_stops(group_stops(self.distance_matrix, fixed_packages + remaining_packages))
+
+
+    # Space-Time Complexity: O(G log N + log E), where G is the size of the Package's group
+    # Moves the arrival of a Package that has not been loaded yet to a later time, so no Truck loads it or any Package
+    # of its group before then
+    def delay_arrival(self, time, package_id, late_arrival):
+        package = self.find_outstanding_package(package_id, "late arrival")
+        if package is None:
+            return
+        if package.is_truck_assigned():
+            print("Warning: ignoring late arrival of Package %d, it is already loaded onto Truck %d" %
+                  (package_id, package.assigned_truck_id))
+            return
+
+        package.available_at = late_arrival.arrival_time
+        self.package_store.set_available_at(package_id, package.available_at)
+        if self.constraint_index is not None:
+            # The group is only offered once its latest Package arrives
+            self.constraint_index.update_group(package_id)
+        self.schedule(late_arrival.arrival_time, PACKAGE_ARRIVAL, package)
+
+
+    # Space-Time Complexity: O(log N) for a Package at the hub, O(N) for a Package on a Truck
+    # Cancels the delivery of the Package, removing it from the pool of unassigned Packages or from the remaining stops
+    # of the Truck carrying it
+    def cancel_package(self, time, package_id, cancellation):
+        package = self.find_outstanding_package(package_id, "cancellation")
+        if package is None:
+            return
+
+        truck = self.find_carrying_truck(package)
+        package.cancelled_timestamp = time
+        package.delivery_status = "Cancelled"
+        self.package_store.mark_cancelled(package_id, time)
+        if truck is None:
+            if self.constraint_index is not None:
+                # The rest of the Package's group can still be loaded without it
+                self.constraint_index.update_group(package_id)
+            return
+
+        fixed_packages, remaining_packages = self.split_stops(truck, package)
+        truck.set_stops(group_stops(self.distance_matrix, fixed_packages + remaining_packages))
+
+
+    # Returns the Package with the provided ID if it has not been delivered or cancelled yet, or None with a warning
+    def find_outstanding_package(self, package_id, update_name):
+        package = self.ht.lookup(package_id)
+        if package is None:
+            print("Warning: ignoring %s for unknown Package %d" % (update_name, package_id))
+        elif package.delivery_timestamp is not None or package.cancelled_timestamp is not None:
+            print("Warning: ignoring %s for Package %d, it is no longer awaiting delivery" % (update_name, package_id))
+            package = None
+        return package
+
+
+    # Space-Time Complexity: O(T), where T is the number of Trucks
+    # Returns the Truck the Package is loaded onto if the Truck is out delivering it, otherwise None
+    def find_carrying_truck(self, package):
+        truck_id = self.package_store.get_carrying_truck_id(package.id_number)
+        for truck in self.truck_list:
+            if truck.id == truck_id:
+                return truck
+        return None
+
+
+    # Updates the delivery address of the Package to its corrected address
+    def apply_address_correction(self, package):
+        package.apply_address_correction()
+        self.package_store.set_address(package.id_number, package.delivery_address)
+
+
+    # Space-Time Complexity: O(N)
+    # Splits the Packages on the Truck, leaving out the provided Package, into the list of Packages delivered at the
+    # stop the Truck is driving to, which cannot change anymore, and the list of Packages at the remaining stops
+    def split_stops(self, truck, package):
+        stop_address = self.next_stop[truck.id][0]
+        fixed_packages = []
+        remaining_packages = []
+
+        for stop_index, stop in enumerate(truck.stops):
+            for loaded_package in stop.packages:
+                if loaded_package is package:
+                    continue
+                if stop_index == 0 and stop.address == stop_address:
+                    fixed_packages.append(loaded_package)
+                else:
+                    remaining_packages.append(loaded_package)
+
+        return fixed_packages, remaining_packages
+
+
+    # Space-Time Complexity: O(T log E)
+    # Gives the Trucks waiting at the hub the chance to load the Packages that have become available
+    def wake_idle_trucks(self, time):
+        for truck in self.idle_trucks:
+            if truck.time_obj < time:
+                truck.time_obj = time
+            self.schedule(truck.time_obj, TRUCK_AT_HUB, truck)
+        self.idle_trucks = []
+
+
+    # Loads the Truck at the hub, or the Truck its Driver hands off to, and sends it out on a delivery trip, or leaves
+    # it waiting at the hub if there is nothing it can deliver yet
+    def start_trip(self, truck):
+        if truck in self.idle_trucks:
+            return
+
+        # Once every Package is loaded or cancelled there is nothing to load until a manifest brings more
+        if self.package_store.num_unassigned == 0:
+            self.idle_trucks.append(truck)
+            return
+
+        truck = self.hand_off(truck)
+        self.load_truck(truck)
+
+        if len(truck.packages_id_list) == 0:
+            self.idle_trucks.append(truck)
+            return
+
+        # Set the Delivery Status to "En route" for all Packages that will be delivered during this delivery trip
+        truck.set_packages_en_route(self.ht)
+        self.package_store.mark_assigned(truck.packages_id_list, truck.id)
+        self.package_store.mark_en_route(truck.packages_id_list, truck.time_obj)
+        self.schedule_next_stop(truck)
+
+
+    # Space-Time Complexity: O(T * (log N + K)), where K is the number of assignable Packages
+    # Returns the Truck the Driver of the empty Truck at the depot should take on their next trip. The candidates are
+    # the Truck itself and every empty Truck without a Driver at the same depot whose shift has started and that can
+    # load at least one waiting Package, ranked by the number of waiting Packages they can load, then by speed and
+    # capacity, keeping the current Truck on a tie. The Driver moves onto the chosen Truck, which starts at the Driver's
+    # current time
+    def hand_off(self, truck):
+        if self.constraint_index is None or len(truck.packages_id_list) > 0:
+            return truck
+
+        best_truck = truck
+        best_rank = None
+        for candidate in self.truck_list:
+            if candidate is not truck and (candidate.driver is not None or candidate.hub_address != truck.hub_address or
+                                           len(candidate.packages_id_list) > 0 or candidate.time_obj > truck.time_obj):
+                continue
+
+            num_loadable = min(candidate.max_num_packages,
+                               sum(group.size for group in
+                                   self.constraint_index.get_assignable_groups(candidate.id, truck.time_obj)))
+            if num_loadable == 0 and candidate is not truck:
+                continue
+            rank = (num_loadable, candidate.mph, candidate.max_num_packages, candidate is truck)
+            if best_rank is None or rank > best_rank:
+                best_truck = candidate
+                best_rank = rank
+
+        if best_truck is not truck:
+            driver = truck.driver
+            driver.remove_truck()
+            driver.assign_truck([best_truck])
+            best_truck.time_obj = truck.time_obj
+            best_truck.handoffs.append((truck.time_obj, driver.driver_id, truck.id))
+        return best_truck
+
+
+    # Schedules the Truck's arrival at its next stop, or its return to the hub if it has delivered every Package
+    def schedule_next_stop(self, truck):
+        current_address = self.truck_address[truck.id]
+
+        if len(truck.stops) > 0:
+            stop_address = truck.stops[0].address
+            distance = self.distance_matrix.distance_between(current_address, stop_address)
+            arrival_time = truck.time_obj + truck.travel_time(distance)
+            self.next_stop[truck.id] = (stop_address, arrival_time)
+            self.schedule(arrival_time, STOP_ARRIVAL, truck)
+        else:
+            distance = self.distance_matrix.distance_between(current_address, truck.hub_address)
+            self.schedule(truck.time_obj + truck.travel_time(distance), HUB_RETURN, truck)
+
+
+    # Space-Time Complexity: O(K), where K is the number of Packages at the stop
+    # Delivers every Package at the Truck's next stop in one go when the Truck arrives there, which is the first of its
+    # remaining Stops. If the Packages of the stop were all cancelled or had their address corrected while the Truck was
+    # on its way, the Stop was dropped and the Truck arrives without delivering
+    def deliver_next_stop(self, truck):
+        stop_address, _ = self.next_stop.pop(truck.id)
+
+        # Calculate the distance traveled and add it to the total mileage covered by the Truck
+        distance_traveled = self.distance_matrix.distance_between(self.truck_address[truck.id], stop_address)
+        if len(truck.stops) > 0 and truck.stops[0].address == stop_address:
+            stop_package_ids = truck.deliver_stop(distance_traveled)
+            self.package_store.mark_delivered(stop_package_ids, truck.time_obj)
+        else:
+            truck.drive_to_stop(distance_traveled, stop_address)
+
+        # After all calculations, the stop's address is now the current address
+        self.truck_address[truck.id] = stop_address
+        self.schedule_next_stop(truck)
+
+
+    # Returns the Truck to the hub and immediately loads it for its next trip
+    def return_to_hub(self, truck):
+        distance_from_hub = self.distance_matrix.distance_between(self.truck_address[truck.id], truck.hub_address)
+        truck.send_back_to_hub(distance_from_hub)
+        self.truck_address[truck.id] = truck.hub_address
+        self.start_trip(truck)
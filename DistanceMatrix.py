@@ -0,0 +1,204 @@
+import mmap
+import os
+import struct
+from array import array
+
+# NumPy is optional. When it is installed, whole rows and routes of distances are computed with vectorised operations
+# over a dense square copy of the matrix, otherwise every distance is looked up one at a time in pure Python
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Set to False to compute with pure Python even when NumPy is installed
+use_numpy = True
+
+# Largest number of addresses for which the dense square copy is built. The copy takes 8 * N * N bytes on top of the
+# triangle (about 18 MB at this size), so larger matrices keep computing with pure Python from the triangle instead
+max_dense_addresses = 1500
+
+# Layout of the precompiled distance cache file:
+#   header          - magic bytes, format version, number of addresses and size of the address table in bytes
+#   address table   - each address stored as a 2-byte length followed by its UTF-8 encoded text, padded to 4 bytes
+#   distance table  - the lower triangle of distances packed as N * (N + 1) / 2 little-endian float32 values
+cache_magic = b"WGUD"
+cache_version = 1
+cache_header = struct.Struct("<4sHHII")
+cache_address_length = struct.Struct("<H")
+
+
+class DistanceMatrix:
+    # DistanceMatrix constructor which is built once at startup from the list of addresses and the flat lower-triangle
+    # array of distances between them
+    # The distance between address i and address j (where i >= j) is stored at index i * (i + 1) / 2 + j, so the whole
+    # symmetric table is held in one contiguous array of N * (N + 1) / 2 floats
+    def __init__(self, address_list, distance_triangle):
+        self.address_list = address_list
+        self.distance_triangle = distance_triangle
+        self.num_addresses = len(address_list)
+
+        # Memory-mapped cache file backing the distance triangle, if the matrix was loaded from a cache
+        self.mapped_file = None
+
+        # Lists of address indices sorted by distance from an address, built the first time each address is queried
+        self.sorted_neighbor_lists = {}
+
+        # Dense square NumPy array of the distances, built the first time the NumPy backend needs it
+        self.dense_distances = None
+
+        # Dictionary used to find the index of an address in O(1) time
+        self.address_index_table = {}
+        for index, address in enumerate(address_list):
+            self.address_index_table[address] = index
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the index of the address within the matrix
+    def index_of(self, address):
+        return self.address_index_table[address]
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the distance between the addresses found at the two indices
+    def distance(self, address1_index, address2_index):
+        if address1_index < address2_index:
+            address1_index, address2_index = address2_index, address1_index
+        return self.distance_triangle[address1_index * (address1_index + 1) // 2 + address2_index]
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the distance between two addresses
+    def distance_between(self, address1, address2):
+        return self.distance(self.address_index_table[address1], self.address_index_table[address2])
+
+
+    # Space-Time Complexity: O(N^2) the first time, O(1) afterwards
+    # Returns the dense square NumPy array of distances, where the distance between address i and address j is at
+    # [i, j], or None if NumPy is not installed, use_numpy is switched off or the matrix has more than
+    # max_dense_addresses addresses
+    def dense(self):
+        if numpy is None or not use_numpy or self.num_addresses > max_dense_addresses:
+            return None
+
+        if self.dense_distances is None:
+            distance_triangle = numpy.asarray(self.distance_triangle, dtype=numpy.float64)
+            dense_distances = numpy.zeros((self.num_addresses, self.num_addresses))
+            # The lower-triangle indices are generated row by row, the same order the flat triangle is stored in
+            row_indices, column_indices = numpy.tril_indices(self.num_addresses)
+            dense_distances[row_indices, column_indices] = distance_triangle
+            dense_distances[column_indices, row_indices] = distance_triangle
+            self.dense_distances = dense_distances
+
+        return self.dense_distances
+
+
+    # Space-Time Complexity: O(N)
+    # Returns the total distance of the route, a list of address indices visited in order. With NumPy the distances of
+    # every leg are gathered and summed in one operation
+    def route_length(self, route):
+        dense_distances = self.dense()
+        if dense_distances is not None:
+            route_indices = numpy.asarray(route)
+            return float(dense_distances[route_indices[:-1], route_indices[1:]].sum())
+
+        total_distance = 0
+        for stop in range(1, len(route)):
+            total_distance += self.distance(route[stop - 1], route[stop])
+        return total_distance
+
+
+    # Space-Time Complexity: O(N log N) the first time an address is queried, O(1) afterwards
+    # Returns the indices of all addresses sorted by their distance from the address at the provided index. Equally
+    # distant addresses keep their index order, with or without NumPy
+    def sorted_neighbors(self, address_index):
+        neighbors = self.sorted_neighbor_lists.get(address_index)
+
+        if neighbors is None:
+            dense_distances = self.dense()
+            if dense_distances is not None:
+                neighbors = numpy.argsort(dense_distances[address_index], kind="stable").tolist()
+            else:
+                distance_row = [self.distance(address_index, other_index) for other_index in range(self.num_addresses)]
+                neighbors = sorted(range(self.num_addresses), key=distance_row.__getitem__)
+            self.sorted_neighbor_lists[address_index] = neighbors
+
+        return neighbors
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the flat lower-triangle array holding the distance between every pair of addresses
+    def get_distance_triangle(self):
+        return self.distance_triangle
+
+
+    # Returns an empty flat lower-triangle array able to hold the distances between the given number of addresses
+    @staticmethod
+    def empty_triangle(num_addresses):
+        return array('d', bytes(8 * (num_addresses * (num_addresses + 1) // 2)))
+
+
+    # Returns the index within the flat lower-triangle array for the distance between the two address indices
+    @staticmethod
+    def triangle_index(address1_index, address2_index):
+        if address1_index < address2_index:
+            address1_index, address2_index = address2_index, address1_index
+        return address1_index * (address1_index + 1) // 2 + address2_index
+
+
+    # Space-Time Complexity: O(N^2)
+    # Compiles the matrix into the binary cache format and writes it to the provided path
+    def save(self, cache_path):
+        address_table = bytearray()
+        for address in self.address_list:
+            encoded_address = address.encode("utf-8")
+            address_table += cache_address_length.pack(len(encoded_address))
+            address_table += encoded_address
+
+        # Pad the address table so the float32 distance table starts on a 4-byte boundary
+        address_table += bytes(-len(address_table) % 4)
+
+        # The cache is written to a temporary file first so a partially written cache is never loaded
+        temporary_path = cache_path + ".tmp"
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(cache_header.pack(cache_magic, cache_version, 0, self.num_addresses, len(address_table)))
+            cache_file.write(address_table)
+            array('f', self.get_distance_triangle()).tofile(cache_file)
+        os.replace(temporary_path, cache_path)
+
+
+    # Space-Time Complexity: O(N)
+    # Memory-maps a binary cache created by save() and returns a DistanceMatrix that reads the distances directly from
+    # the mapped file without copying them. Returns None if the file is not a valid cache
+    @classmethod
+    def load(cls, cache_path):
+        with open(cache_path, "rb") as cache_file:
+            try:
+                mapped_file = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be memory-mapped
+                return None
+
+        if len(mapped_file) < cache_header.size:
+            mapped_file.close()
+            return None
+        magic, version, _, num_addresses, address_table_size = cache_header.unpack_from(mapped_file, 0)
+        triangle_offset = cache_header.size + address_table_size
+        triangle_size = num_addresses * (num_addresses + 1) // 2
+        if magic != cache_magic or version != cache_version or len(mapped_file) != triangle_offset + 4 * triangle_size:
+            mapped_file.close()
+            return None
+
+        # Decode the address table
+        address_list = []
+        offset = cache_header.size
+        for _ in range(num_addresses):
+            (address_length,) = cache_address_length.unpack_from(mapped_file, offset)
+            offset += cache_address_length.size
+            address_list.append(bytes(mapped_file[offset:offset + address_length]).decode("utf-8"))
+            offset += address_length
+
+        # View the packed float32 triangle in place
+        distance_triangle = memoryview(mapped_file)[triangle_offset:].cast('f')
+        distance_matrix = cls(address_list, distance_triangle)
+        distance_matrix.mapped_file = mapped_file
+        return distance_matrix
@@ -0,0 +1,187 @@
+from array import array
+from collections import OrderedDict
+from heapq import heappop, heappush
+
+from DistanceMatrix import DistanceMatrix
+
+# Distance stored for an address that cannot be reached from another address through the network
+unreachable = float("inf")
+
+# Size in bytes of each distance held in a shortest-path row. Rows are stored as float32 values, the same precision as
+# the binary cache, so a distance is the same whether it was computed on demand or loaded from the precomputed closure
+row_item_size = 4
+
+# Size in bytes of each address index held in a sorted neighbour list, which is stored as int32 values
+neighbor_item_size = 4
+
+
+class DistanceNetwork(DistanceMatrix):
+    # DistanceNetwork constructor which is built once at startup from the list of addresses and a sparse list of
+    # (address index, address index, miles) road edges between neighbouring addresses
+    # The distance between two addresses is the length of the shortest path between them through the network. Paths
+    # are found by running Dijkstra's algorithm from one source address at a time, the first time a distance from that
+    # address is needed, and the resulting row of distances to every address is memoized. Rows are kept in an
+    # OrderedDict from the least to the most recently used, along with the neighbour lists sorted from them, and the
+    # least recently used row and its neighbour list are evicted once they would take more than memory_cap bytes, so
+    # networks of thousands of addresses are served without ever holding the dense N * N table. The full closure is
+    # only computed when the flat distance triangle itself is needed, to save the binary cache or to share the distances
+    # with the multi-start worker processes
+    # A ValueError is raised if an edge has a negative length or if some address cannot be reached from the hub, so a
+    # gap in the road data is reported instead of being routed as a 0-mile or endless leg
+    def __init__(self, address_list, edges, memory_cap):
+        super().__init__(address_list, None)
+        self.num_edges = len(edges)
+
+        # Adjacency list of (neighbor index, miles) pairs for each address
+        # Space-Time Complexity: O(N + E), where E is the number of edges
+        self.adjacency = [[] for _ in range(self.num_addresses)]
+        for address1_index, address2_index, miles in edges:
+            if miles < 0:
+                raise ValueError("Negative distance of %s miles between '%s' and '%s'" % (
+                    miles, address_list[address1_index], address_list[address2_index]))
+            self.adjacency[address1_index].append((address2_index, miles))
+            self.adjacency[address2_index].append((address1_index, miles))
+
+        # Shortest-path rows keyed by source address index, least recently used first. The neighbour list of an address
+        # is only kept while its row is, and memory_used counts the bytes of both
+        self.distance_rows = OrderedDict()
+        self.memory_cap = memory_cap
+        self.memory_used = 0
+        self.num_rows_computed = 0
+
+        self.check_connected()
+
+
+    # Space-Time Complexity: O(N + E)
+    # Raises a ValueError naming the addresses that cannot be reached from the first address (the hub)
+    def check_connected(self):
+        if self.num_addresses == 0:
+            return
+
+        reached = [False] * self.num_addresses
+        reached[0] = True
+        addresses_to_visit = [0]
+        while len(addresses_to_visit) > 0:
+            for neighbor_index, _ in self.adjacency[addresses_to_visit.pop()]:
+                if not reached[neighbor_index]:
+                    reached[neighbor_index] = True
+                    addresses_to_visit.append(neighbor_index)
+
+        unreached_addresses = [address for address, is_reached in zip(self.address_list, reached) if not is_reached]
+        if len(unreached_addresses) > 0:
+            raise ValueError("%d address(es) cannot be reached from '%s' through the road network: %s" % (
+                len(unreached_addresses), self.address_list[0], ", ".join(unreached_addresses[:5])))
+
+
+    # Space-Time Complexity: O(E log N)
+    # Returns an array of the shortest distances from the address at the source index to every address, found with
+    # Dijkstra's algorithm
+    def compute_distance_row(self, source_index):
+        distance_row = [unreachable] * self.num_addresses
+        distance_row[source_index] = 0
+        address_heap = [(0, source_index)]
+
+        while len(address_heap) > 0:
+            source_distance, address_index = heappop(address_heap)
+            if source_distance > distance_row[address_index]:
+                # A shorter path to this address was already settled
+                continue
+            for neighbor_index, miles in self.adjacency[address_index]:
+                neighbor_distance = source_distance + miles
+                if neighbor_distance < distance_row[neighbor_index]:
+                    distance_row[neighbor_index] = neighbor_distance
+                    heappush(address_heap, (neighbor_distance, neighbor_index))
+
+        self.num_rows_computed += 1
+        return array('f', distance_row)
+
+
+    # Space-Time Complexity: O(1) if the row is memoized, O(E log N) otherwise
+    # Returns the row of shortest distances from the address at the source index, memoizing it as the most recently
+    # used row and evicting the least recently used rows if the memory cap is reached
+    def get_distance_row(self, source_index):
+        distance_row = self.distance_rows.get(source_index)
+        if distance_row is not None:
+            self.distance_rows.move_to_end(source_index)
+            return distance_row
+
+        distance_row = self.compute_distance_row(source_index)
+        self.distance_rows[source_index] = distance_row
+        self.memory_used += row_item_size * len(distance_row)
+        self.evict_rows()
+        return distance_row
+
+
+    # Space-Time Complexity: O(1) amortized
+    # Evicts the least recently used rows, along with their neighbour lists, until the memoized rows and lists fit in
+    # memory_cap bytes. The most recently used row is always kept
+    def evict_rows(self):
+        while self.memory_used > self.memory_cap and len(self.distance_rows) > 1:
+            source_index, distance_row = self.distance_rows.popitem(last=False)
+            self.memory_used -= row_item_size * len(distance_row)
+            neighbors = self.sorted_neighbor_lists.pop(source_index, None)
+            if neighbors is not None:
+                self.memory_used -= neighbor_item_size * len(neighbors)
+
+
+    # Space-Time Complexity: O(1) once the closure is computed or a row of either address is memoized, O(E log N)
+    # otherwise
+    # Returns the distance between the addresses found at the two indices
+    def distance(self, address1_index, address2_index):
+        if self.distance_triangle is not None:
+            return DistanceMatrix.distance(self, address1_index, address2_index)
+
+        # Distances are symmetric, so a memoized row of either address answers the lookup
+        if address1_index not in self.distance_rows and address2_index in self.distance_rows:
+            address1_index, address2_index = address2_index, address1_index
+        return self.get_distance_row(address1_index)[address2_index]
+
+
+    # Space-Time Complexity: O(N (E log N)) the first time, O(1) afterwards
+    # Computes the shortest distance between every pair of addresses into the flat lower-triangle array, which from
+    # then on answers every lookup, and returns it
+    def get_distance_triangle(self):
+        if self.distance_triangle is None:
+            distance_triangle = DistanceMatrix.empty_triangle(self.num_addresses)
+            for address1_index in range(self.num_addresses):
+                distance_row = self.distance_rows.get(address1_index)
+                if distance_row is None:
+                    distance_row = self.compute_distance_row(address1_index)
+                row_offset = address1_index * (address1_index + 1) // 2
+                distance_triangle[row_offset:row_offset + address1_index + 1] = \
+                    array('d', distance_row[:address1_index + 1])
+
+            self.distance_triangle = distance_triangle
+            self.distance_rows.clear()
+            self.sorted_neighbor_lists.clear()
+            self.memory_used = 0
+
+        return self.distance_triangle
+
+
+    # Space-Time Complexity: O(1) if the list is memoized, O(E log N + N log N) otherwise
+    # Returns the indices of all addresses sorted by their distance from the address at the provided index, as an int32
+    # array. Before the closure is computed, the list is sorted from the address's row and memoized with it, so it is
+    # evicted together with the row and counts against memory_cap
+    def sorted_neighbors(self, address_index):
+        if self.distance_triangle is not None:
+            return DistanceMatrix.sorted_neighbors(self, address_index)
+
+        # Looking up the row also marks it, and so the neighbour list, as the most recently used
+        distance_row = self.get_distance_row(address_index)
+        neighbors = self.sorted_neighbor_lists.get(address_index)
+        if neighbors is None:
+            neighbors = array('i', sorted(range(self.num_addresses), key=distance_row.__getitem__))
+            self.sorted_neighbor_lists[address_index] = neighbors
+            self.memory_used += neighbor_item_size * len(neighbors)
+            self.evict_rows()
+        return neighbors
+
+
+    # Space-Time Complexity: O(N^2) the first time, O(1) afterwards
+    # Returns the dense square NumPy array of distances once the closure has been computed. Before that it returns None,
+    # so the distances keep being computed row by row instead of building the full N * N table
+    def dense(self):
+        if self.distance_triangle is None:
+            return None
+        return DistanceMatrix.dense(self)
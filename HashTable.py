@@ -1,79 +1,212 @@
-class HashTable:
-    # Linear Probing HashTable constructor with an optional initial capacity used to store the Packages
-    # Linear Probing is used to decrease the number of collisions for each insertion
-    def __init__(self, initial_capacity=40, c1=0, c2=1):
-        self.initial_capacity = initial_capacity
-        self.package_table = [None] * initial_capacity
-        self.bucket_status_table = ["EMPTY_SINCE_START"] * initial_capacity
+# Bucket status values stored in the HashTable's bucket_status_table
+EMPTY_SINCE_START = 0
+OCCUPIED = 1
+EMPTY_AFTER_REMOVAL = 2
 
-        # Double hashing constants
-        self.c1 = c1
-        self.c2 = c2
+# Probing strategies used to find the next bucket after a collision
+# linear    - visits bucket h, h + 1, h + 2, ...
+# quadratic - visits bucket h, h + 1, h + 3, h + 6, ... (triangular numbers), which visits every bucket of a table
+#             whose capacity is a power of two
+# double    - visits bucket h, h + s, h + 2s, ... where the step s is an odd value derived from a second hash of the
+#             key, which also visits every bucket of a power-of-two table
+probing_strategies = ("linear", "quadratic", "double")
 
 
+class HashTable:
+    # Open addressing HashTable constructor with an optional initial capacity used to store the Packages
+    # The status of each bucket is stored in a compact byte array, and the table grows as soon as the number of used
+    # buckets (occupied or emptied by a removal) would exceed max_load_factor of the table's capacity
+    # The capacity is always rounded up to a power of two so every probing strategy can reach every bucket
+    def __init__(self, initial_capacity=40, max_load_factor=0.75, probing="linear"):
+        if probing not in probing_strategies:
+            raise ValueError("Unknown probing strategy: %s" % probing)
+
+        capacity = 1
+        while capacity < initial_capacity:
+            capacity = capacity * 2
+
+        self.initial_capacity = capacity
+        self.max_load_factor = max_load_factor
+        self.probing = probing
+        self.package_table = [None] * capacity
+        self.bucket_status_table = bytearray(capacity)
+        self.num_packages = 0
+        self.num_removed_buckets = 0
+
+        # Number of buckets examined by the most recent probe sequence
+        self.last_probe_length = 0
+
+
+    # Space-Time Complexity: O(1) amortized
     # Inserts a new item into the HashTable The key of the item will be the id_number and the value will be all the
-    # corresponding components tied to that id_number
+    # corresponding components tied to that id_number. Inserting a Package whose id_number is already in the
+    # HashTable replaces the stored Package
     def insert(self, package):
-        i = 0
-        buckets_probed = 0
-        N = len(self.package_table)
-        bucket = hash(package.id_number) % N
+        # Grow the HashTable before it becomes too full for short probe sequences
+        if self.num_packages + self.num_removed_buckets + 1 > self.max_load_factor * len(self.package_table):
+            self.resize()
 
-        # Iterate through the HashTable and insert the package at the next empty bucket
-        while buckets_probed < N:
-            # Insert package in next empty bucket
-            if self.bucket_status_table[bucket] == "EMPTY_SINCE_START" or self.bucket_status_table[bucket] == "EMPTY_AFTER_REMOVAL":
-                self.package_table[bucket] = package
-                self.bucket_status_table[bucket] = "OCCUPIED"
-                return True
+        while True:
+            bucket = self.find_bucket(package.id_number)
 
-            # No empty bucket found yet, increment i and compute next bucket's index
-            i = i + 1
-            bucket = (hash(package.id_number) + (self.c1 * i) + (self.c2 * i ** 2)) % N
+            if bucket is None:
+                # Every bucket is occupied, resize HashTable and re-insert
+                self.resize(len(self.package_table) * 2)
+                continue
 
-            # Increment number of buckets probed
-            buckets_probed = buckets_probed + 1
+            if self.bucket_status_table[bucket] == OCCUPIED:
+                self.package_table[bucket] = package
+                return True
 
-        # Iterated through the entire HashTable and could not insert the item, resize HashTable and re-insert
-        self.resize()
-        self.insert(package)
-        return True
+            if self.bucket_status_table[bucket] == EMPTY_AFTER_REMOVAL:
+                self.num_removed_buckets -= 1
+            self.package_table[bucket] = package
+            self.bucket_status_table[bucket] = OCCUPIED
+            self.num_packages += 1
+            return True
 
 
+    # Space-Time Complexity: O(1) average
+    # Returns the bucket that holds the key, or the first bucket the key could be inserted into if it is not in the
+    # HashTable. Returns None if the probe sequence visited N buckets without finding either
+    def find_bucket(self, key):
+        N = len(self.package_table)
+        mask = N - 1
+        status_table = self.bucket_status_table
+        package_table = self.package_table
+        first_removed_bucket = None
+        key_hash = hash(key)
+        bucket = key_hash & mask
+
+        # The hash and the probe step are computed once, and every following bucket is found by adding the step
+        if self.probing == "linear":
+            step = 1
+            step_increment = 0
+        elif self.probing == "quadratic":
+            step = 1
+            step_increment = 1
+        else:
+            step = (((key_hash * 2654435761) >> 16) & mask) | 1
+            step_increment = 0
+
+        for i in range(1, N + 1):
+            status = status_table[bucket]
+
+            if status == EMPTY_SINCE_START:
+                self.last_probe_length = i
+                # The key is not in the HashTable, reuse the earliest removed bucket if one was passed
+                if first_removed_bucket is not None:
+                    return first_removed_bucket
+                return bucket
+            if status == OCCUPIED:
+                if package_table[bucket].id_number == key:
+                    self.last_probe_length = i
+                    return bucket
+            elif first_removed_bucket is None:
+                first_removed_bucket = bucket
+
+            # Compute the next bucket's index
+            bucket = (bucket + step) & mask
+            step += step_increment
+
+        self.last_probe_length = N
+        return first_removed_bucket
+
+
+    # Space-Time Complexity: O(1) average
     # Searches for an item with a matching key in the hashtable. Returns the
     # item if found, or None if not found.
     def lookup(self, key):
-        i = 0
-        buckets_probed = 0
-        N = len(self.package_table)
-        bucket = hash(key) % N
+        bucket = self.find_bucket(key)
 
-        while (self.bucket_status_table[bucket] != "EMPTY_SINCE_START") and (buckets_probed < N):
-            if (self.package_table[bucket] is not None) and (self.package_table[bucket].id_number == key):
-                return self.package_table[bucket]
+        if bucket is not None and self.bucket_status_table[bucket] == OCCUPIED:
+            return self.package_table[bucket]
+        return None
 
-            # Increment i and recompute bucket index
-            i = i + 1
-            bucket = (hash(key) + self.c1 * i + self.c2 * i ** 2) % N
 
-            # Increment number of buckets probed
-            buckets_probed = buckets_probed + 1
+    # Space-Time Complexity: O(1) average
+    # Removes the item with a matching key from the HashTable. Returns the removed item, or None if not found
+    def remove(self, key):
+        bucket = self.find_bucket(key)
+
+        if bucket is None or self.bucket_status_table[bucket] != OCCUPIED:
+            return None
+
+        package = self.package_table[bucket]
+        self.package_table[bucket] = None
+        self.bucket_status_table[bucket] = EMPTY_AFTER_REMOVAL
+        self.num_packages -= 1
+        self.num_removed_buckets += 1
+        return package
+
+
+    # Space-Time Complexity: O(N)
+    # Rebuilds the HashTable with the provided capacity, moving only the occupied buckets and discarding the buckets
+    # emptied by removals. When no capacity is provided the HashTable doubles in size if the stored Packages alone
+    # would exceed half of the maximum load, otherwise it is rebuilt at the same size to clear out removed buckets
+    def resize(self, new_capacity=None):
+        old_package_table = self.package_table
+        old_status_table = self.bucket_status_table
+
+        if new_capacity is None:
+            new_capacity = len(old_package_table)
+            if self.num_packages + 1 > self.max_load_factor * new_capacity / 2:
+                new_capacity = new_capacity * 2
+
+        self.package_table = [None] * new_capacity
+        self.bucket_status_table = bytearray(new_capacity)
+        self.num_packages = 0
+        self.num_removed_buckets = 0
+
+        for bucket in range(len(old_package_table)):
+            if old_status_table[bucket] == OCCUPIED:
+                self.insert(old_package_table[bucket])
+
+
+    # Space-Time Complexity: O(N)
+    # Grows the HashTable once so it can hold the provided total number of Packages without exceeding the maximum load,
+    # instead of doubling repeatedly as a large manifest is inserted. Does nothing if the HashTable is already big
+    # enough
+    def reserve(self, num_packages):
+        capacity = len(self.package_table)
+        while num_packages + self.num_removed_buckets > self.max_load_factor * capacity:
+            capacity = capacity * 2
+
+        if capacity > len(self.package_table):
+            self.resize(capacity)
+
+
+    # Returns the number of Packages stored in the HashTable
+    def __len__(self):
+        return self.num_packages
+
+
+    # Returns True if a Package with the provided key is stored in the HashTable
+    def __contains__(self, key):
+        return self.lookup(key) is not None
+
+
+    # Iterates over the keys of the Packages stored in the HashTable
+    def __iter__(self):
+        for key, package in self.items():
+            yield key
 
-        return None
 
+    # Iterates over the Packages stored in the HashTable
+    def values(self):
+        for key, package in self.items():
+            yield package
 
-    # Resizes the HashTable by doubling its original size
-    def resize(self):
-        # Create a HashTable with double the initial capacity
-        resized_ht = HashTable(initial_capacity=self.initial_capacity * 2, c1 = self.c1, c2 = self.c2)
 
-        # Iterate through the current HashTable and copy the Packages to the new HashTable
-        for package in self.package_table:
-            resized_ht.insert(package)
+    # Iterates over (key, Package) pairs for the Packages stored in the HashTable
+    def items(self):
+        status_table = self.bucket_status_table
+        package_table = self.package_table
 
-        self.initial_capacity = resized_ht.initial_capacity
-        self.package_table = resized_ht.package_table
-        self.bucket_status_table = resized_ht.bucket_status_table
+        for bucket in range(len(package_table)):
+            if status_table[bucket] == OCCUPIED:
+                package = package_table[bucket]
+                yield package.id_number, package
 
 
     # Overloaded print function
@@ -0,0 +1,111 @@
+import csv
+import os
+
+# Number of bytes read from the manifest at a time
+default_chunk_size = 64 * 1024
+
+# Number of columns in a Package row: ID, address, city, state, ZIP code, deadline, mass and special notes
+num_package_columns = 8
+
+
+class ManifestReader:
+    # ManifestReader constructor
+    # Reads the rows of a Package manifest CSV file in fixed-size chunks, so a large manifest is parsed as it is read
+    # instead of being loaded into memory all at once. The reader remembers the byte offset it stopped at, so rows
+    # appended to the manifest later in the day are read on the next call without reading the earlier rows again
+    def __init__(self, manifest_path, chunk_size=default_chunk_size):
+        self.manifest_path = manifest_path
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self.num_lines_read = 0
+        self.num_invalid_rows = 0
+
+
+    # Space-Time Complexity: O(C), where C is the chunk size
+    # Estimates the number of rows not read yet from the average length of the rows in the next chunk and the number of
+    # bytes left in the manifest. Returns 0 if there is nothing left to read
+    def estimate_remaining_rows(self):
+        remaining_bytes = os.path.getsize(self.manifest_path) - self.offset
+        if remaining_bytes <= 0:
+            return 0
+
+        with open(self.manifest_path, 'rb') as manifest_file:
+            manifest_file.seek(self.offset)
+            sample = manifest_file.read(self.chunk_size)
+
+        num_sample_rows = sample.count(b"\n")
+        if num_sample_rows == 0 or len(sample) == remaining_bytes:
+            return max(num_sample_rows, 1)
+        return num_sample_rows * remaining_bytes // len(sample) + 1
+
+
+    # Space-Time Complexity: O(N), where N is the number of bytes not read yet
+    # Yields every valid row after the offset as a list of column values, in chunks of chunk_size bytes
+    # A final record without a line break may still be being written, so it is left for the next call unless
+    # include_partial_line is True, which is only safe for a manifest that is known to be complete. Rows with too few
+    # columns, a non-numeric ID or an empty address are skipped with a warning
+    def read_rows(self, include_partial_line=False):
+        with open(self.manifest_path, 'rb') as manifest_file:
+            manifest_file.seek(self.offset)
+            pending = b""
+
+            while True:
+                chunk = manifest_file.read(self.chunk_size)
+                if chunk == b"":
+                    break
+
+                # Only complete records are parsed, the text after the last complete record waits for the next chunk
+                records, pending = split_records(pending + chunk)
+                for row in self.parse_records(records):
+                    yield row
+
+            if include_partial_line and pending.strip() != b"":
+                for row in self.parse_records([pending]):
+                    yield row
+                pending = b""
+
+            self.offset = manifest_file.tell() - len(pending)
+
+
+    # Space-Time Complexity: O(L), where L is the total length of the records
+    # Parses and validates a list of complete manifest records, yielding the valid rows. A record spans more than one
+    # line if a quoted field holds a line break
+    def parse_records(self, records):
+        for record in records:
+            line_number = self.num_lines_read + 1
+            self.num_lines_read += record.count(b"\n") + 1
+            text = record.decode('utf-8-sig' if line_number == 1 else 'utf-8', errors='replace').rstrip("\r")
+
+            for row in csv.reader([text], delimiter=','):
+                if len(row) == 0:
+                    continue
+
+                if len(row) < num_package_columns or not row[0].strip().isdigit() or row[1].strip() == "":
+                    self.num_invalid_rows += 1
+                    print("Warning: skipping invalid row on line %d of %s" % (line_number, self.manifest_path))
+                    continue
+
+                yield row
+
+
+# Space-Time Complexity: O(N), where N is the length of the data
+# Splits the data into the list of complete CSV records it holds and the text after the last of them. A line break
+# only ends a record when the record has an even number of quote characters, since a line break inside a quoted field
+# is part of the field
+def split_records(data):
+    records = []
+    record_start = 0
+    num_quotes = 0
+    line_start = 0
+
+    while True:
+        line_end = data.find(b"\n", line_start)
+        if line_end == -1:
+            return records, data[record_start:]
+
+        num_quotes += data.count(b'"', line_start, line_end)
+        line_start = line_end + 1
+        if num_quotes % 2 == 0:
+            records.append(data[record_start:line_end])
+            record_start = line_start
+            num_quotes = 0
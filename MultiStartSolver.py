@@ -0,0 +1,92 @@
+import contextlib
+import io
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from DistanceMatrix import DistanceMatrix
+
+# Size in bytes of each distance stored in shared memory
+distance_item_size = 8
+
+# DistanceMatrix each worker process builds over the shared distance triangle, along with the shared memory block
+# backing it. They are set once per worker by init_worker
+worker_distance_matrix = None
+worker_shared_memory = None
+
+
+# Space-Time Complexity: O(A), where A is the number of addresses
+# Attaches the worker process to the shared distance triangle, so every start run by the worker reads the distances
+# from the same block of memory instead of receiving a pickled copy of the matrix with each task
+def init_worker(shared_memory_name, address_list, num_distances):
+    global worker_distance_matrix, worker_shared_memory
+
+    worker_shared_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    distance_triangle = worker_shared_memory.buf[:num_distances * distance_item_size].cast('d')
+    worker_distance_matrix = DistanceMatrix(address_list, distance_triangle)
+
+
+# Space-Time Complexity: O(N)
+# Returns a (number of late or undelivered Packages, total mileage) pair used to rank delivery plans from the
+# PackageStore of the day, leaving out cancelled Packages. A plan is feasible if its first value is 0
+def evaluate_plan(package_store, truck_list):
+    num_late_packages = package_store.num_undelivered + package_store.count_late()
+
+    total_mileage = 0
+    for truck in truck_list:
+        total_mileage += truck.total_distance_traveled
+    return num_late_packages, total_mileage
+
+
+# Runs a single randomized start in a worker process. simulate_day is called with the worker's DistanceMatrix, a random
+# number generator seeded with the provided seed and the wall-clock deadline (in seconds since the epoch), and returns
+# the HashTable, Truck list and PackageStore of the simulated day. Returns None without simulating if the deadline has
+# passed
+def run_start(simulate_day, seed, deadline):
+    if time.time() >= deadline:
+        return None
+
+    # Warnings about the plans of individual starts are not shown, only the chosen plan matters
+    with contextlib.redirect_stdout(io.StringIO()):
+        ht, truck_list, package_store = simulate_day(worker_distance_matrix, random.Random(seed), deadline)
+    return evaluate_plan(package_store, truck_list), seed, ht, truck_list
+
+
+# Runs num_starts randomized starts of simulate_day across a pool of worker processes and returns the best feasible
+# plan as a (score, seed, HashTable, Truck list) tuple, or None if no start produced a feasible plan
+# The distance triangle is copied once into a shared memory block that every worker attaches to. Each start receives
+# the same wall-clock deadline, time_budget seconds from now, and starts that have not begun by then return right away
+def solve_multi_start(simulate_day, distance_matrix, num_starts, time_budget, num_workers=None, base_seed=0):
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, num_starts))
+
+    distance_triangle = distance_matrix.get_distance_triangle()
+    num_distances = len(distance_triangle)
+    shared_block = shared_memory.SharedMemory(create=True, size=max(1, num_distances * distance_item_size))
+    best_plan = None
+
+    try:
+        # Copy the whole triangle in one go, widening a float32 triangle memory-mapped from the cache to float64
+        shared_block.buf[:num_distances * distance_item_size] = array('d', distance_triangle).tobytes()
+
+        deadline = time.time() + time_budget
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker,
+                                 initargs=(shared_block.name, distance_matrix.address_list, num_distances)) as executor:
+            futures = [executor.submit(run_start, simulate_day, base_seed + start, deadline)
+                       for start in range(num_starts)]
+
+            for future in futures:
+                result = future.result()
+                if result is None or result[0][0] != 0:
+                    continue
+                if best_plan is None or result[0] < best_plan[0]:
+                    best_plan = result
+    finally:
+        shared_block.close()
+        shared_block.unlink()
+
+    return best_plan
@@ -0,0 +1,113 @@
+class NearestNeighborIndex:
+    # NearestNeighborIndex constructor which indexes the candidate Packages by the index of their delivery address in
+    # the DistanceMatrix
+    # Nearest-neighbour queries walk the DistanceMatrix's presorted neighbour list for the queried address. Since
+    # candidates are only ever removed from the index, an address that no longer has any candidate Packages is skipped
+    # permanently by remembering how far along each neighbour list has been walked
+    def __init__(self, distance_matrix, package_list):
+        self.distance_matrix = distance_matrix
+        self.num_packages = 0
+
+        # Dictionaries keyed by address index holding the candidate Packages at that address, and keyed by Package ID
+        # holding the address index the Package was indexed under
+        self.packages_at_address = {}
+        self.package_address_index = {}
+
+        # Position reached in the presorted neighbour list of each queried address
+        self.neighbor_positions = {}
+
+        # Order in which each candidate Package was added, used to break ties between equally distant addresses the
+        # same way a linear scan over the candidate list would
+        self.package_order = {}
+
+        for package in package_list:
+            self.add(package)
+
+
+    # Space-Time Complexity: O(1)
+    # Adds a candidate Package to the index. Candidates can only be added before the first query
+    def add(self, package):
+        address_index = self.distance_matrix.index_of(package.delivery_address)
+        self.packages_at_address.setdefault(address_index, {})[package.id_number] = package
+        self.package_address_index[package.id_number] = address_index
+        self.package_order[package.id_number] = len(self.package_order)
+        self.num_packages += 1
+
+
+    # Space-Time Complexity: O(1)
+    # Removes a candidate Package from the index if it is in the index
+    def remove(self, package):
+        address_index = self.package_address_index.pop(package.id_number, None)
+        if address_index is None:
+            return
+
+        packages = self.packages_at_address[address_index]
+        del packages[package.id_number]
+        if len(packages) == 0:
+            del self.packages_at_address[address_index]
+        self.num_packages -= 1
+
+
+    # Space-Time Complexity: O(1) amortized per query, O(N) in total per queried address
+    # Returns the candidate Package nearest to the provided address, or None if the index is empty
+    def nearest(self, address):
+        if self.num_packages == 0:
+            return None
+
+        address_index = self.distance_matrix.index_of(address)
+        neighbors = self.distance_matrix.sorted_neighbors(address_index)
+        position = self.neighbor_positions.get(address_index, 0)
+
+        # Skip over addresses that have no candidate Packages left
+        while neighbors[position] not in self.packages_at_address:
+            position = position + 1
+        self.neighbor_positions[address_index] = position
+
+        # Among the addresses at the same nearest distance, pick the Package that was added to the index first
+        nearest_distance = self.distance_matrix.distance(address_index, neighbors[position])
+        nearest_package = next(iter(self.packages_at_address[neighbors[position]].values()))
+        position = position + 1
+        while position < len(neighbors) and \
+                self.distance_matrix.distance(address_index, neighbors[position]) == nearest_distance:
+            packages = self.packages_at_address.get(neighbors[position])
+            if packages is not None:
+                package = next(iter(packages.values()))
+                if self.package_order[package.id_number] < self.package_order[nearest_package.id_number]:
+                    nearest_package = package
+            position = position + 1
+
+        return nearest_package
+
+
+    # Space-Time Complexity: O(K) amortized, where K is the number of neighbour addresses walked
+    # Returns up to count candidate Packages at the addresses nearest to the provided address, nearest first. The first
+    # Package is the one nearest() returns, and each of the others is the first Package at the next nearest address
+    def nearest_candidates(self, address, count):
+        nearest_package = self.nearest(address)
+        if nearest_package is None:
+            return []
+
+        candidates = [nearest_package]
+        address_index = self.distance_matrix.index_of(address)
+        neighbors = self.distance_matrix.sorted_neighbors(address_index)
+        position = self.neighbor_positions[address_index]
+        while len(candidates) < count and position < len(neighbors):
+            packages = self.packages_at_address.get(neighbors[position])
+            if packages is not None:
+                package = next(iter(packages.values()))
+                if package is not nearest_package:
+                    candidates.append(package)
+            position = position + 1
+
+        return candidates
+
+
+    # Space-Time Complexity: O(K), where K is the number of candidate Packages at the address
+    # Returns the candidate Packages at the provided address, in the order they were added to the index
+    def packages_at(self, address):
+        return list(self.packages_at_address.get(self.distance_matrix.index_of(address), {}).values())
+
+
+    # Returns the number of candidate Packages in the index
+    def __len__(self):
+        return self.num_packages
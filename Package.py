@@ -1,11 +1,59 @@
-from datetime import datetime, timedelta
+import re
+from collections import namedtuple
+from datetime import timedelta
+
+# Record of a corrected delivery address for a Package and the time at which the correction becomes known
+AddressCorrection = namedtuple("AddressCorrection", ["time", "delivery_address", "delivery_city", "delivery_state",
+                                                     "delivery_zip"])
+
+# Update reporting that a Package will arrive at the hub at a later time than expected, received at the provided time
+LateArrival = namedtuple("LateArrival", ["time", "arrival_time"])
+
+# Update cancelling the delivery of a Package, received at the provided time
+Cancellation = namedtuple("Cancellation", ["time"])
+
+# Time a Package listed with the wrong address is held at the hub until, when no correction is configured for it
+wrong_address_hold_time = timedelta(hours=10, minutes=20)
+
+# Pattern matching a time of day such as "9:05", "9:05 am" or "10:30 AM"
+time_pattern = re.compile(r"(\d{1,2}):(\d{2})(?:\s*([AaPp][Mm]))?")
+
+
+# Space-Time Complexity: O(N), where N is the length of the text
+# Returns the first time of day found in the text as a timedelta since midnight, or None if the text has no time
+def parse_time_of_day(text):
+    match = time_pattern.search(text)
+    if match is None:
+        return None
+
+    hours = int(match.group(1))
+    minutes = int(match.group(2))
+    meridiem = match.group(3)
+    if meridiem is not None:
+        hours = hours % 12
+        if meridiem.upper() == "PM":
+            hours = hours + 12
+    return timedelta(hours=hours, minutes=minutes)
 
 
 class Package:
+    # Attributes are declared up front so each Package is stored without a per-instance dictionary
+    __slots__ = ("id_number", "delivery_address", "delivery_city", "delivery_state", "delivery_zip",
+                 "delivery_deadline", "package_mass", "special_notes", "delivery_status", "assigned_truck_id",
+                 "on_truck", "en_route_timestamp", "delivery_timestamp", "required_truck", "available_at", "deadline",
+                 "co_delivery_ids", "address_correction", "cancelled_timestamp")
+
     # Constructor for the Package object
     # Creates a Package object with the attributes passed into the constructor method
+    # The delivery deadline and special notes are parsed once here into typed attributes:
+    #   required_truck     - ID of the Truck the Package can only be on, or None
+    #   available_at       - time the Package can be assigned to a Truck if it is delayed or its address is wrong,
+    #                        or None if it is available at the start of the day
+    #   deadline           - delivery deadline as a timedelta, or None if the Package is due by the end of the day
+    #   co_delivery_ids    - IDs of the Packages this Package must be delivered with
+    #   address_correction - AddressCorrection record for a Package listed with the wrong address, or None
     def __init__(self, id_number, delivery_address, delivery_city, delivery_state, delivery_zip, delivery_deadline,
-                 package_mass, special_notes, delivery_status):
+                 package_mass, special_notes, delivery_status, address_correction=None):
         self.id_number = id_number
         self.delivery_address = delivery_address
         self.delivery_city = delivery_city
@@ -19,51 +67,44 @@ class Package:
         self.on_truck = False
         self.en_route_timestamp = None
         self.delivery_timestamp = None
+        self.cancelled_timestamp = None
 
+        self.deadline = parse_time_of_day(delivery_deadline)
+        self.required_truck = None
+        self.available_at = None
+        self.co_delivery_ids = ()
+        self.address_correction = address_correction
 
-    # Returns True if the Package is assigned to a Truck
-    def is_truck_assigned(self):
-        if self.assigned_truck_id is None:
-            return False
-        return True
-
+        if "Can only be on truck" in special_notes:
+            self.required_truck = [int(i) for i in special_notes.split() if i.isdigit()][0]
 
-    # Returns the id of the Truck that must deliver the Package
-    def get_required_truck_id(self):
-        if "Can only be on truck" in self.special_notes:
-            # Find the specific Truck
-            specified_truck_id = [int(i) for i in self.special_notes.split() if i.isdigit()][0]
-            return specified_truck_id
-        return None
+        if "Delayed on flight---will not arrive to depot until" in special_notes:
+            self.available_at = parse_time_of_day(special_notes)
 
+        if "Must be delivered with" in special_notes:
+            special_notes_commas_excluded = special_notes.replace(",", " ")
+            self.co_delivery_ids = tuple(int(i) for i in special_notes_commas_excluded.split() if i.isdigit())
 
-    # If the Package arrives at the depot late, this function returns the delayed arrival time
-    def get_delayed_arrival_time(self):
-        if "Delayed on flight---will not arrive to depot until" in self.special_notes:
-            tokenized_special_notes = self.special_notes.split()
-            for token in tokenized_special_notes:
-                try:
-                    timestamp = datetime.strptime(token, "%H:%M")
-                    delayed_arrival_timedelta = timedelta(hours=timestamp.hour, minutes=timestamp.minute)
-                    return delayed_arrival_timedelta
-                except:
-                    pass
         # Packages with the wrong address will also be considered delayed Packages and be able to get delivered after
-        # the address is updated, at 10:20 AM
-        if "Wrong address listed" in self.special_notes:
-            delayed_arrival_timedelta = timedelta(hours=10, minutes=20)
-            return delayed_arrival_timedelta
-        return None
+        # the address is updated. Without a configured correction they are held until wrong_address_hold_time, the
+        # time the correct address is expected, so they never leave the hub first thing with the wrong address
+        if address_correction is not None:
+            self.available_at = address_correction.time
+        elif "Wrong address listed" in special_notes:
+            if self.available_at is None or self.available_at < wrong_address_hold_time:
+                self.available_at = wrong_address_hold_time
 
 
-    # Converts the delivery_deadline from String format to timedelta format and returns the timedelta value
-    def get_delivery_deadline_timedelta(self):
-        tokenized_special_notes = self.delivery_deadline.split()
-        for token in tokenized_special_notes:
-            try:
-                timestamp = datetime.strptime(token, "%H:%M")
-                delivery_deadline_timedelta = timedelta(hours=timestamp.hour, minutes=timestamp.minute)
-                return delivery_deadline_timedelta
-            except:
-                pass
+    # Returns True if the Package is assigned to a Truck
+    def is_truck_assigned(self):
+        if self.assigned_truck_id is None:
+            return False
+        return True
+
 
+    # Updates the delivery address of the Package to its corrected address
+    def apply_address_correction(self):
+        self.delivery_address = self.address_correction.delivery_address
+        self.delivery_city = self.address_correction.delivery_city
+        self.delivery_state = self.address_correction.delivery_state
+        self.delivery_zip = self.address_correction.delivery_zip
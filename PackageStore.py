@@ -0,0 +1,170 @@
+from array import array
+
+# Time stored for an event that has not happened, such as the delivery of a Package that is still on its way, and for a
+# Package with no deadline or delayed arrival
+never = float("inf")
+
+# Truck ID stored for a Package that is not assigned to a Truck, and address index stored for a delivery address that
+# is not in the DistanceMatrix, such as a wrong address waiting to be corrected
+no_truck = -1
+no_address = -1
+
+
+class PackageStore:
+    # PackageStore constructor which is built next to the HashTable once the Packages are loaded
+    # The store keeps the fields the delivery simulation changes or filters on as parallel arrays, one slot per
+    # Package, instead of as attributes spread over individual Package objects:
+    #   package_ids       - Package IDs (int64)
+    #   address_indices   - index of the delivery address in the DistanceMatrix, or no_address (int32)
+    #   truck_ids         - ID of the Truck the Package is assigned to, or no_truck (int32)
+    #   deadline_seconds, available_seconds, en_route_seconds, delivered_seconds, cancelled_seconds
+    #                     - times in seconds since midnight, or never (float64)
+    # Each array holds 4 or 8 bytes per Package. The numbers of undelivered and unassigned Packages are maintained as
+    # counters, so checking whether the day is done is O(1) and other bulk questions are a scan over a single array
+    # The Package objects stay the record of the text fields. The simulation records every change it makes to a
+    # Package here as well
+    def __init__(self, ht, distance_matrix):
+        self.distance_matrix = distance_matrix
+        self.package_ids = array('q')
+        self.address_indices = array('i')
+        self.truck_ids = array('i')
+        self.deadline_seconds = array('d')
+        self.available_seconds = array('d')
+        self.en_route_seconds = array('d')
+        self.delivered_seconds = array('d')
+        self.cancelled_seconds = array('d')
+
+        # Dictionary used to find the slot of a Package ID in O(1) time
+        self.package_positions = {}
+
+        # Packages that are neither delivered nor cancelled, and Packages that are not assigned to a Truck or cancelled
+        self.num_undelivered = 0
+        self.num_unassigned = 0
+
+        # Space-Time Complexity: O(N)
+        for package in ht.values():
+            self.add_package(package)
+
+
+    # Space-Time Complexity: O(1) amortized
+    # Adds a slot for the Package, filled from its current state
+    def add_package(self, package):
+        self.package_positions[package.id_number] = len(self.package_ids)
+        self.package_ids.append(package.id_number)
+        self.address_indices.append(self.distance_matrix.address_index_table.get(package.delivery_address, no_address))
+        self.truck_ids.append(no_truck if package.assigned_truck_id is None else package.assigned_truck_id)
+        self.deadline_seconds.append(to_seconds(package.deadline))
+        self.available_seconds.append(to_seconds(package.available_at))
+        self.en_route_seconds.append(to_seconds(package.en_route_timestamp))
+        self.delivered_seconds.append(to_seconds(package.delivery_timestamp))
+        self.cancelled_seconds.append(to_seconds(package.cancelled_timestamp))
+
+        if package.delivery_timestamp is None and package.cancelled_timestamp is None:
+            self.num_undelivered += 1
+            if package.assigned_truck_id is None:
+                self.num_unassigned += 1
+
+
+    # Space-Time Complexity: O(K), where K is the number of Package IDs
+    # Records that the Packages with the provided IDs are loaded onto the Truck
+    def mark_assigned(self, package_ids, truck_id):
+        for package_id in package_ids:
+            position = self.package_positions[package_id]
+            if self.truck_ids[position] == no_truck:
+                self.num_unassigned -= 1
+            self.truck_ids[position] = truck_id
+
+
+    # Space-Time Complexity: O(K)
+    # Records that the Packages with the provided IDs left the hub at the provided time
+    def mark_en_route(self, package_ids, time):
+        seconds = time.total_seconds()
+        for package_id in package_ids:
+            self.en_route_seconds[self.package_positions[package_id]] = seconds
+
+
+    # Space-Time Complexity: O(K)
+    # Records that the Packages with the provided IDs were delivered at the provided time
+    def mark_delivered(self, package_ids, time):
+        seconds = time.total_seconds()
+        for package_id in package_ids:
+            position = self.package_positions[package_id]
+            if self.delivered_seconds[position] == never and self.cancelled_seconds[position] == never:
+                self.num_undelivered -= 1
+            self.delivered_seconds[position] = seconds
+
+
+    # Space-Time Complexity: O(1)
+    # Records that the delivery of the Package with the provided ID was cancelled at the provided time
+    def mark_cancelled(self, package_id, time):
+        position = self.package_positions[package_id]
+        if self.delivered_seconds[position] == never and self.cancelled_seconds[position] == never:
+            self.num_undelivered -= 1
+            if self.truck_ids[position] == no_truck:
+                self.num_unassigned -= 1
+        self.cancelled_seconds[position] = time.total_seconds()
+
+
+    # Space-Time Complexity: O(1)
+    # Records the time the Package with the provided ID becomes available at the hub
+    def set_available_at(self, package_id, time):
+        self.available_seconds[self.package_positions[package_id]] = to_seconds(time)
+
+
+    # Space-Time Complexity: O(1)
+    # Records the delivery address of the Package with the provided ID after its address changes
+    def set_address(self, package_id, address):
+        self.address_indices[self.package_positions[package_id]] = \
+            self.distance_matrix.address_index_table.get(address, no_address)
+
+
+    # Space-Time Complexity: O(1)
+    # Returns True if every Package has been delivered, apart from cancelled ones
+    def all_delivered(self):
+        return self.num_undelivered == 0
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the ID of the Truck carrying the Package with the provided ID if it has left the hub on that Truck and
+    # has not been delivered or cancelled, otherwise None
+    def get_carrying_truck_id(self, package_id):
+        position = self.package_positions[package_id]
+        if self.truck_ids[position] == no_truck or self.en_route_seconds[position] == never or \
+                self.delivered_seconds[position] != never or self.cancelled_seconds[position] != never:
+            return None
+        return self.truck_ids[position]
+
+
+    # Space-Time Complexity: O(N)
+    # Returns the IDs of the Packages that are neither delivered nor cancelled, in the order they were added
+    def get_undelivered_ids(self):
+        if self.num_undelivered == 0:
+            return []
+        return [self.package_ids[position] for position in range(len(self.package_ids))
+                if self.delivered_seconds[position] == never and self.cancelled_seconds[position] == never]
+
+
+    # Space-Time Complexity: O(N)
+    # Returns the number of Packages delivered before the provided time, in seconds since midnight
+    def count_delivered_before(self, seconds):
+        return sum(1 for delivered_seconds in self.delivered_seconds if delivered_seconds < seconds)
+
+
+    # Space-Time Complexity: O(N)
+    # Returns the number of Packages that were delivered after their deadline
+    def count_late(self):
+        return sum(1 for delivered_seconds, deadline_seconds in zip(self.delivered_seconds, self.deadline_seconds)
+                   if deadline_seconds < delivered_seconds < never)
+
+
+    # Returns the number of Packages in the store
+    def __len__(self):
+        return len(self.package_ids)
+
+
+# Space-Time Complexity: O(1)
+# Returns the timedelta as a number of seconds, or never if it is None
+def to_seconds(time):
+    if time is None:
+        return never
+    return time.total_seconds()
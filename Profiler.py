@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+# Environment variables that switch the profiler on and name the Chrome trace file it writes
+profile_environment_variable = "WGUPS_PROFILE"
+trace_environment_variable = "WGUPS_TRACE"
+
+
+class Profiler:
+    # Profiler constructor
+    # The profiler instruments functions by replacing them on their class or module with wrappers that time or count
+    # their calls, and puts the original functions back when it is stopped. Nothing is wrapped unless a profiler is
+    # created, so the planning code runs at full speed when profiling is switched off
+    # Timed functions become stages, which are summarized by call count and total, mean and maximum time and are written
+    # to the Chrome trace as complete events. Counted functions only have their calls counted, which keeps the overhead
+    # of instrumenting hot functions such as distance lookups and hash probes low
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        self.process_id = os.getpid()
+
+        # Dictionary keyed by stage name holding [number of calls, total nanoseconds, maximum nanoseconds]
+        self.stage_totals = {}
+        self.counters = {}
+
+        # Number of HashTable lookups keyed by the number of buckets they probed
+        self.probe_length_counts = {}
+
+        self.trace_events = []
+
+        # (owner, attribute name, original value) of every instrumented function, used to restore them
+        self.instrumented = []
+
+
+    # Space-Time Complexity: O(1)
+    # Replaces the function stored as the attribute of the owner (a class or module) with a wrapper that records every
+    # call as a stage with the provided name
+    def time_function(self, owner, attribute, name=None):
+        function = getattr(owner, attribute)
+        stage_name = name or attribute
+        record_stage = self.record_stage
+
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            start_ns = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record_stage(stage_name, start_ns, time.perf_counter_ns())
+
+        self.replace(owner, attribute, timed_function)
+
+
+    # Space-Time Complexity: O(1)
+    # Replaces the function stored as the attribute of the owner with a wrapper that counts its calls under the
+    # provided name
+    def count_function(self, owner, attribute, name=None):
+        function = getattr(owner, attribute)
+        counter_name = name or attribute
+        counters = self.counters
+        counters.setdefault(counter_name, 0)
+
+        @wraps(function)
+        def counted_function(*args, **kwargs):
+            counters[counter_name] += 1
+            return function(*args, **kwargs)
+
+        self.replace(owner, attribute, counted_function)
+
+
+    # Space-Time Complexity: O(1)
+    # Replaces HashTable.find_bucket with a wrapper that counts its calls and records the probe length of each one
+    def record_probe_lengths(self, hashtable_class):
+        find_bucket = hashtable_class.find_bucket
+        counters = self.counters
+        counters.setdefault("HashTable.find_bucket", 0)
+        probe_length_counts = self.probe_length_counts
+
+        @wraps(find_bucket)
+        def counted_find_bucket(ht, key):
+            bucket = find_bucket(ht, key)
+            counters["HashTable.find_bucket"] += 1
+            probe_length_counts[ht.last_probe_length] = probe_length_counts.get(ht.last_probe_length, 0) + 1
+            return bucket
+
+        self.replace(hashtable_class, "find_bucket", counted_find_bucket)
+
+
+    # Stores the wrapper in place of the original attribute and remembers the original so it can be restored
+    def replace(self, owner, attribute, wrapper):
+        self.instrumented.append((owner, attribute, owner.__dict__[attribute]))
+        setattr(owner, attribute, wrapper)
+
+
+    # Space-Time Complexity: O(F), where F is the number of instrumented functions
+    # Puts every instrumented function back the way it was before the profiler wrapped it
+    def stop(self):
+        for owner, attribute, original in reversed(self.instrumented):
+            setattr(owner, attribute, original)
+        self.instrumented = []
+
+
+    # Space-Time Complexity: O(1) amortized
+    # Adds a finished call of a stage to its totals and to the trace
+    def record_stage(self, name, start_ns, end_ns):
+        elapsed_ns = end_ns - start_ns
+        totals = self.stage_totals.get(name)
+        if totals is None:
+            self.stage_totals[name] = [1, elapsed_ns, elapsed_ns]
+        else:
+            totals[0] += 1
+            totals[1] += elapsed_ns
+            if elapsed_ns > totals[2]:
+                totals[2] = elapsed_ns
+
+        self.trace_events.append({
+            "name": name,
+            "cat": "stage",
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000,
+            "dur": elapsed_ns / 1000,
+            "pid": self.process_id,
+            "tid": threading.get_ident(),
+        })
+
+
+    # Space-Time Complexity: O(L), where L is the number of distinct probe lengths
+    # Returns the probe length at the provided fraction of all recorded HashTable lookups
+    def probe_length_percentile(self, fraction):
+        num_lookups = sum(self.probe_length_counts.values())
+        target = fraction * num_lookups
+        num_seen = 0
+        for probe_length in sorted(self.probe_length_counts):
+            num_seen += self.probe_length_counts[probe_length]
+            if num_seen >= target:
+                return probe_length
+        return 0
+
+
+    # Space-Time Complexity: O(S log S + C log C + L log L)
+    # Returns the lines of the summary table of stage timers, call counters and HashTable probe lengths
+    def get_summary_lines(self):
+        lines = ["%-48s %9s %12s %10s %10s" % ("stage", "calls", "total ms", "mean ms", "max ms")]
+        for name, (num_calls, total_ns, max_ns) in sorted(self.stage_totals.items(),
+                                                          key=lambda item: item[1][1], reverse=True):
+            lines.append("%-48s %9d %12.3f %10.4f %10.4f" % (name, num_calls, total_ns / 1e6,
+                                                              total_ns / num_calls / 1e6, max_ns / 1e6))
+
+        lines.append("")
+        lines.append("%-48s %9s" % ("counter", "calls"))
+        for name, num_calls in sorted(self.counters.items(), key=lambda item: item[1], reverse=True):
+            lines.append("%-48s %9d" % (name, num_calls))
+
+        num_lookups = sum(self.probe_length_counts.values())
+        if num_lookups > 0:
+            mean_probe_length = sum(probe_length * count for probe_length, count in
+                                    self.probe_length_counts.items()) / num_lookups
+            lines.append("")
+            lines.append("HashTable probe lengths: lookups %d, mean %.2f, p50 %d, p90 %d, p99 %d, max %d" % (
+                num_lookups, mean_probe_length, self.probe_length_percentile(0.50),
+                self.probe_length_percentile(0.90), self.probe_length_percentile(0.99),
+                max(self.probe_length_counts)))
+
+        return lines
+
+
+    # Space-Time Complexity: O(E), where E is the number of recorded stage calls
+    # Writes the recorded stages and the final counter values to a Chrome trace-event JSON file, which can be opened in
+    # chrome://tracing or Perfetto
+    def write_chrome_trace(self, trace_path):
+        end_us = (time.perf_counter_ns() - self.origin_ns) / 1000
+        counter_events = [{"name": name, "cat": "counter", "ph": "C", "ts": end_us, "pid": self.process_id,
+                           "args": {"calls": num_calls}} for name, num_calls in self.counters.items()]
+
+        with open(trace_path, 'w') as trace_file:
+            json.dump({"traceEvents": self.trace_events + counter_events, "displayTimeUnit": "ms"}, trace_file)
@@ -0,0 +1,41 @@
+from collections import OrderedDict
+
+
+class QueryCache:
+    # QueryCache constructor which holds the results of the most recently used queries, up to max_entries of them
+    # Results are kept in an OrderedDict from the least to the most recently used, so a lookup moves its entry to the
+    # end and adding an entry past the limit evicts the entry at the front, both in O(1) time
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.num_hits = 0
+        self.num_misses = 0
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the result stored under the key and marks it as the most recently used, or None if it is not cached
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.num_misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.num_hits += 1
+        return result
+
+
+    # Space-Time Complexity: O(1)
+    # Stores the result under the key as the most recently used entry, evicting the least recently used entry if the
+    # cache is full
+    def put(self, key, result):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+    # Returns the number of cached results
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,234 @@
+import time
+
+from DeadlineScheduler import no_deadline
+from DistanceMatrix import numpy
+
+# Smallest change in mileage that counts as an improvement, which keeps float rounding noise from being accepted as a
+# shorter route
+improvement_epsilon = 1e-6
+
+# Longest run of consecutive stops that an Or-opt move relocates
+max_or_opt_segment_length = 3
+
+
+# Space-Time Complexity: O(N)
+# Returns the number of Packages on the route that would be delivered after their deadline
+# The route is a list of address indices that starts and ends at the hub, and stop_deadlines is the parallel list of the
+# deadlines (in seconds since midnight) of the Packages delivered at each stop, as tuples that all have the same length
+# padded with no_deadline. With NumPy the arrival time at every stop is computed in one cumulative sum over the
+# gathered leg distances
+def count_late_packages(distance_matrix, route, stop_deadlines, start_time, mph):
+    dense_distances = distance_matrix.dense()
+    if dense_distances is not None:
+        route_indices = numpy.asarray(route)
+        # Travel times are rounded to the second, the same way the Truck computes them
+        travel_seconds = numpy.round(dense_distances[route_indices[:-2], route_indices[1:-1]] / mph * 3600)
+        arrival_seconds = start_time.total_seconds() + numpy.cumsum(travel_seconds)
+        return int(numpy.count_nonzero(arrival_seconds[:, None] > numpy.asarray(stop_deadlines[1:-1])))
+
+    elapsed_seconds = start_time.total_seconds()
+    num_late_packages = 0
+
+    for stop in range(1, len(route) - 1):
+        # Travel times are rounded to the second, the same way the Truck computes them
+        elapsed_seconds += round(distance_matrix.distance(route[stop - 1], route[stop]) / mph * 3600)
+        for deadline_seconds in stop_deadlines[stop]:
+            if elapsed_seconds > deadline_seconds:
+                num_late_packages += 1
+
+    return num_late_packages
+
+
+# Space-Time Complexity: O(N)
+# Returns the deadlines of the Packages at each of the Stops (None for the hub) as tuples padded with no_deadline to the
+# largest number of Packages with a deadline at any one Stop, so they line up as the rows of an array
+def get_stop_deadlines(stops):
+    stop_deadlines = [() if stop is None else tuple(package.deadline.total_seconds() for package in stop.packages
+                                                    if package.deadline is not None) for stop in stops]
+    width = max([1] + [len(deadlines) for deadlines in stop_deadlines])
+    return [deadlines + (no_deadline,) * (width - len(deadlines)) for deadlines in stop_deadlines]
+
+
+# Space-Time Complexity: O(1) per move, O(N^2) to exhaust
+# Yields the 2-opt moves that shorten the route as (i, j) tuples, where the stops from i to j are reversed. The moves
+# are yielded in the same order with or without NumPy
+def two_opt_moves(distance_matrix, route):
+    dense_distances = distance_matrix.dense()
+    if dense_distances is not None:
+        yield from batch_two_opt_moves(dense_distances, route)
+        return
+
+    distance = distance_matrix.distance
+    num_stops = len(route)
+
+    for i in range(1, num_stops - 2):
+        removed_edge = distance(route[i - 1], route[i])
+        for j in range(i + 1, num_stops - 1):
+            # Reversing the stops from i to j replaces the edges (i - 1, i) and (j, j + 1) with (i - 1, j) and
+            # (i, j + 1), so the change in mileage only depends on those four edges
+            delta = (distance(route[i - 1], route[j]) + distance(route[i], route[j + 1])
+                     - removed_edge - distance(route[j], route[j + 1]))
+            if delta < -improvement_epsilon:
+                yield i, j
+
+
+# Space-Time Complexity: O(N^2)
+# Yields the 2-opt moves that shorten the route like two_opt_moves, but computes the mileage delta of every (i, j) pair
+# at once from the dense NumPy distance array
+def batch_two_opt_moves(dense_distances, route):
+    num_stops = len(route)
+    if num_stops < 4:
+        return
+
+    route_indices = numpy.asarray(route)
+    i = numpy.arange(1, num_stops - 2)[:, None]
+    j = numpy.arange(2, num_stops - 1)[None, :]
+    deltas = (dense_distances[route_indices[i - 1], route_indices[j]]
+              + dense_distances[route_indices[i], route_indices[j + 1]]
+              - dense_distances[route_indices[i - 1], route_indices[i]]
+              - dense_distances[route_indices[j], route_indices[j + 1]])
+
+    # The nonzero positions come out row by row, which is the order the pure Python loops visit the moves in
+    move_rows, move_columns = numpy.nonzero((j > i) & (deltas < -improvement_epsilon))
+    for row, column in zip(move_rows.tolist(), move_columns.tolist()):
+        yield row + 1, column + 2
+
+
+# Space-Time Complexity: O(1) per move, O(N^2) to exhaust
+# Yields the Or-opt moves that shorten the route as (i, segment_length, position, reverse) tuples, where the segment of
+# stops starting at i is moved, optionally reversed, to follow the stop at position. The moves are yielded in the same
+# order with or without NumPy
+def or_opt_moves(distance_matrix, route):
+    dense_distances = distance_matrix.dense()
+    if dense_distances is not None:
+        yield from batch_or_opt_moves(dense_distances, route)
+        return
+
+    distance = distance_matrix.distance
+    num_stops = len(route)
+
+    for segment_length in range(1, max_or_opt_segment_length + 1):
+        for i in range(1, num_stops - segment_length):
+            first = route[i]
+            last = route[i + segment_length - 1]
+            previous_stop = route[i - 1]
+            next_stop = route[i + segment_length]
+            removal_gain = (distance(previous_stop, first) + distance(last, next_stop)
+                            - distance(previous_stop, next_stop))
+
+            for position in range(num_stops - 1):
+                # The segment cannot be inserted next to or inside itself
+                if i - 1 <= position <= i + segment_length - 1:
+                    continue
+
+                a = route[position]
+                b = route[position + 1]
+                if distance(a, first) + distance(last, b) - distance(a, b) - removal_gain < -improvement_epsilon:
+                    yield i, segment_length, position, False
+                if distance(a, last) + distance(first, b) - distance(a, b) - removal_gain < -improvement_epsilon:
+                    yield i, segment_length, position, True
+
+
+# Space-Time Complexity: O(N^2)
+# Yields the Or-opt moves that shorten the route like or_opt_moves, but computes the mileage deltas of every segment
+# and position for each segment length at once from the dense NumPy distance array
+def batch_or_opt_moves(dense_distances, route):
+    num_stops = len(route)
+    route_indices = numpy.asarray(route)
+    position = numpy.arange(num_stops - 1)[None, :]
+    a = route_indices[position]
+    b = route_indices[position + 1]
+
+    for segment_length in range(1, max_or_opt_segment_length + 1):
+        if num_stops - segment_length <= 1:
+            break
+
+        i = numpy.arange(1, num_stops - segment_length)[:, None]
+        first = route_indices[i]
+        last = route_indices[i + segment_length - 1]
+        previous_stop = route_indices[i - 1]
+        next_stop = route_indices[i + segment_length]
+        removal_gain = (dense_distances[previous_stop, first] + dense_distances[last, next_stop]
+                        - dense_distances[previous_stop, next_stop])
+
+        forward_deltas = dense_distances[a, first] + dense_distances[last, b] - dense_distances[a, b] - removal_gain
+        reverse_deltas = dense_distances[a, last] + dense_distances[first, b] - dense_distances[a, b] - removal_gain
+
+        # The segment cannot be inserted next to or inside itself
+        outside_segment = (position < i - 1) | (position > i + segment_length - 1)
+        improving = numpy.stack(((forward_deltas < -improvement_epsilon) & outside_segment,
+                                 (reverse_deltas < -improvement_epsilon) & outside_segment), axis=2)
+
+        # The nonzero positions come out by segment start, then position, then forward before reversed, which is the
+        # order the pure Python loops visit the moves in
+        for row, column, reverse in zip(*(axis.tolist() for axis in numpy.nonzero(improving))):
+            yield row + 1, segment_length, column, reverse == 1
+
+
+# Returns a copy of the list with the items from i to j reversed
+def reverse_segment(items, i, j):
+    return items[:i] + items[i:j + 1][::-1] + items[j + 1:]
+
+
+# Returns a copy of the list with the segment of items starting at i moved, optionally reversed, to follow the item at
+# position
+def move_segment(items, i, segment_length, position, reverse):
+    segment = items[i:i + segment_length]
+    if reverse:
+        segment = segment[::-1]
+    remaining = items[:i] + items[i + segment_length:]
+    if position > i:
+        position = position - segment_length
+    return remaining[:position + 1] + segment + remaining[position + 1:]
+
+
+# Space-Time Complexity: O(S^2) per accepted move, bounded by the time budget, where S is the number of stops
+# Improves the order of the stops of the Truck with 2-opt and Or-opt moves until no move shortens the route or the time
+# budget (in seconds) runs out. The moves reorder the Truck's Stops, so every move relocates all the Packages at an
+# address together. Moves are found with O(1) mileage deltas, and a shortening move is only accepted if it does not
+# increase the number of Packages delivered after their deadline. Returns the miles saved
+def improve_route(truck, distance_matrix, time_budget):
+    stops = [None] + truck.stops + [None]
+    if len(stops) < 4:
+        return 0
+
+    hub_index = distance_matrix.index_of(truck.hub_address)
+    route = [hub_index] + [stop.address_index for stop in stops[1:-1]] + [hub_index]
+    stop_deadlines = get_stop_deadlines(stops)
+    initial_length = distance_matrix.route_length(route)
+    num_late_packages = count_late_packages(distance_matrix, route, stop_deadlines, truck.time_obj, truck.mph)
+    end_time = time.perf_counter() + time_budget
+
+    move_applied = True
+    while move_applied and time.perf_counter() < end_time:
+        move_applied = False
+
+        for move in two_opt_moves(distance_matrix, route):
+            candidate_route = reverse_segment(route, *move)
+            candidate_stops = reverse_segment(stops, *move)
+            candidate_deadlines = reverse_segment(stop_deadlines, *move)
+            candidate_num_late = count_late_packages(distance_matrix, candidate_route, candidate_deadlines,
+                                                     truck.time_obj, truck.mph)
+            if candidate_num_late <= num_late_packages:
+                move_applied = True
+                break
+
+        if not move_applied:
+            for move in or_opt_moves(distance_matrix, route):
+                candidate_route = move_segment(route, *move)
+                candidate_stops = move_segment(stops, *move)
+                candidate_deadlines = move_segment(stop_deadlines, *move)
+                candidate_num_late = count_late_packages(distance_matrix, candidate_route, candidate_deadlines,
+                                                         truck.time_obj, truck.mph)
+                if candidate_num_late <= num_late_packages:
+                    move_applied = True
+                    break
+
+        if move_applied:
+            route = candidate_route
+            stops = candidate_stops
+            stop_deadlines = candidate_deadlines
+            num_late_packages = candidate_num_late
+
+    truck.set_stops(stops[1:-1])
+    return initial_length - distance_matrix.route_length(route)
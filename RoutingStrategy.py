@@ -0,0 +1,238 @@
+import time
+from abc import ABC, abstractmethod
+
+from DeadlineScheduler import schedule_deadlines
+from NearestNeighborIndex import NearestNeighborIndex
+from RouteImprover import improve_route
+from TruckPartitioner import NeighborSavings, partition_packages
+
+
+class RoutingStrategy(ABC):
+    # RoutingStrategy constructor
+    # A routing strategy decides which Packages each Truck loads at the hub and the order it delivers them in. The
+    # delivery simulation calls load_truck whenever a Truck is at the hub, and every strategy finishes a loaded route
+    # the same way: its stops are reordered around the Package deadlines, then shortened by 2-opt/Or-opt local search
+    # for route_improvement_time_budget seconds if a budget is set
+    # candidate_count is the number of nearest Packages each randomized pick is made from when a random number
+    # generator is passed in by the multi-start solver
+    def __init__(self, route_improvement_time_budget=None, candidate_count=3):
+        self.route_improvement_time_budget = route_improvement_time_budget
+        self.candidate_count = candidate_count
+
+
+    # Loads the Truck at the hub for its next trip. truck_list holds every Truck in the simulation, rng is an optional
+    # random number generator used to randomize the plan, and deadline is an optional wall-clock deadline (in seconds
+    # since the epoch) that caps the route improvement stage. Every strategy must implement it, so a strategy that does
+    # not cannot be created
+    @abstractmethod
+    def load_truck(self, ht, truck, truck_list, distance_matrix, constraint_index, rng=None, deadline=None):
+        pass
+
+
+    # Space-Time Complexity: O(N^2) plus the route improvement time budget
+    # Reorders the Truck's stops around the Package deadlines, flags any Package that will still be delivered late,
+    # groups the final load into the Truck's Stops and shortens the route with local search
+    def finish_route(self, ht, truck, distance_matrix, deadline=None):
+        if truck.at_hub is not True:
+            return
+
+        for late_package in schedule_deadlines(ht, truck, distance_matrix):
+            print("Warning: Package %d on Truck %d is scheduled to be delivered after its %s deadline" %
+                  (late_package.id_number, truck.id, late_package.delivery_deadline))
+        truck.load_stops(ht, distance_matrix)
+
+        improvement_time_budget = self.route_improvement_time_budget
+        if deadline is not None:
+            improvement_time_budget = max(0, deadline - time.time())
+            if self.route_improvement_time_budget is not None:
+                improvement_time_budget = min(improvement_time_budget, self.route_improvement_time_budget)
+        if improvement_time_budget is not None:
+            truck.miles_saved_by_route_improvement += improve_route(truck, distance_matrix, improvement_time_budget)
+
+
+# Routing strategy that loads one Truck at a time, greedily filling it with the Package nearest to the last Package
+# added until it is full or nothing else can be assigned
+class NearestNeighborStrategy(RoutingStrategy):
+    # Space-Time Complexity: O(N^2)
+    # Loads the Truck with assign_packages and finishes its route
+    def load_truck(self, ht, truck, truck_list, distance_matrix, constraint_index, rng=None, deadline=None):
+        self.assign_packages(ht, truck, distance_matrix, constraint_index, rng)
+        self.finish_route(ht, truck, distance_matrix, deadline)
+
+
+    # Space-Time Complexity: O(N^2)
+    # Efficiently assigns Packages to the Truck until either all assignable Packages are assigned or until the Truck is
+    # full. Packages are picked a stop at a time: once a Package is picked, the other assignable Packages at its address
+    # are loaded with it. Every Package is loaded along with the whole group of Packages it must be delivered with, and
+    # only if the whole group fits in the room left on the Truck. When a random number generator is provided, each stop
+    # is picked at random from the candidate_count stops nearest to the last address instead of always taking the
+    # nearest one, which gives the multi-start solver a different plan for every seed
+    def assign_packages(self, ht, truck, distance_matrix, constraint_index, rng=None):
+        # Space-Time Complexity: O(log N + K)
+        # Index the Packages of the groups that can currently be assigned to the Truck by the location of their
+        # delivery address
+        candidate_packages = []
+        package_groups = {}
+        for group in constraint_index.get_assignable_groups(truck.id, truck.time_obj):
+            candidate_packages.extend(group.packages)
+            for package in group.packages:
+                package_groups[package.id_number] = group
+        candidate_index = NearestNeighborIndex(distance_matrix, candidate_packages)
+
+        # Assign Packages until the Truck can no longer assign more Packages
+        while len(candidate_index) > 0 and not truck.is_full() and truck.at_hub is True:
+            # If the package_list is empty for the Truck, the current address will be set to the mail hub
+            if len(truck.packages_id_list) == 0:
+                address = truck.hub_address
+            else:
+                num_packages_in_truck = len(truck.packages_id_list)
+                last_package_added_id = truck.packages_id_list[num_packages_in_truck - 1]
+                last_package_added = ht.lookup(last_package_added_id)
+                address = last_package_added.delivery_address
+
+            # Space-Time Complexity: O(1) amortized
+            # Assign the closest Package to the last address
+            if rng is None:
+                nearest_package = candidate_index.nearest(address)
+            else:
+                nearest_package = rng.choice(candidate_index.nearest_candidates(address, self.candidate_count))
+
+            # Space-Time Complexity: O(K), where K is the number of Packages at the address and in their groups
+            # Load the group of every assignable Package at the same address as the same stop
+            num_packages_loaded = len(truck.packages_id_list)
+            for stop_package in candidate_index.packages_at(nearest_package.delivery_address):
+                group = package_groups.get(stop_package.id_number)
+                if group is None:
+                    # The Package's group was already handled along with another Package at the address
+                    continue
+
+                # The room left on the Truck only shrinks during a trip, so a group that does not fit now never will
+                for package in group.packages:
+                    del package_groups[package.id_number]
+                    candidate_index.remove(package)
+                self.assign_group(truck, group, constraint_index)
+
+            # If we added associated Packages, sort the truck's Package list to ensure it the route is optimized
+            if len(truck.packages_id_list) > num_packages_loaded:
+                self.sort_truck_package_list(ht, truck, distance_matrix)
+
+
+    # Space-Time Complexity: O(G log N), where G is the size of the group
+    # Assigns every Package of the AssignableGroup to the Truck in one step if the whole group fits in the room left on
+    # the Truck, otherwise assigns none of them
+    def assign_group(self, truck, group, constraint_index):
+        if group.size > truck.max_num_packages - len(truck.packages_id_list):
+            return
+
+        for package in group.packages:
+            truck.assign_package(package)
+        for package in group.packages:
+            constraint_index.mark_assigned(package.id_number)
+
+
+    # Space-Time Complexity: O(N^2) worst-case, O(N) amortized per presorted neighbour list
+    # Sorts the list of Packages in the Truck to be ordered with priority of the shortest distance between each Package
+    def sort_truck_package_list(self, ht, truck, distance_matrix):
+        # Create a sorted Package_id list
+        sorted_package_id_list = []
+        current_address = truck.hub_address
+        package_index = NearestNeighborIndex(distance_matrix, truck.get_package_list(ht))
+
+        # Iterate through the Package list and add the Package IDs in the order of the shortest distance between each
+        # Package
+        while len(package_index) != 0:
+            nearest_package = package_index.nearest(current_address)
+            sorted_package_id_list.append(nearest_package.id_number)
+            current_address = nearest_package.delivery_address
+            package_index.remove(nearest_package)
+
+        # Set the sorted list as the Truck's package id list
+        truck.packages_id_list = sorted_package_id_list
+
+
+# Routing strategy that splits the unassigned Packages across every empty Truck leaving the hub at the same time with
+# the savings algorithm, then tops up each Truck's load the same way as NearestNeighborStrategy
+class SavingsStrategy(NearestNeighborStrategy):
+    # SavingsStrategy constructor
+    # The strategy keeps the NeighborSavings of each hub, keyed by hub address, from trip to trip, along with the
+    # DistanceMatrix they were computed from
+    def __init__(self, route_improvement_time_budget=None, candidate_count=3):
+        NearestNeighborStrategy.__init__(self, route_improvement_time_budget, candidate_count)
+        self.neighbor_savings = {}
+        self.savings_distance_matrix = None
+
+
+    # The savings are not sent along to the multi-start worker processes, which compute their own over the shared
+    # distances
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["neighbor_savings"] = {}
+        state["savings_distance_matrix"] = None
+        return state
+
+
+    # Space-Time Complexity: O(N^2)
+    # Partitions the Packages across the Trucks at the hub if the Truck is empty, then loads it and finishes its route
+    def load_truck(self, ht, truck, truck_list, distance_matrix, constraint_index, rng=None, deadline=None):
+        if truck.at_hub is True and len(truck.packages_id_list) == 0:
+            self.partition_truck_loads(ht, truck, truck_list, distance_matrix, constraint_index, rng)
+        NearestNeighborStrategy.load_truck(self, ht, truck, truck_list, distance_matrix, constraint_index, rng,
+                                           deadline)
+
+
+    # Space-Time Complexity: O(N * K log(N * K)), where K is the number of neighbours of each address in NeighborSavings
+    # Splits the unassigned Packages across the Truck and every other empty Truck with a Driver at the same depot at the
+    # same time, so the Trucks leaving together get geographically compact loads instead of the first Truck taking the
+    # nearest Packages and the others taking what is left. Packages that must be delivered together always end up on
+    # the same Truck, along with the Truck restriction of any of them
+    def partition_truck_loads(self, ht, truck, truck_list, distance_matrix, constraint_index, rng=None):
+        trucks = [truck]
+        for other_truck in truck_list:
+            if other_truck is not truck and other_truck.at_hub is True and len(other_truck.packages_id_list) == 0 and \
+                    other_truck.time_obj == truck.time_obj and other_truck.driver is not None and \
+                    other_truck.hub_address == truck.hub_address:
+                trucks.append(other_truck)
+
+        # Space-Time Complexity: O(N)
+        # Collect the groups of Packages that any of the Trucks can take, each of which is partitioned as one unit
+        units = {}
+        for other_truck in trucks:
+            for group in constraint_index.get_assignable_groups(other_truck.id, other_truck.time_obj):
+                units[group.group_id] = (group.packages, group.required_truck)
+
+        truck_loads = partition_packages(distance_matrix, self.get_neighbor_savings(distance_matrix, truck.hub_address),
+                                         list(units.values()), trucks, rng)
+        for other_truck in trucks:
+            if other_truck.id in truck_loads:
+                for package in truck_loads[other_truck.id]:
+                    other_truck.assign_package(package)
+                    constraint_index.mark_assigned(package.id_number)
+                self.sort_truck_package_list(ht, other_truck, distance_matrix)
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the NeighborSavings of the hub, which keep the savings computed on earlier trips from the hub. The savings
+    # are started over if the strategy is used with another DistanceMatrix
+    def get_neighbor_savings(self, distance_matrix, hub_address):
+        if self.savings_distance_matrix is not distance_matrix:
+            self.savings_distance_matrix = distance_matrix
+            self.neighbor_savings = {}
+
+        if hub_address not in self.neighbor_savings:
+            self.neighbor_savings[hub_address] = NeighborSavings(distance_matrix, distance_matrix.index_of(hub_address))
+        return self.neighbor_savings[hub_address]
+
+
+# Routing strategies that can be selected by name
+routing_strategies = {
+    "nearest_neighbor": NearestNeighborStrategy,
+    "savings": SavingsStrategy,
+}
+
+
+# Returns a new instance of the routing strategy with the provided name, passing the remaining arguments to its
+# constructor. Raises ValueError for an unknown name
+def get_routing_strategy(name, *args, **kwargs):
+    if name not in routing_strategies:
+        raise ValueError("Unknown routing strategy: %s" % name)
+    return routing_strategies[name](*args, **kwargs)
@@ -0,0 +1,63 @@
+import asyncio
+
+from BatchQueries import answer_query_line
+from QueryCache import QueryCache
+
+# Longest query line in bytes a client may send before its connection is closed
+max_query_line_bytes = 64 * 1024
+
+
+class StatusServer:
+    # StatusServer constructor which answers status queries against a single planned day over a line protocol
+    # The server is an asyncio TCP server: every client connection is served by its own coroutine on one event loop,
+    # so many customer-service agents can stay connected and send queries at the same time while the StatusTimeline is
+    # loaded only once. Each connection sends one JSON query per line, in the format answered by --batch, and receives
+    # one JSON result per line in the same order. Answering a query never blocks, so the queries are answered on the
+    # event loop itself, and the package_status and fleet_mileage results are shared between connections through a
+    # bounded LRU QueryCache
+    def __init__(self, timeline, cache_size):
+        self.timeline = timeline
+        self.cache = QueryCache(cache_size)
+        self.num_connections = 0
+        self.num_queries = 0
+
+
+    # Space-Time Complexity: O(Q) queries, each answered as described in BatchQueries.answer_query
+    # Answers the queries sent on one client connection until the client closes it or sends a line that is too long
+    async def handle_connection(self, reader, writer):
+        self.num_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"error": "Query line is too long"}\n')
+                    break
+                except ConnectionError:
+                    break
+                if line == b"":
+                    break
+
+                result_line = answer_query_line(self.timeline, line.decode("utf-8", "replace"), self.cache)
+                if result_line is None:
+                    continue
+                self.num_queries += 1
+                writer.write(result_line.encode("utf-8") + b"\n")
+
+                # Wait for the client to read its results if they are piling up in the write buffer
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.num_connections -= 1
+            writer.close()
+
+
+    # Listens on the host and port and serves client connections until the server is cancelled. on_listening is called
+    # with the addresses the server listens on once it accepts connections
+    async def serve(self, host, port, on_listening=None):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=max_query_line_bytes)
+        if on_listening is not None:
+            on_listening([socket.getsockname() for socket in server.sockets])
+        async with server:
+            await server.serve_forever()
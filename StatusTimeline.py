@@ -0,0 +1,391 @@
+import os
+import struct
+from array import array
+from bisect import bisect_right
+
+# Delivery statuses a Package moves through over the day
+AT_HUB = 0
+EN_ROUTE = 1
+DELIVERED = 2
+CANCELLED = 3
+
+# Time used for a transition that never happens, such as the delivery of a Package that was never delivered
+never = float("inf")
+
+# Layout of the saved plan file:
+#   header          - magic bytes, format version, the plan key the file was saved under, number of Packages, number of
+#                     Trucks, sizes of the details and route address tables in bytes and number of handoffs
+#   package table   - the Package IDs as int32 values, then the en route, delivered and cancelled times as float64
+#                     values
+#   details table   - each Package's report details stored as a 4-byte length followed by its UTF-8 encoded text
+#   truck table     - the Truck IDs and the number of mileage timestamps of each Truck as int32 values, then the times
+#                     and mileages of every Truck's timestamps as float64 values
+#   route table     - every distinct address the Trucks stopped at, each stored as a 4-byte length followed by its UTF-8
+#                     encoded text, then the index into those addresses of every Truck's timestamps as int32 values
+#   handoff table   - the time of every handoff as float64 values, then the Driver IDs, the IDs of the Trucks handed
+#                     off and the IDs of the Trucks taken as int32 values
+# All values are little-endian
+plan_magic = b"WGUP"
+plan_version = 3
+plan_header = struct.Struct("<4sHH32sIIIII")
+plan_details_length = struct.Struct("<I")
+
+
+# Space-Time Complexity: O(1)
+# Formats a number of seconds since midnight as a time of day in the format [HOUR:MINUTE AM/PM], e.g. "09:05 AM"
+def format_time_of_day(seconds):
+    minutes = int(seconds // 60)
+    hours = (minutes // 60) % 24
+    meridiem = "AM" if hours < 12 else "PM"
+    return "%02d:%02d %s" % (hours % 12 or 12, minutes % 60, meridiem)
+
+
+# Returns the number of seconds since midnight of the hour and minute of the datetime
+def seconds_since_midnight(report_datetime):
+    return report_datetime.hour * 3600 + report_datetime.minute * 60
+
+
+class StatusTimeline:
+    # StatusTimeline constructor which is built once after the delivery simulation has finished
+    # For every Package, ordered by ID, the timeline stores the times it left the hub and was delivered along with its
+    # pre-formatted delivery time and details, so the status of every Package at a given time is found in O(N) without
+    # parsing or formatting any timestamps. For every Truck, it stores the times and mileages of its mileage timestamps
+    # in sorted lists that are binary searched, along with the address it stopped at for each timestamp. The handoffs of
+    # Drivers between Trucks are kept in time order
+    def __init__(self, ht, truck_list):
+        self.package_ids = sorted(ht)
+        self.en_route_seconds = []
+        self.delivered_seconds = []
+        self.cancelled_seconds = []
+        self.package_details = []
+
+        # Space-Time Complexity: O(N log N)
+        for package_id in self.package_ids:
+            package = ht.lookup(package_id)
+
+            en_route_seconds = never
+            if package.en_route_timestamp is not None:
+                en_route_seconds = package.en_route_timestamp.total_seconds()
+            delivered_seconds = never
+            if package.delivery_timestamp is not None:
+                delivered_seconds = package.delivery_timestamp.total_seconds()
+            cancelled_seconds = never
+            if package.cancelled_timestamp is not None:
+                cancelled_seconds = package.cancelled_timestamp.total_seconds()
+
+            self.en_route_seconds.append(en_route_seconds)
+            self.delivered_seconds.append(delivered_seconds)
+            self.cancelled_seconds.append(cancelled_seconds)
+            self.package_details.append("\tAddress: " + package.delivery_address +
+                                        "\tCity: " + package.delivery_city +
+                                        "\tZIP Code: " + package.delivery_zip +
+                                        "\tPackage Weight: " + package.package_mass + " kilograms" +
+                                        "\tDelivery Deadline: " + package.delivery_deadline)
+
+        # Space-Time Complexity: O(M), where M is the number of mileage timestamps
+        self.truck_ids = []
+        self.truck_mileage_seconds = {}
+        self.truck_mileages = {}
+        self.truck_route_addresses = {}
+        for truck in truck_list:
+            self.truck_ids.append(truck.id)
+            self.truck_mileage_seconds[truck.id] = [timestamp.total_seconds() for _, timestamp in
+                                                    truck.mileage_timestamps]
+            self.truck_mileages[truck.id] = [mileage for mileage, _ in truck.mileage_timestamps]
+            self.truck_route_addresses[truck.id] = list(truck.route_addresses)
+
+        # (time, Driver ID, Truck ID handed off, Truck ID taken) of every handoff, in time order
+        self.handoffs = sorted((timestamp.total_seconds(), driver_id, previous_truck_id, truck.id)
+                               for truck in truck_list for timestamp, driver_id, previous_truck_id in truck.handoffs)
+
+        self.build_indexes()
+
+
+    # Space-Time Complexity: O(N log N)
+    # Builds the Package positions, the pre-formatted delivery and cancellation times and the sorted status transitions
+    # from the per-Package times, which are all the timeline needs to be rebuilt from a saved plan
+    def build_indexes(self):
+        self.package_positions = {}
+        self.delivered_text = []
+        self.cancelled_text = []
+        for position, package_id in enumerate(self.package_ids):
+            self.package_positions[package_id] = position
+
+            delivered_text = None
+            if self.delivered_seconds[position] != never:
+                delivered_text = format_time_of_day(self.delivered_seconds[position])
+            cancelled_text = None
+            if self.cancelled_seconds[position] != never:
+                cancelled_text = format_time_of_day(self.cancelled_seconds[position])
+            self.delivered_text.append(delivered_text)
+            self.cancelled_text.append(cancelled_text)
+
+        # Every status change of every Package, sorted by time, used to sweep through many report times at once
+        self.transitions = []
+        for position in range(len(self.package_ids)):
+            if self.en_route_seconds[position] != never:
+                self.transitions.append((self.en_route_seconds[position], position, EN_ROUTE))
+            if self.delivered_seconds[position] != never:
+                self.transitions.append((self.delivered_seconds[position], position, DELIVERED))
+            if self.cancelled_seconds[position] != never:
+                self.transitions.append((self.cancelled_seconds[position], position, CANCELLED))
+        self.transitions.sort()
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the status of the Package at the position in the timeline at the provided time
+    def get_status(self, position, seconds):
+        if seconds >= self.cancelled_seconds[position]:
+            return CANCELLED
+        if seconds < self.en_route_seconds[position]:
+            return AT_HUB
+        if seconds < self.delivered_seconds[position]:
+            return EN_ROUTE
+        return DELIVERED
+
+
+    # Space-Time Complexity: O(1)
+    # Returns True if the timeline has a Package with the provided ID
+    def has_package(self, package_id):
+        return package_id in self.package_positions
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the report line for the Package at the position in the timeline with the provided status
+    def format_package_status(self, position, status):
+        package_info_status = "[Package ID = %d] " % self.package_ids[position]
+
+        if status == AT_HUB:
+            package_info_status += "\tDelivery Status: At the hub"
+        elif status == CANCELLED:
+            package_info_status += "\tDelivery Status: Cancelled at " + self.cancelled_text[position]
+        elif status == EN_ROUTE and self.delivered_text[position] is None:
+            # The delivery of a Package cancelled while it is on a Truck never happens
+            package_info_status += "\tDelivery Status: En route to delivery address, delivery cancelled at " + \
+                                   self.cancelled_text[position]
+        elif status == EN_ROUTE:
+            package_info_status += "\tDelivery Status: En route to delivery address, expected delivery at " + \
+                                   self.delivered_text[position]
+        else:
+            package_info_status += "\tDelivery Status: Delivered at " + self.delivered_text[position]
+
+        return package_info_status + self.package_details[position]
+
+
+    # Space-Time Complexity: O(1)
+    # Returns the report line for the Package with the provided ID at the provided time
+    def get_package_report_line(self, package_id, seconds):
+        position = self.package_positions[package_id]
+        return self.format_package_status(position, self.get_status(position, seconds))
+
+
+    # Space-Time Complexity: O(N)
+    # Returns the report lines for every Package, ordered by ID, at the provided time
+    def get_report_lines(self, seconds):
+        report_lines = []
+        for position in range(len(self.package_ids)):
+            report_lines.append(self.format_package_status(position, self.get_status(position, seconds)))
+        return report_lines
+
+
+    # Space-Time Complexity: O(N log N + Q log Q + N * Q), where Q is the number of report times
+    # Yields (time, statuses) pairs for each of the provided report times in increasing order, where statuses is the
+    # list of every Package's status ordered by ID. All report times are covered by one sweep through the transitions
+    def get_statuses_at_times(self, report_seconds_list):
+        statuses = [AT_HUB] * len(self.package_ids)
+        transition_index = 0
+
+        for seconds in sorted(report_seconds_list):
+            while transition_index < len(self.transitions) and self.transitions[transition_index][0] <= seconds:
+                _, position, status = self.transitions[transition_index]
+                statuses[position] = status
+                transition_index += 1
+            yield seconds, list(statuses)
+
+
+    # Space-Time Complexity: O(log M)
+    # Returns the mileage of the Truck at the provided time
+    def get_truck_mileage(self, truck_id, seconds):
+        index = bisect_right(self.truck_mileage_seconds[truck_id], seconds) - 1
+        if index < 0:
+            return 0
+        return self.truck_mileages[truck_id][index]
+
+
+    # Space-Time Complexity: O(T log M)
+    # Returns a list of (Truck ID, mileage) pairs for every Truck at the provided time
+    def get_fleet_mileage(self, seconds):
+        return [(truck_id, self.get_truck_mileage(truck_id, seconds)) for truck_id in self.truck_ids]
+
+
+    # Space-Time Complexity: O(log M + S), where S is the number of stops returned
+    # Returns a list of (time, mileage, address) tuples for every stop the Truck had reached by the provided time, in
+    # the order it drove them
+    def get_truck_route(self, truck_id, seconds):
+        num_stops = bisect_right(self.truck_mileage_seconds[truck_id], seconds)
+        return list(zip(self.truck_mileage_seconds[truck_id][:num_stops], self.truck_mileages[truck_id][:num_stops],
+                        self.truck_route_addresses[truck_id][:num_stops]))
+
+
+    # Space-Time Complexity: O(log H + H), where H is the number of handoffs
+    # Returns the (time, Driver ID, Truck ID handed off, Truck ID taken) tuples of the handoffs made by the provided
+    # time
+    def get_handoffs(self, seconds):
+        return self.handoffs[:bisect_right(self.handoffs, (seconds, float("inf")))]
+
+
+    # Space-Time Complexity: O(N + M)
+    # Writes the per-Package times and details and the mileage timestamps and route of every Truck to the provided path
+    # in the binary plan format. plan_key is a 32-byte digest of the inputs the plan was made from, which load()
+    # compares against so a plan is only reused while its inputs are unchanged
+    def save(self, plan_path, plan_key):
+        details_table = bytearray()
+        for details in self.package_details:
+            encoded_details = details.encode("utf-8")
+            details_table += plan_details_length.pack(len(encoded_details))
+            details_table += encoded_details
+
+        truck_counts = [len(self.truck_mileage_seconds[truck_id]) for truck_id in self.truck_ids]
+        truck_times = array('d')
+        for truck_id in self.truck_ids:
+            truck_times.extend(self.truck_mileage_seconds[truck_id])
+            truck_times.extend(self.truck_mileages[truck_id])
+
+        # Each distinct address is stored once and the routes refer to it by index
+        route_address_indices = {}
+        route_address_table = bytearray()
+        route_indices = array('i')
+        for truck_id in self.truck_ids:
+            for address in self.truck_route_addresses[truck_id]:
+                address_index = route_address_indices.get(address)
+                if address_index is None:
+                    address_index = route_address_indices[address] = len(route_address_indices)
+                    encoded_address = address.encode("utf-8")
+                    route_address_table += plan_details_length.pack(len(encoded_address))
+                    route_address_table += encoded_address
+                route_indices.append(address_index)
+
+        handoff_times = array('d', [handoff[0] for handoff in self.handoffs])
+        handoff_ids = array('i', [handoff[column] for column in range(1, 4) for handoff in self.handoffs])
+
+        package_times = array('d', self.en_route_seconds + self.delivered_seconds + self.cancelled_seconds)
+        package_table = array('i', self.package_ids).tobytes() + package_times.tobytes()
+        truck_table = array('i', self.truck_ids + truck_counts).tobytes() + truck_times.tobytes()
+
+        # The plan is written to a temporary file first so a partially written plan is never loaded
+        temporary_path = plan_path + ".tmp"
+        with open(temporary_path, "wb") as plan_file:
+            plan_file.write(plan_header.pack(plan_magic, plan_version, 0, plan_key, len(self.package_ids),
+                                             len(self.truck_ids), len(details_table), len(route_address_table),
+                                             len(self.handoffs)))
+            plan_file.write(package_table)
+            plan_file.write(details_table)
+            plan_file.write(truck_table)
+            plan_file.write(route_address_table)
+            plan_file.write(route_indices.tobytes())
+            plan_file.write(handoff_times.tobytes())
+            plan_file.write(handoff_ids.tobytes())
+        os.replace(temporary_path, plan_path)
+
+
+    # Space-Time Complexity: O(N log N + M)
+    # Reads a plan written by save() and returns the StatusTimeline rebuilt from it. Returns None if the file is
+    # missing, is not a valid plan or was saved under a different plan key
+    @classmethod
+    def load(cls, plan_path, plan_key):
+        try:
+            with open(plan_path, "rb") as plan_file:
+                plan_data = plan_file.read()
+        except OSError:
+            return None
+
+        if len(plan_data) < plan_header.size:
+            return None
+        magic, version, _, saved_plan_key, num_packages, num_trucks, details_table_size, route_address_table_size, \
+            num_handoffs = plan_header.unpack_from(plan_data, 0)
+        if magic != plan_magic or version != plan_version or saved_plan_key != plan_key:
+            return None
+
+        try:
+            offset = plan_header.size
+            package_ids = array('i')
+            package_ids.frombytes(plan_data[offset:offset + 4 * num_packages])
+            offset += 4 * num_packages
+            package_times = array('d')
+            package_times.frombytes(plan_data[offset:offset + 8 * 3 * num_packages])
+            offset += 8 * 3 * num_packages
+
+            # Decode the details table
+            package_details = []
+            details_end = offset + details_table_size
+            while offset < details_end:
+                (details_length,) = plan_details_length.unpack_from(plan_data, offset)
+                offset += plan_details_length.size
+                package_details.append(plan_data[offset:offset + details_length].decode("utf-8"))
+                offset += details_length
+
+            truck_columns = array('i')
+            truck_columns.frombytes(plan_data[offset:offset + 4 * 2 * num_trucks])
+            offset += 4 * 2 * num_trucks
+            truck_counts = truck_columns[num_trucks:]
+            num_timestamps_total = sum(truck_counts)
+            truck_times = array('d')
+            truck_times.frombytes(plan_data[offset:offset + 8 * 2 * num_timestamps_total])
+            offset += 8 * 2 * num_timestamps_total
+
+            # Decode the route table
+            route_addresses = []
+            route_address_table_end = offset + route_address_table_size
+            while offset < route_address_table_end:
+                (address_length,) = plan_details_length.unpack_from(plan_data, offset)
+                offset += plan_details_length.size
+                route_addresses.append(plan_data[offset:offset + address_length].decode("utf-8"))
+                offset += address_length
+            route_indices_offset = offset
+            route_indices = array('i')
+            route_indices.frombytes(plan_data[offset:offset + 4 * num_timestamps_total])
+            offset += 4 * num_timestamps_total
+
+            handoff_times = array('d')
+            handoff_times.frombytes(plan_data[offset:offset + 8 * num_handoffs])
+            offset += 8 * num_handoffs
+            handoff_ids = array('i')
+            handoff_ids.frombytes(plan_data[offset:])
+        except (ValueError, struct.error, UnicodeDecodeError):
+            return None
+
+        if len(package_ids) != num_packages or len(package_times) != 3 * num_packages or \
+                len(package_details) != num_packages or len(truck_counts) != num_trucks or \
+                len(truck_times) != 2 * num_timestamps_total or route_indices_offset != route_address_table_end or \
+                len(route_indices) != num_timestamps_total or len(handoff_times) != num_handoffs or \
+                len(handoff_ids) != 3 * num_handoffs or \
+                any(not 0 <= address_index < len(route_addresses) for address_index in route_indices):
+            return None
+
+        timeline = cls.__new__(cls)
+        timeline.package_ids = package_ids.tolist()
+        timeline.en_route_seconds = package_times[:num_packages].tolist()
+        timeline.delivered_seconds = package_times[num_packages:2 * num_packages].tolist()
+        timeline.cancelled_seconds = package_times[2 * num_packages:].tolist()
+        timeline.package_details = package_details
+
+        timeline.truck_ids = truck_columns[:num_trucks].tolist()
+        timeline.truck_mileage_seconds = {}
+        timeline.truck_mileages = {}
+        timeline.truck_route_addresses = {}
+        time_offset = 0
+        route_offset = 0
+        for truck_id, num_timestamps in zip(timeline.truck_ids, truck_counts):
+            timeline.truck_route_addresses[truck_id] = [route_addresses[address_index] for address_index in
+                                                        route_indices[route_offset:route_offset + num_timestamps]]
+            route_offset += num_timestamps
+            timeline.truck_mileage_seconds[truck_id] = truck_times[time_offset:time_offset + num_timestamps].tolist()
+            time_offset += num_timestamps
+            timeline.truck_mileages[truck_id] = truck_times[time_offset:time_offset + num_timestamps].tolist()
+            time_offset += num_timestamps
+
+        timeline.handoffs = list(zip(handoff_times, handoff_ids[:num_handoffs],
+                                     handoff_ids[num_handoffs:2 * num_handoffs], handoff_ids[2 * num_handoffs:]))
+
+        timeline.build_indexes()
+        return timeline
@@ -0,0 +1,29 @@
+class Stop:
+    # Stop constructor which holds one delivery address of a route and every Package delivered there
+    # Routes are planned and driven stop by stop, so Packages sharing an address are visited once, as a single stop,
+    # instead of as a run of zero-mile stops that each have to be routed and delivered on their own
+    def __init__(self, address_index, address):
+        self.address_index = address_index
+        self.address = address
+        self.packages = []
+
+
+    # Space-Time Complexity: O(K), where K is the number of Packages at the stop
+    # Returns the IDs of the Packages delivered at the stop
+    def get_package_ids(self):
+        return [package.id_number for package in self.packages]
+
+
+# Space-Time Complexity: O(N)
+# Groups the Packages into Stops keyed by the index of their delivery address and returns the Stops in the order their
+# first Package appears in the list. Packages at the same address keep their relative order within the Stop
+def group_stops(distance_matrix, packages):
+    stops = {}
+    for package in packages:
+        address_index = distance_matrix.index_of(package.delivery_address)
+        stop = stops.get(address_index)
+        if stop is None:
+            stop = Stop(address_index, package.delivery_address)
+            stops[address_index] = stop
+        stop.packages.append(package)
+    return list(stops.values())
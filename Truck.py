@@ -1,23 +1,47 @@
+from collections import namedtuple
 from datetime import timedelta
 
+from Stop import group_stops
+
+# Record of the properties of one Truck in the fleet: the address of the depot it is based at, its average speed in
+# miles per hour, the number of Packages it can carry and the time its shift starts
+TruckProfile = namedtuple("TruckProfile", ["hub_address", "mph", "max_num_packages", "shift_start"])
+
 
 class Truck:
-    # Constants used to change the properties of all Truck objects created
+    # Constants used as the properties of Trucks created without a TruckProfile
     average_speed = 18
     max_num_packages = 16
+    default_hub_address = "4001 South 700 East"
+    default_shift_start = timedelta(hours=8, minutes=0, seconds=0)
 
-    # Truck constructor with optional parameter to define the average speed (in miles per hour) that the truck travels
-    def __init__(self, truck_id, mph=average_speed, max_num_packages=max_num_packages):
+    # Truck constructor with optional parameters to define the average speed (in miles per hour) that the truck
+    # travels, the number of Packages it can carry, the depot it is based at and the time its shift starts
+    def __init__(self, truck_id, mph=average_speed, max_num_packages=max_num_packages,
+                 hub_address=default_hub_address, shift_start=default_shift_start):
         self.id = truck_id
         self.packages_id_list = []
+        # Stops of the current trip still to be visited, in order, grouped from packages_id_list once per trip
+        self.stops = []
         self.mph = mph
         self.max_num_packages = max_num_packages
         self.total_distance_traveled = 0
         self.mileage_timestamps = []
+        # Address the Truck is at as of each mileage timestamp, which together are the route it drove over the day
+        self.route_addresses = []
         self.driver = None
-        self.time_obj = timedelta(hours=8, minutes=0, seconds=0)
-        self.hub_address = "4001 South 700 East"
+        # (time, Driver ID, ID of the Truck the Driver left) of every handoff of a Driver onto this Truck
+        self.handoffs = []
+        self.time_obj = shift_start
+        self.hub_address = hub_address
         self.at_hub = True
+        self.miles_saved_by_route_improvement = 0
+
+
+    # Returns a new Truck with the provided ID and the properties of the TruckProfile
+    @classmethod
+    def from_profile(cls, truck_id, profile):
+        return cls(truck_id, profile.mph, profile.max_num_packages, profile.hub_address, profile.shift_start)
 
 
     # Adds the package to the list of packages that will be delivered by this Truck
@@ -39,26 +63,45 @@ class Truck:
             package.en_route_timestamp = self.time_obj
 
 
-    # Delivers the Package
-    def deliver_package(self, ht, package_id, distance_traveled):
-        package = ht.lookup(package_id)
-        self.packages_id_list.remove(package_id)
+    # Space-Time Complexity: O(N)
+    # Drives the Truck to the first of its remaining stops and delivers every Package of the stop there. Returns the IDs
+    # of the delivered Packages
+    def deliver_stop(self, distance_traveled):
+        stop = self.stops.pop(0)
+        package_ids = stop.get_package_ids()
+        del self.packages_id_list[:len(package_ids)]
+        self.drive_to_stop(distance_traveled, stop.address)
+        for package in stop.packages:
+            package.delivery_status = "Delivered"
+            package.delivery_timestamp = self.time_obj
+        return package_ids
+
+
+    # Drives the Truck to its next stop at the provided address and updates the distance covered and time passed for
+    # the Truck
+    def drive_to_stop(self, distance_traveled, stop_address):
         self.at_hub = False
         self.add_mileage(distance_traveled)
-        self.time_obj += timedelta(minutes=(distance_traveled / self.mph * 60))
+        self.time_obj += self.travel_time(distance_traveled)
         self.mileage_timestamps.append([self.total_distance_traveled, self.time_obj])
-        package.delivery_status = "Delivered"
-        package.delivery_timestamp = self.time_obj
+        self.route_addresses.append(stop_address)
 
 
     # Sends the Truck back to the hub and updates the distance covered and time passed for the Truck
     def send_back_to_hub(self, distance_from_hub):
         self.add_mileage(distance_from_hub)
-        self.time_obj += timedelta(minutes=(distance_from_hub / self.mph * 60))
+        self.time_obj += self.travel_time(distance_from_hub)
         self.mileage_timestamps.append([self.total_distance_traveled, self.time_obj])
+        self.route_addresses.append(self.hub_address)
         self.at_hub = True
 
 
+    # Returns the time it takes the Truck to travel the provided number of miles, rounded to the nearest second so that
+    # float32 distances loaded from the distance cache do not leave sub-second noise in the timestamps
+    def travel_time(self, miles):
+        return timedelta(seconds=round(miles / self.mph * 3600))
+
+
     # Adds mileage to the total distance traveled metric
     def add_mileage(self, miles):
         self.total_distance_traveled = self.total_distance_traveled + miles
@@ -74,6 +117,22 @@ class Truck:
         return packages_list
 
 
+    # Space-Time Complexity: O(N)
+    # Groups the Packages loaded onto the Truck into Stops by delivery address, in the order they are visited, and keeps
+    # them as the Truck's remaining stops. Called once the Truck's load is final, so the Stops are not rebuilt from the
+    # Package list every time the route is scored or driven
+    def load_stops(self, ht, distance_matrix):
+        self.set_stops(group_stops(distance_matrix, self.get_package_list(ht)))
+
+
+    # Space-Time Complexity: O(N)
+    # Sets the Truck's remaining stops and its delivery order to the Packages of the Stops, visited in the order of the
+    # list
+    def set_stops(self, stops):
+        self.stops = stops
+        self.packages_id_list = [package_id for stop in stops for package_id in stop.get_package_ids()]
+
+
     # Returns True if the Truck's number of Packages assigned is equal to the maximum number of Packages it can carry
     def is_full(self):
         if len(self.packages_id_list) == self.max_num_packages:
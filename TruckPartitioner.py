@@ -0,0 +1,184 @@
+from DeadlineScheduler import no_deadline
+
+# Largest relative change made to each saving when the savings are randomized
+savings_noise = 0.2
+
+# Number of nearest addresses each address has savings to. Addresses further apart are never linked directly
+savings_neighbor_count = 20
+
+
+class Cluster:
+    # Cluster constructor which starts a cluster from a single unit, a list of Packages that must go on the same Truck
+    # The cluster keeps its stops as a path of address indices, so two clusters are only merged end to end the way the
+    # Clarke-Wright savings algorithm joins two routes
+    def __init__(self, distance_matrix, packages, required_truck):
+        self.packages = list(packages)
+        self.required_truck = required_truck
+        self.route = []
+        for package in packages:
+            address_index = distance_matrix.index_of(package.delivery_address)
+            if address_index not in self.route:
+                self.route.append(address_index)
+
+        # A cluster with no Package deadline ranks after every cluster that has one
+        self.earliest_deadline = no_deadline
+        for package in packages:
+            if package.deadline is not None:
+                self.earliest_deadline = min(self.earliest_deadline, package.deadline.total_seconds())
+
+
+    # Returns True if the Packages of both clusters can be loaded onto the same Truck
+    def can_merge(self, other, capacity):
+        if len(self.packages) + len(other.packages) > capacity:
+            return False
+        return self.required_truck is None or other.required_truck is None or \
+            self.required_truck == other.required_truck
+
+
+    # Space-Time Complexity: O(N)
+    # Joins the other cluster onto this one, linking this cluster's end at address1_index to the other cluster's end at
+    # address2_index
+    def merge(self, other, address1_index, address2_index):
+        if self.route[-1] != address1_index:
+            self.route.reverse()
+        other_route = other.route
+        if other_route[0] != address2_index:
+            other_route = other_route[::-1]
+
+        self.route.extend(other_route)
+        self.packages.extend(other.packages)
+        if self.required_truck is None:
+            self.required_truck = other.required_truck
+        self.earliest_deadline = min(self.earliest_deadline, other.earliest_deadline)
+
+
+class NeighborSavings:
+    # NeighborSavings constructor which holds the savings of the Clarke-Wright algorithm for the Trucks of one hub
+    # Instead of a saving for every pair of units, each address only has savings to its num_neighbors nearest
+    # addresses, itself included, read from the DistanceMatrix's presorted neighbour lists. The list of an address is
+    # computed the first time a unit ends there and kept for every later trip from the hub, so each trip only gathers
+    # the lists of the addresses its units end at: O(U * K) savings in memory instead of O(U^2)
+    def __init__(self, distance_matrix, hub_index, num_neighbors=savings_neighbor_count):
+        self.distance_matrix = distance_matrix
+        self.hub_index = hub_index
+        self.num_neighbors = num_neighbors
+
+        # Lists of (saving, address index, neighbor index) tuples keyed by address index
+        self.address_savings = {}
+
+
+    # Space-Time Complexity: O(K) once the address's list is computed, O(N log N) the first time an address is seen
+    # Returns the positive savings of linking the address at the provided index to each of its nearest addresses
+    def get(self, address_index):
+        savings = self.address_savings.get(address_index)
+        if savings is None:
+            distance = self.distance_matrix.distance
+            hub_distance = distance(self.hub_index, address_index)
+            savings = []
+            for neighbor_index in self.distance_matrix.sorted_neighbors(address_index)[:self.num_neighbors + 1]:
+                saving = hub_distance + distance(self.hub_index, neighbor_index) - distance(address_index,
+                                                                                            neighbor_index)
+                if saving > 0:
+                    savings.append((saving, address_index, neighbor_index))
+            self.address_savings[address_index] = savings
+        return savings
+
+
+# Space-Time Complexity: O(U * K log(U * K)) plus the merge attempts, where U is the number of units and K the number
+# of neighbours of each address in neighbor_savings
+# Splits the units across the Trucks waiting at the hub with the Clarke-Wright savings algorithm and returns a
+# dictionary of the Packages to load onto each Truck, keyed by Truck ID
+# units is a list of (Packages, required Truck ID or None) pairs, where each list of Packages must go on the same Truck.
+# Every unit starts as its own cluster, and the clusters ending at the pair of addresses with the largest saving, the
+# distance from the hub to each address minus the distance between them, are joined first as long as the merged
+# cluster fits on a Truck and does not need two different Trucks. Only the addresses near each other in
+# neighbor_savings are considered. The clusters are then matched to the Trucks, restricted clusters first and then by
+# earliest deadline and size. Clusters that do not get a Truck are left for later trips
+# When a random number generator is provided, every saving is scaled by a random factor within savings_noise of 1 so
+# each seed of the multi-start solver merges the clusters in a different order
+def partition_packages(distance_matrix, neighbor_savings, units, trucks, rng=None):
+    if len(units) == 0 or len(trucks) == 0:
+        return {}
+
+    capacity = max(truck.max_num_packages - len(truck.packages_id_list) for truck in trucks)
+
+    clusters = [Cluster(distance_matrix, packages, required_truck) for packages, required_truck in units
+                if len(packages) <= capacity]
+
+    # Positions of the clusters that end at each address
+    clusters_at_end = {}
+    for position, cluster in enumerate(clusters):
+        for address_index in {cluster.route[0], cluster.route[-1]}:
+            clusters_at_end.setdefault(address_index, []).append(position)
+
+    for saving, address1_index, address2_index in get_savings(neighbor_savings, clusters_at_end, rng):
+        for i in list(clusters_at_end.get(address1_index, ())):
+            for j in list(clusters_at_end.get(address2_index, ())):
+                # The cluster at i may have been merged away or no longer end at the address
+                if i not in clusters_at_end.get(address1_index, ()):
+                    break
+                if i == j or j not in clusters_at_end.get(address2_index, ()):
+                    continue
+                if not clusters[i].can_merge(clusters[j], capacity):
+                    continue
+                merge_clusters(clusters, clusters_at_end, i, address1_index, j, address2_index, capacity)
+
+    merged_clusters = [cluster for cluster in clusters if cluster is not None]
+    merged_clusters.sort(key=lambda cluster: (cluster.required_truck is None, cluster.earliest_deadline,
+                                              -len(cluster.packages)))
+
+    # Match the clusters to the Trucks, giving restricted clusters their Truck before the others are placed
+    truck_loads = {}
+    free_trucks = list(trucks)
+    for cluster in merged_clusters:
+        for truck in free_trucks:
+            if cluster.required_truck is not None and truck.id != cluster.required_truck:
+                continue
+            if len(cluster.packages) > truck.max_num_packages - len(truck.packages_id_list):
+                continue
+            truck_loads[truck.id] = cluster.packages
+            free_trucks.remove(truck)
+            break
+
+    return truck_loads
+
+
+# Space-Time Complexity: O(U * K log(U * K))
+# Returns the savings between the addresses the clusters end at and their nearest addresses that clusters also end at,
+# largest first, as (saving, address1_index, address2_index) tuples with each pair of addresses listed once. Each
+# saving is randomized by rng if one is provided
+def get_savings(neighbor_savings, clusters_at_end, rng=None):
+    savings = {}
+    for address_index in sorted(clusters_at_end):
+        for saving, address1_index, address2_index in neighbor_savings.get(address_index):
+            if address2_index in clusters_at_end:
+                savings[min(address1_index, address2_index), max(address1_index, address2_index)] = saving
+
+    savings = [(saving, address1_index, address2_index)
+               for (address1_index, address2_index), saving in sorted(savings.items())]
+    if rng is not None:
+        savings = [(saving * rng.uniform(1 - savings_noise, 1 + savings_noise), address1_index, address2_index)
+                   for saving, address1_index, address2_index in savings]
+
+    # A stable sort keeps equal savings in address order
+    savings.sort(key=lambda entry: entry[0], reverse=True)
+    return savings
+
+
+# Space-Time Complexity: O(N + E), where E is the number of clusters ending at the four ends involved
+# Joins the cluster at position j onto the cluster at position i, linking the end of i at address1_index to the end of
+# j at address2_index, and updates the addresses the merged cluster ends at. A cluster with no room left for another
+# Package is not listed at its ends anymore, since it cannot be merged again
+def merge_clusters(clusters, clusters_at_end, i, address1_index, j, address2_index, capacity):
+    cluster1 = clusters[i]
+    cluster2 = clusters[j]
+    for address_index in {cluster1.route[0], cluster1.route[-1], cluster2.route[0], cluster2.route[-1]}:
+        clusters_at_end[address_index] = [position for position in clusters_at_end[address_index]
+                                          if position != i and position != j]
+
+    cluster1.merge(cluster2, address1_index, address2_index)
+    clusters[j] = None
+    if len(cluster1.packages) >= capacity:
+        return
+    for address_index in {cluster1.route[0], cluster1.route[-1]}:
+        clusters_at_end[address_index].append(i)
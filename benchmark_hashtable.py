@@ -0,0 +1,105 @@
+# Micro-benchmark for the HashTable probing strategies
+# For each probing strategy, key distribution and load factor, the HashTable is filled to the load factor and the
+# script reports the probe-length distribution of successful lookups along with insert and lookup throughput
+#
+# Usage: python benchmark_hashtable.py [capacity]
+
+import random
+import sys
+import time
+
+from HashTable import HashTable, probing_strategies
+
+load_factors = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+# Minimal stand-in for a Package, since the HashTable only reads the id_number of the items it stores
+class BenchmarkItem:
+    __slots__ = ("id_number",)
+
+    def __init__(self, id_number):
+        self.id_number = id_number
+
+
+# Returns the keys used for each ID distribution
+def generate_keys(distribution, num_keys):
+    if distribution == "sequential":
+        return list(range(1, num_keys + 1))
+    if distribution == "random":
+        return random.sample(range(1, num_keys * 1000), num_keys)
+    # IDs that share their low bits, such as IDs issued in fixed-size blocks
+    return [i * 64 for i in range(1, num_keys + 1)]
+
+
+# Returns the value at the provided percentile of a sorted list
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+# Fills a HashTable to the load factor and returns a dictionary of the measured statistics
+def run_benchmark(probing, distribution, load_factor, capacity):
+    num_keys = int(capacity * load_factor)
+    keys = generate_keys(distribution, num_keys)
+    items = [BenchmarkItem(key) for key in keys]
+
+    # A maximum load factor of 1.0 keeps the HashTable at the requested capacity while it is filled
+    ht = HashTable(initial_capacity=capacity, max_load_factor=1.0, probing=probing)
+
+    start = time.perf_counter()
+    for item in items:
+        ht.insert(item)
+    insert_seconds = time.perf_counter() - start
+
+    random.shuffle(keys)
+    start = time.perf_counter()
+    for key in keys:
+        ht.lookup(key)
+    lookup_seconds = time.perf_counter() - start
+
+    # Collect the probe length of every successful lookup
+    probe_lengths = []
+    for key in keys:
+        ht.find_bucket(key)
+        probe_lengths.append(ht.last_probe_length)
+    probe_lengths.sort()
+
+    # Keys that are not in the HashTable probe until they reach a bucket that has never been used
+    missing_probe_total = 0
+    for key in range(-1, -1001, -1):
+        ht.find_bucket(key)
+        missing_probe_total += ht.last_probe_length
+
+    return {
+        "probing": probing,
+        "distribution": distribution,
+        "load_factor": load_factor,
+        "mean_probes": sum(probe_lengths) / len(probe_lengths),
+        "p50": percentile(probe_lengths, 0.50),
+        "p90": percentile(probe_lengths, 0.90),
+        "p99": percentile(probe_lengths, 0.99),
+        "max": probe_lengths[-1],
+        "miss_mean_probes": missing_probe_total / 1000,
+        "inserts_per_second": num_keys / insert_seconds,
+        "lookups_per_second": num_keys / lookup_seconds,
+    }
+
+
+def main():
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 16
+    random.seed(0)
+
+    print("%-9s %-10s %5s %6s %4s %4s %4s %6s %6s %12s %12s" % (
+        "probing", "ids", "load", "mean", "p50", "p90", "p99", "max", "miss", "inserts/s", "lookups/s"))
+
+    for distribution in ("sequential", "random", "strided"):
+        for probing in probing_strategies:
+            for load_factor in load_factors:
+                result = run_benchmark(probing, distribution, load_factor, capacity)
+                print("%-9s %-10s %5.1f %6.2f %4d %4d %4d %6d %6.1f %12.0f %12.0f" % (
+                    result["probing"], result["distribution"], result["load_factor"], result["mean_probes"],
+                    result["p50"], result["p90"], result["p99"], result["max"], result["miss_mean_probes"],
+                    result["inserts_per_second"], result["lookups_per_second"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# Benchmark harness for the routing strategies
+# Generates synthetic delivery days of a configurable size, runs every routing strategy on each of them, and records
+# the wall time, peak memory, total mileage, deadline misses and undelivered Packages of every run to a CSV file, or to
+# a JSON file if the output path ends in '.json'
+#
+# Usage: python benchmark_routing.py [--addresses N] [--packages N] [--constraint-density FRACTION] [--trucks N]
+#                                    [--instances N] [--strategies NAME ...] [--output PATH]
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import random
+import time
+import tracemalloc
+
+import main
+from DistanceMatrix import DistanceMatrix
+from HashTable import HashTable
+from MultiStartSolver import evaluate_plan
+from Package import Package
+from RoutingStrategy import get_routing_strategy, routing_strategies
+
+# Deadlines given to Packages with a deadline constraint
+deadline_choices = ("9:00 AM", "10:30 AM", "12:00 PM")
+
+# Special note given to Packages with a delayed arrival constraint
+delayed_note = "Delayed on flight---will not arrive to depot until 9:05 am"
+
+# Ratio between the road distance and the straight-line distance between two addresses
+road_distance_factor = 1.3
+
+# Width in miles of the square the synthetic addresses are spread over
+service_area_miles = 10
+
+# Columns written to the results file
+result_fields = ("instance", "strategy", "addresses", "packages", "constraint_density", "trucks", "wall_seconds",
+                 "peak_memory_kb", "total_mileage", "deadline_misses", "undelivered")
+
+
+# Space-Time Complexity: O(A^2)
+# Returns a DistanceMatrix of randomly placed addresses, where the first address is the hub
+def generate_distance_matrix(rng, num_addresses):
+    address_list = ["Hub"] + ["%d Synthetic Ave" % index for index in range(1, num_addresses)]
+    coordinates = [(rng.uniform(0, service_area_miles), rng.uniform(0, service_area_miles))
+                   for _ in range(num_addresses)]
+
+    distance_triangle = DistanceMatrix.empty_triangle(num_addresses)
+    for i in range(num_addresses):
+        for j in range(i + 1):
+            straight_line = math.hypot(coordinates[i][0] - coordinates[j][0], coordinates[i][1] - coordinates[j][1])
+            distance_triangle[DistanceMatrix.triangle_index(i, j)] = round(straight_line * road_distance_factor, 1)
+
+    return DistanceMatrix(address_list, distance_triangle)
+
+
+# Space-Time Complexity: O(N)
+# Returns a list of (ID, address, deadline, special notes) rows for the synthetic Packages. A constraint_density
+# fraction of the Packages get a constraint, split evenly between a deadline, a Truck restriction, a delayed arrival
+# and a group of up to three Packages that must be delivered together
+def generate_package_rows(rng, address_list, num_packages, constraint_density, num_trucks):
+    rows = []
+    grouped_ids = set()
+
+    for id_number in range(1, num_packages + 1):
+        address = rng.choice(address_list[1:])
+        deadline = "EOD"
+        special_notes = ""
+
+        if rng.random() < constraint_density:
+            constraint = rng.choice(("deadline", "truck", "delayed", "group"))
+            if constraint == "deadline":
+                deadline = rng.choice(deadline_choices)
+            elif constraint == "truck":
+                special_notes = "Can only be on truck %d" % rng.randint(1, num_trucks)
+            elif constraint == "delayed":
+                special_notes = delayed_note
+            else:
+                # Only Packages that are not grouped yet are linked, which keeps every group small enough for a Truck
+                partner_ids = [partner_id for partner_id in rng.sample(range(1, id_number), min(2, id_number - 1))
+                               if partner_id not in grouped_ids]
+                if len(partner_ids) > 0 and id_number not in grouped_ids:
+                    special_notes = "Must be delivered with " + ", ".join(str(partner_id) for partner_id in partner_ids)
+                    grouped_ids.update(partner_ids)
+                    grouped_ids.add(id_number)
+
+        rows.append((id_number, address, deadline, special_notes))
+
+    return rows
+
+
+# Space-Time Complexity: O(N)
+# Returns a new HashTable of Packages created from the synthetic rows
+def create_packages(rows):
+    ht = HashTable()
+    ht.reserve(len(rows))
+    for id_number, address, deadline, special_notes in rows:
+        ht.insert(Package(id_number, address, "Salt Lake City", "UT", "84101", deadline, "5", special_notes,
+                          "At the hub"))
+    return ht
+
+
+# Returns a new list of Trucks based at the hub of the synthetic instance, each with its own Driver
+def create_trucks(num_trucks, hub_address):
+    truck_list, driver_list = main.initialize_trucks_drivers(num_trucks, num_trucks)
+    for truck in truck_list:
+        truck.hub_address = hub_address
+    return truck_list
+
+
+# Simulates one delivery day of the instance with the strategy, returning the HashTable, Truck list and PackageStore.
+# Warnings printed during planning are discarded
+def simulate(strategy_name, distance_matrix, rows, num_trucks):
+    ht = create_packages(rows)
+    truck_list = create_trucks(num_trucks, distance_matrix.address_list[0])
+    with contextlib.redirect_stdout(io.StringIO()):
+        package_store = main.run_delivery_day(ht, truck_list, distance_matrix, get_routing_strategy(strategy_name))
+    return ht, truck_list, package_store
+
+
+# Runs the strategy on the instance and returns a dictionary of the measured statistics. The wall time is measured on
+# its own run, since tracing the peak memory slows the planning down
+def run_benchmark(strategy_name, distance_matrix, rows, num_trucks):
+    start = time.perf_counter()
+    ht, truck_list, package_store = simulate(strategy_name, distance_matrix, rows, num_trucks)
+    wall_seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    simulate(strategy_name, distance_matrix, rows, num_trucks)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    _, total_mileage = evaluate_plan(package_store, truck_list)
+
+    return {
+        "strategy": strategy_name,
+        "wall_seconds": round(wall_seconds, 4),
+        "peak_memory_kb": round(peak_memory / 1024, 1),
+        "total_mileage": round(total_mileage, 1),
+        "deadline_misses": package_store.count_late(),
+        "undelivered": package_store.num_undelivered,
+    }
+
+
+# Writes the results to a JSON file if the path ends in '.json', or to a CSV file otherwise
+def write_results(results, output_path):
+    with open(output_path, 'w', newline='') as output_file:
+        if output_path.endswith('.json'):
+            json.dump(results, output_file, indent=2)
+        else:
+            csv_writer = csv.DictWriter(output_file, fieldnames=result_fields)
+            csv_writer.writeheader()
+            csv_writer.writerows(results)
+
+
+# Parses the command-line arguments
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark the routing strategies on synthetic delivery days")
+    parser.add_argument("--addresses", type=int, default=100, help="number of addresses, including the hub")
+    parser.add_argument("--packages", type=int, default=400, help="number of Packages")
+    parser.add_argument("--constraint-density", type=float, default=0.3,
+                        help="fraction of Packages with a deadline, Truck restriction, delay or group constraint")
+    parser.add_argument("--trucks", type=int, default=3, help="number of Trucks, each with its own Driver")
+    parser.add_argument("--instances", type=int, default=3, help="number of random instances")
+    parser.add_argument("--strategies", nargs="+", choices=sorted(routing_strategies),
+                        default=sorted(routing_strategies), help="routing strategies to run")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first instance")
+    parser.add_argument("--output", default="benchmark_routing_results.csv", help="CSV or JSON results file")
+    return parser.parse_args()
+
+
+def main_benchmark():
+    arguments = parse_arguments()
+    results = []
+
+    print("%-8s %-16s %10s %12s %10s %7s %11s" % (
+        "instance", "strategy", "seconds", "peak KB", "miles", "misses", "undelivered"))
+
+    for instance in range(arguments.instances):
+        rng = random.Random(arguments.seed + instance)
+        distance_matrix = generate_distance_matrix(rng, arguments.addresses)
+        rows = generate_package_rows(rng, distance_matrix.address_list, arguments.packages,
+                                     arguments.constraint_density, arguments.trucks)
+
+        for strategy_name in arguments.strategies:
+            result = {
+                "instance": arguments.seed + instance,
+                "addresses": arguments.addresses,
+                "packages": arguments.packages,
+                "constraint_density": arguments.constraint_density,
+                "trucks": arguments.trucks,
+            }
+            result.update(run_benchmark(strategy_name, distance_matrix, rows, arguments.trucks))
+            results.append(result)
+            print("%-8d %-16s %10.4f %12.1f %10.1f %7d %11d" % (
+                result["instance"], result["strategy"], result["wall_seconds"], result["peak_memory_kb"],
+                result["total_mileage"], result["deadline_misses"], result["undelivered"]))
+
+    write_results(results, arguments.output)
+    print("Results written to " + arguments.output)
+
+
+if __name__ == "__main__":
+    main_benchmark()
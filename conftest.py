@@ -0,0 +1,2 @@
+# The modules of the application are imported by their file names, so the tests run with the repository root on the
+# import path. pytest puts the directory of this file there
@@ -1,71 +1,231 @@
 # Henry Trieu, WGU ID #001306217
 
+import argparse
+import asyncio
+import contextlib
 import csv
+import glob
+import hashlib
+import os
+import sys
 from datetime import datetime, timedelta
-
+from functools import partial
+
+import RoutingStrategy as RoutingStrategyModule
+from BatchQueries import run_batch_queries
+from ConstraintIndex import ConstraintIndex
+from DeliverySimulation import DeliverySimulation
+from DistanceMatrix import DistanceMatrix
+from DistanceNetwork import DistanceNetwork
 from Driver import Driver
 from HashTable import HashTable
-from Package import Package
-from Truck import Truck
+from ManifestReader import ManifestReader
+from MultiStartSolver import evaluate_plan, solve_multi_start
+from NearestNeighborIndex import NearestNeighborIndex
+from Package import AddressCorrection, Cancellation, LateArrival, Package
+from Profiler import Profiler, profile_environment_variable, trace_environment_variable
+from RoutingStrategy import NearestNeighborStrategy, RoutingStrategy, SavingsStrategy, get_routing_strategy, \
+    routing_strategies
+from StatusServer import StatusServer
+from StatusTimeline import StatusTimeline, format_time_of_day, seconds_since_midnight
+from Truck import Truck, TruckProfile
 
 # Constants used to change the total number of Trucks and Drivers
 num_trucks = 3
 num_drivers = 2
 
-# Space-Time Complexity: O(N)
-# Parses Package information from the 'packages.csv' file to create Package objects that are inserted into the HashTable
-def load_package_data(ht):
-    # Open the packages CSV file
-    with open('packages.csv') as csv_file:
-        # Create a reader object which will iterate over lines in the packages.csv file
-        csv_reader = csv.reader(csv_file, delimiter=',')
+# Depot, average speed, capacity and shift start of the Trucks that differ from the Truck defaults, keyed by Truck ID.
+# Every depot address must be in the address table, for example:
+#   3: TruckProfile("4001 South 700 East", 25, 24, timedelta(hours=9))
+truck_profiles = {}
+
+# Corrected delivery addresses for Packages listed with the wrong address, keyed by Package ID, along with the time the
+# correction is received
+address_corrections = {
+    9: AddressCorrection(timedelta(hours=10, minutes=20), "410 S State St", "Salt Lake City", "UT", "84111"),
+}
+
+# Seconds of 2-opt/Or-opt local search spent improving each Truck's route after it is loaded, or None to deliver the
+# greedy nearest-neighbour route as is
+route_improvement_time_budget = None
+
+# Manifest of the Packages at the hub at the start of the day
+package_manifest_file = 'packages.csv'
+
+# Manifests received during the day as (time, path) pairs. Each one is read when it is received, and its new Packages
+# join the pool of unassigned Packages. A manifest path that was read before, such as package_manifest_file, only has
+# the rows appended to it since then read
+appended_manifests = []
+
+# Updates to Packages received during the day as (Package ID, update) pairs, where each update is an AddressCorrection,
+# LateArrival or Cancellation record holding the time it is received. Only the pool of unassigned Packages or the
+# remaining stops of the Truck carrying the Package are changed, for example:
+#   (9, AddressCorrection(timedelta(hours=10, minutes=20), "410 S State St", "Salt Lake City", "UT", "84111"))
+#   (25, LateArrival(timedelta(hours=9), timedelta(hours=10)))
+#   (40, Cancellation(timedelta(hours=8, minutes=30)))
+delivery_updates = []
+
+# Name of the routing strategy that loads the Trucks, one of the names in RoutingStrategy.routing_strategies:
+#   nearest_neighbor - fills one Truck at a time with the Package nearest to the last Package added
+#   savings          - splits the Packages across all Trucks leaving the hub at the same time with the savings
+#                      algorithm before each Truck is topped up the same way as nearest_neighbor
+routing_strategy = "nearest_neighbor"
+
+# Number of randomized starts run by the multi-start solver (0 to only run the deterministic plan), the number of worker
+# processes (None for one per CPU), the wall-clock budget in seconds shared by all starts, and the number of nearest
+# Packages each randomized pick of the routing strategy is made from
+multi_start_count = 0
+multi_start_workers = None
+multi_start_time_budget = 10
+multi_start_candidate_count = 3
+
+# Functions of this module timed as planning stages when profiling is switched on
+profiled_stages = ("plan_deliveries", "load_package_data", "load_distance_matrix", "run_delivery_day",
+                   "deliver_all_packages")
+
+# Host the status server listens on when --serve is only given a port, and the number of package status and fleet
+# mileage results it keeps in its LRU cache
+status_server_host = "127.0.0.1"
+status_server_cache_size = 4096
+
+# Precompiled binary cache of the 'addresses.csv' and 'distances.csv' files
+distance_cache_file = 'distances.bin'
+
+# Sparse road network used instead of the complete 'distances.csv' table when set. Each row of the file is an
+# "address,address,miles" edge between two neighbouring addresses of the address table, and the distance between any
+# two addresses is the shortest path between them through the network
+distance_edges_file = None
+
+# Bytes of memory the shortest-path rows of the road network and the neighbour lists sorted from them may take before
+# the least recently used rows are evicted, and whether every shortest path is computed up front into the precompiled
+# binary cache of the network instead of on demand
+distance_network_memory_cap = 64 * 1024 * 1024
+precompute_distance_network = False
+distance_network_cache_file = 'distance_network.bin'
+
+# Saved plan of the delivery day, reused by later runs until the input files, the planning configuration above or the
+# source code change
+plan_cache_file = 'plan.bin'
 
-        # Iterate through the reader and parse the information from each row
-        for row in csv_reader:
-            # Store the parsed data as variables and pass them as input for creating a new Package object
-            id_number = int(row[0])
-            delivery_address = row[1]
-            delivery_city = row[2]
-            delivery_state = row[3]
-            delivery_zip = row[4]
-            delivery_deadline = row[5]
-            package_mass = row[6]
-            special_notes = row[7]
-            delivery_status = "At the hub"
-
-            package = Package(id_number, delivery_address, delivery_city, delivery_state, delivery_zip,
-                              delivery_deadline, package_mass,
-                              special_notes, delivery_status)
-
-            # Insert the newly created Package object into the HashTable
-            ht.insert(package)
+# Space-Time Complexity: O(N)
+# Parses the Package rows of the manifest that have not been read yet into Package objects that are inserted into the
+# HashTable, and returns the list of new Packages. The HashTable is grown once up front from the estimated number of
+# new rows, and rows with the ID of a Package that is already loaded are skipped
+# A last row without a line break is only read if include_partial_line is True, for a manifest that is complete. A
+# manifest received during the day may still be being written, so its partial last row waits for the next read
+def load_package_data(ht, manifest_reader, include_partial_line=False):
+    ht.reserve(len(ht) + manifest_reader.estimate_remaining_rows())
+    new_packages = []
+
+    # Iterate through the rows of the manifest as they are read and parse the information from each row
+    for row in manifest_reader.read_rows(include_partial_line):
+        # Store the parsed data as variables and pass them as input for creating a new Package object
+        id_number = int(row[0])
+        delivery_address = row[1]
+        delivery_city = row[2]
+        delivery_state = row[3]
+        delivery_zip = row[4]
+        delivery_deadline = row[5]
+        package_mass = row[6]
+        special_notes = row[7]
+        delivery_status = "At the hub"
+        address_correction = None
+        if "Wrong address listed" in special_notes:
+            address_correction = address_corrections.get(id_number)
+
+        if id_number in ht:
+            print("Warning: skipping Package ID %d from %s, it is already loaded" % (id_number,
+                                                                                      manifest_reader.manifest_path))
+            continue
+
+        # The Package parses its deadline and special notes into typed attributes once, as it is created
+        package = Package(id_number, delivery_address, delivery_city, delivery_state, delivery_zip,
+                          delivery_deadline, package_mass,
+                          special_notes, delivery_status, address_correction)
+
+        # Insert the newly created Package object into the HashTable
+        ht.insert(package)
+        new_packages.append(package)
+
+    return new_packages
+
+
+# Space-Time Complexity: O(P log N), where P is the number of new Packages
+# Loads the Packages of a manifest received during the day and adds them to the pool of unassigned Packages. Returns
+# the list of new Packages
+def load_appended_manifest(ht, constraint_index, manifest_readers, manifest_path):
+    # Reuse the reader of a manifest that was read before so only the rows appended to it since then are read
+    if manifest_path not in manifest_readers:
+        manifest_readers[manifest_path] = ManifestReader(manifest_path)
+
+    new_packages = load_package_data(ht, manifest_readers[manifest_path])
+    for package in new_packages:
+        constraint_index.add_package(package)
+    return new_packages
 
 
 # Space-Time Complexity: O(N^2)
-# Returns a list of distance information parsed from the 'distances.csv' file
-def load_distance_data():
-    # Open the 'distances.csv' file, parse the values in each cell, and return a 2D list containing the parsed values
+# Returns a flat lower-triangle array of distance information parsed from the 'distances.csv' file
+def load_distance_data(num_addresses):
+    # Open the 'distances.csv' file, parse the values in each cell, and return the flat array containing the values
     with open('distances.csv') as csv_file:
         # Create a reader object which will iterate over lines in the 'distances.csv' file
         csv_reader = csv.reader(csv_file, delimiter=',')
 
-        # Create the list that will store the distance data
-        num_addresses = get_num_addresses()
-        distance_data = [[0 for x in range(num_addresses)] for y in range(num_addresses)]
+        # Create the array that will store the distance data
+        distance_data = DistanceMatrix.empty_triangle(num_addresses)
 
         # Iterate through the reader and parse the distance information between each address
         src_address_index = 0
 
         for src_address in csv_reader:
             for dest_address_index in range(num_addresses):
-                if src_address[dest_address_index] != '':
-                    distance_data[src_address_index][dest_address_index] = float(src_address[dest_address_index])
-                    distance_data[dest_address_index][src_address_index] = float(src_address[dest_address_index])
+                if dest_address_index < len(src_address) and src_address[dest_address_index] != '':
+                    triangle_index = DistanceMatrix.triangle_index(src_address_index, dest_address_index)
+                    distance_data[triangle_index] = float(src_address[dest_address_index])
+                elif dest_address_index <= src_address_index:
+                    # Only the upper triangle may be left blank, a missing distance would be routed as 0 miles
+                    raise ValueError("'distances.csv' has no distance in row %d, column %d. Use a sparse edge list "
+                                     "through distance_edges_file for incomplete distance data" %
+                                     (src_address_index + 1, dest_address_index + 1))
             src_address_index = src_address_index + 1
 
+        if src_address_index != num_addresses:
+            raise ValueError("'distances.csv' has %d rows for %d addresses" % (src_address_index, num_addresses))
+
         return distance_data
 
 
+# Space-Time Complexity: O(E), where E is the number of edges
+# Returns a list of (address index, address index, miles) edges parsed from the distance_edges_file road network.
+# Addresses are matched against the address table, and a ValueError is raised for an unknown address or a bad distance
+def load_distance_edges(address_list):
+    address_index_table = {address: index for index, address in enumerate(address_list)}
+    edges = []
+
+    with open(distance_edges_file) as csv_file:
+        csv_reader = csv.reader(csv_file, delimiter=',')
+
+        for row_number, row_text in enumerate(csv_reader, 1):
+            if len(row_text) == 0:
+                continue
+            if len(row_text) != 3:
+                raise ValueError("'%s' row %d: expected address,address,miles" % (distance_edges_file, row_number))
+
+            address1_index = address_index_table.get(row_text[0].strip())
+            address2_index = address_index_table.get(row_text[1].strip())
+            if address1_index is None or address2_index is None:
+                raise ValueError("'%s' row %d: address not found in 'addresses.csv'" %
+                                 (distance_edges_file, row_number))
+            try:
+                miles = float(row_text[2])
+            except ValueError:
+                raise ValueError("'%s' row %d: invalid distance '%s'" % (distance_edges_file, row_number, row_text[2]))
+            edges.append((address1_index, address2_index, miles))
+
+    return edges
+
+
 # Space-Time Complexity: O(N)
 # Returns a list of address data parsed from the 'addresses.csv' file
 def load_address_data():
@@ -85,53 +245,73 @@ def load_address_data():
     return address_list
 
 
-# Space-Time Complexity: O(N)
-# Returns the number of addresses found in the 'addresses.csv' file based on the number of rows
-def get_num_addresses():
-    num_addresses = 0
-    # Open the 'addresses.csv'  file to count the number of rows in the file
-    with open('addresses.csv') as csv_file:
-        # Create a reader object which will iterate over lines in the 'distances.csv' file
-        csv_reader = csv.reader(csv_file, delimiter=',')
-
-        # Count the number of rows/columns, which will determine the size of the list
-        for row in csv_reader:
-            num_addresses = num_addresses + 1
-
-    return num_addresses
+# Space-Time Complexity: O(N^2)
+# Parses the 'addresses.csv' and 'distances.csv' files and returns the DistanceMatrix built from them
+def compile_distance_matrix():
+    address_list = load_address_data()
+    distance_data = load_distance_data(len(address_list))
+    return DistanceMatrix(address_list, distance_data)
 
 
-# Space-Time Complexity: O(1)
-# Returns the distance between two addresses
-def distance_between(address1, address2):
-    distance_list = load_distance_data()
+# Space-Time Complexity: O(N + E)
+# Parses the 'addresses.csv' file and the distance_edges_file road network and returns the DistanceNetwork built from
+# them
+def compile_distance_network():
     address_list = load_address_data()
+    return DistanceNetwork(address_list, load_distance_edges(address_list), distance_network_memory_cap)
+
+
+# Space-Time Complexity: O(N) when the cache is current, O(N^2) when it has to be rebuilt
+# Returns the DistanceMatrix used for all lookups. The matrix is memory-mapped from the precompiled 'distances.bin'
+# cache, which is rebuilt from the CSV files whenever either of them is newer than the cache
+# If distance_edges_file is set, the DistanceNetwork of the road network is returned instead, computing shortest paths
+# on demand, unless precompute_distance_network is set. Then every shortest path is compiled into the
+# distance_network_cache_file cache, which is memory-mapped the same way
+def load_distance_matrix():
+    if distance_edges_file is None:
+        source_paths = ['addresses.csv', 'distances.csv']
+        cache_path = distance_cache_file
+        compile_matrix = compile_distance_matrix
+    elif precompute_distance_network:
+        source_paths = ['addresses.csv', distance_edges_file]
+        cache_path = distance_network_cache_file
+        compile_matrix = compile_distance_network
+    else:
+        return compile_distance_network()
 
-    # Find the index of both addresses
-    address1_index = address_list.index(address1)
-    address2_index = address_list.index(address2)
+    source_modified_time = max(os.path.getmtime(source_path) for source_path in source_paths)
 
-    return distance_list[address1_index][address2_index]
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= source_modified_time:
+        distance_matrix = DistanceMatrix.load(cache_path)
+        if distance_matrix is not None:
+            return distance_matrix
+
+    # The cache is missing, stale or invalid. Compile it from the CSV files and load the freshly written cache
+    compile_matrix().save(cache_path)
+    return DistanceMatrix.load(cache_path)
 
 
 # Space-Time Complexity: O(N)
-# Initializes the Trucks and Drivers that will be used to deliver the packages
-def initialize_trucks_drivers(NUM_TRUCKS, NUM_DRIVERS):
+# Initializes the Trucks and Drivers that will be used to deliver the packages. Trucks with an entry in profiles, a
+# dictionary of TruckProfiles keyed by Truck ID, are created with those properties
+def initialize_trucks_drivers(NUM_TRUCKS, NUM_DRIVERS, profiles=None):
     truck_list = []
     driver_list = []
-
-    # Since Drivers stay with the Truck that they are assigned to, extra Trucks/Drivers are unnecessary for operation
-    # The number of Drivers and Trucks will be set to the minimum number of configured Drivers/Trucks
-    num_trucks_drivers = min(NUM_TRUCKS, NUM_DRIVERS)
+    if profiles is None:
+        profiles = {}
 
     # Initialize the Truck objects
-    for current_truck_num in range(1, num_trucks_drivers + 1, 1):
+    for current_truck_num in range(1, NUM_TRUCKS + 1, 1):
         truck_id = current_truck_num
-        truck = Truck(truck_id)
+        if truck_id in profiles:
+            truck = Truck.from_profile(truck_id, profiles[truck_id])
+        else:
+            truck = Truck(truck_id)
         truck_list.append(truck)
 
-    # Initialize the Driver objects
-    for current_driver_num in range(1, num_trucks_drivers + 1, 1):
+    # Initialize the Driver objects. Each Driver starts on the first Truck without a Driver, and Drivers without a Truck
+    # are unnecessary for operation. Trucks without a Driver wait at their depot until a Driver hands off to them
+    for current_driver_num in range(1, min(NUM_TRUCKS, NUM_DRIVERS) + 1, 1):
         driver_id = current_driver_num
         driver = Driver(driver_id)
         driver.assign_truck(truck_list)
@@ -140,303 +320,75 @@ def initialize_trucks_drivers(NUM_TRUCKS, NUM_DRIVERS):
     return truck_list, driver_list
 
 
-# Space-Time Complexity: O(N^4)
-# Efficiently assigns Packages to the Truck until either all assignable Packages are assigned or until the Truck is full
-def assign_packages(ht, truck):
-    # Assign Packages until the Truck can no longer assign more Packages
-    while len(get_assignable_packages(ht, truck)) > 0 and not truck.is_full() and truck.at_hub is True:
-        # If the package_list is empty for the Truck, the current address will be set to the mail hub
-        if len(truck.packages_id_list) == 0:
-            address = truck.hub_address
-        else:
-            num_packages_in_truck = len(truck.packages_id_list)
-            last_package_added_id = truck.packages_id_list[num_packages_in_truck - 1]
-            last_package_added = ht.lookup(last_package_added_id)
-            address = last_package_added.delivery_address
-
-        # Space-Time Complexity: O(N)
-        # Assign the closest Package to the last address
-        nearest_package = find_nearest_package_in_list(address, get_assignable_packages(ht, truck))
-        truck.assign_package(nearest_package)
-
-        # Space-Time Complexity: O(N)
-        # Handle Wrong Address case
-        if nearest_package.id_number == 9:
-            nearest_package.delivery_address = "410 S State St"
-            nearest_package.delivery_city = "Salt Lake City"
-            nearest_package.delivery_state = "UT"
-            nearest_package.delivery_zip = "84111"
-            sort_truck_package_list(ht, truck)
-
-        # Space-Time Complexity: O(N^3) worst-case
-        # If we've assigned a Package that exists in the associated Packages list, then ensure that we add the rest of
-        # those Packages as well.
-        for list in get_lists_associated_packages(ht):
-            if nearest_package in list:
-                for associated_package in list:
-                    if associated_package.is_truck_assigned() is False:
-                        truck.assign_package(associated_package)
-        # If we added associated Packages, sort the truck's Package list to ensure it the route is optimized
-        sort_truck_package_list(ht, truck)
-
-
-# Space-Time Complexity: O(N^2)
-# Sorts the list of Packages in the Truck to be ordered with priority of the shortest distance between each Package
-def sort_truck_package_list(ht, truck):
-    # Create a sorted Package_id list
-    sorted_package_id_list = []
-    current_address = truck.hub_address
-    package_list = truck.get_package_list(ht)
-
-    # Iterate through the Package list and add the Package IDs in the order of the shortest distance between each
-    # Package
-    while len(package_list) != 0:
-        nearest_package = find_nearest_package_in_list(current_address, package_list)
-        sorted_package_id_list.append(nearest_package.id_number)
-        current_address = nearest_package.delivery_address
-        package_list.remove(nearest_package)
+# Space-Time Complexity: O(E log E + N), where E is the number of simulated events
+# Simulates the delivery day, loading each Truck with the routing strategy whenever it is at the hub, until all Packages
+# in the HashTable are delivered or no Truck can deliver the remaining Packages. Returns the PackageStore of the day
+def deliver_all_packages(ht, truck_list, distance_matrix, constraint_index, manifest_readers, strategy, rng=None,
+                         deadline=None):
+    simulation = DeliverySimulation(ht, truck_list, distance_matrix,
+                                    lambda truck: strategy.load_truck(ht, truck, truck_list, distance_matrix,
+                                                                      constraint_index, rng, deadline),
+                                    constraint_index)
+    for package_id, update in delivery_updates:
+        simulation.schedule_update(package_id, update)
+    for manifest_time, manifest_path in appended_manifests:
+        simulation.schedule_manifest(manifest_time, partial(load_appended_manifest, ht, constraint_index,
+                                                            manifest_readers, manifest_path))
+    simulation.run()
+
+    package_store = simulation.package_store
+    if not all_packages_delivered(package_store):
+        print("Warning: not all Packages could be delivered, Package IDs: " +
+              ", ".join(str(package_id) for package_id in package_store.get_undelivered_ids()))
+    num_late_packages = package_store.count_late()
+    if num_late_packages > 0:
+        print("Warning: %d Packages were delivered after their deadline" % num_late_packages)
+    return package_store
 
-    # Set the sorted list as the Truck's package id list
-    truck.packages_id_list = sorted_package_id_list
 
-
-# Space-Time Complexity: O(N)
-# Returns the Package with the shortest distance between the current address and delivery address of the Package
-def find_nearest_package_in_list(current_address, package_list):
-    # Variables to store the nearest Package
-    nearest_package = None
-    nearest_package_distance = None
-
-    # Algorithm to find the next Package with the shortest distance between the current address and the delivery address
-    for package in package_list:
-        if package is not None:
-            # If we don't have a current package to start the comparisons, find the first package
-            if nearest_package is None:
-                nearest_package = package
-                nearest_package_address = nearest_package.delivery_address
-                nearest_package_distance = distance_between(nearest_package_address, current_address)
-            # If nearest_package has been assigned, compare it against the current package being iterated list
+# Space-Time Complexity: O(1)
+# Returns True if all Packages in the PackageStore have been delivered, apart from cancelled ones
+def all_packages_delivered(package_store):
+    return package_store.all_delivered()
+
+
+# Displays a menu of options for the end-user to select from to perform different actions until the end-user exits
+def prompt_interactive_menu(timeline):
+    while True:
+        # Display the title of the application
+        print("===========================================")
+        print("Western Governors University Parcel Service")
+        print("===========================================")
+
+        # Display menu options
+        print("Please select a menu option to generate a report or retrieve package information.\n")
+        print("\t 1. General Report")
+        print("\t 2. Package Query")
+        print("\t 3. Exit")
+        valid_options = [1, 2, 3]
+
+        # Prompt the user for option selection:
+        option = None
+
+        while option is None:
+            user_input = input("\nEnter your option selection here: ")
+
+            if user_input.isdigit() and int(user_input) in valid_options:
+                option = int(user_input)
             else:
-                package_address = package.delivery_address
-                package_distance = distance_between(package_address, current_address)
-
-                # If the current package being iterated has a shorter distance from our current address, make this
-                # our new nearest package
-                if package_distance < nearest_package_distance:
-                    nearest_package = package
-                    nearest_package_distance = package_distance
-
-    return nearest_package
-
-
-# Space-Time Complexity: O(N^5)
-# Deliver Packages until all Packages in the HashTable are delivered
-def deliver_all_packages(ht, truck_list):
-    while not all_packages_delivered(ht):
-        for truck in truck_list:
-            # Set the Delivery Status to "En route" for all Packages that will be delivered during this delivery trip
-            truck.set_packages_en_route(ht)
-
-            current_address = truck.hub_address
-            current_package_index = 0
-
-            # Deliver all the Packages that are loaded onto the Truck
-            while len(truck.packages_id_list) > 0:
-                # Find the Package in the HashTable and mark it as Delivered
-                package_id = truck.packages_id_list[current_package_index]
-                package = ht.lookup(package_id)
+                print("Error: Invalid option provided.")
 
-                # Calculate the distance traveled and add it to the total mileage covered by the Truck
-                distance_traveled = distance_between(current_address, package.delivery_address)
-                truck.deliver_package(ht, package_id, distance_traveled)
-
-                # After all calculations, the Package's delivery address is now the current address
-                current_address = package.delivery_address
-
-            # After delivering all Packages, the Truck returns to the hub
-            truck.send_back_to_hub(distance_between(current_address, truck.hub_address))
-        # Assign more Packages
-        for truck in truck_list:
-            assign_packages(ht, truck)
-
-
-# Space-Time Complexity: O(N)
-# Returns True if all Packages have been delivered
-def all_packages_delivered(ht):
-    for package in ht.package_table:
-        if package is not None and package.delivery_timestamp is None:
-            return False
-    return True
+        # Process the option selected by the end-user:
+        if option == 1: general_report(timeline)
+        if option == 2: query_specific_package(timeline)
+        if option == 3:
+            print("The program will now close.")
+            return
 
 
 # Space-Time Complexity: O(N)
-# Returns a list of unassigned Packages in the HashTable
-def get_unassigned_packages(ht):
-    unassigned_packages = []
-
-    for package in ht.package_table:
-        if package is not None and package.is_truck_assigned() is False:
-            unassigned_packages.append(package)
-
-    return unassigned_packages
-
-
-# Space-Time Complexity: O(N^3)
-# Returns a list of Packages that are assignable to the provided Truck
-def get_assignable_packages(ht, truck):
-    # Determine all Packages that cannot be assigned to the Truck first and then create a list of Packages that can
-    # be assigned to the passed Truck
-    unassignable_packages = get_unassignable_packages(ht, truck)
-    assignable_packages = []
-
-    # Iterate through the package table and find the Packages that can be assigned to the provided Truck
-    for package in get_unassigned_packages(ht):
-        # Check if the package has to be delivered by a specific Truck
-        if package is not None and package not in unassignable_packages:
-            assignable_packages.append(package)
-
-    return assignable_packages
-
-
-# Space-Time Complexity: O(N^3)
-# Returns a list of unassigned Packages that cannot be assigned to the provided Truck
-def get_unassignable_packages(ht, truck):
-    unassignable_packages = []
-    associated_package_lists = get_lists_associated_packages(ht)
-
-    # Iterate through the Package list
-    for package in ht.package_table:
-        if package is not None:
-            # If a Package is already assigned to a Truck, append it to the list
-            if package.is_truck_assigned():
-                unassignable_packages.append(package)
-
-            # If a Package is required to be on a Truck different from the one passed, add the Package to the
-            # unassignable Packages list
-            elif package.get_required_truck_id() is not None and package.get_required_truck_id() is not truck.id:
-                unassignable_packages.append(package)
-
-                # If the current unassignable Package ends up in one of the lists of associated Packages, ensure
-                # all associated Packages are added to the unassignable Packages list
-                if len(associated_package_lists) > 0:
-                    for list in associated_package_lists:
-                        if package in list:
-                            for associated_package in list:
-                                if associated_package not in unassignable_packages:
-                                    unassignable_packages.append(associated_package)
-
-            # If the Package is delayed and has not arrived at the depot yet, it cannot be assigned to the Truck yet
-            elif package.get_delayed_arrival_time() is not None and package.get_delayed_arrival_time() > truck.time_obj:
-                if package not in unassignable_packages:
-                    unassignable_packages.append(package)
-
-    return unassignable_packages
-
-
-# Space-Time Complexity: O(N^3)
-# Returns a list of lists, each of which are a combination of Packages that must be delivered together on the
-# same Truck and same delivery trip
-def get_lists_associated_packages(ht):
-    # List of associated package lists that contain Packages that must be delivered together
-    associated_packages_lists = []
-
-    # Space-Time Complexity: O(N^3)
-    # Create the associated package lists and combine them if necessary
-    for current_package in ht.package_table:
-        if current_package is not None and "Must be delivered with" in current_package.special_notes:
-            # Create a new list of associated Packages that must be delivered with the current Package
-            associated_packages = find_directly_associated_packages(ht, current_package)
-
-            # Variables to check if we need to combine lists of associated Packages that must be delivered together
-            combine_lists = False
-            list_to_combine = None
-
-            # Space-Time Complexity: O(N^2)
-            # Check if a Package in the current list already exists in a list that we've appended to the master list
-            if len(associated_packages_lists) > 0:
-                for package in associated_packages:
-                    for list in associated_packages_lists:
-                        if package in list:
-                            combine_lists = True
-                            list_to_combine = list
-                            break
-
-            # Space-Time Complexity: O(N)
-            # If any Packages in the current associated_packages exist in a list that was appended to the master
-            # list, do not add a new list but instead add directly to the already created list
-            if combine_lists:
-                for package in associated_packages:
-                    if package not in list_to_combine:
-                        list_to_combine.append(package)
-            # If none of the Packages in the current associated_packages exist in a list that was appended to the
-            # master list, add this as a new list
-            else:
-                associated_packages_lists.append(associated_packages)
-    return associated_packages_lists
-
-
-# Space-Time Complexity: O(N^2)
-# Helper function for assign_packages_associative Parses the Special Notes of a Package and returns a list of
-# Packages that the inputted Package must be delivered with
-def find_directly_associated_packages(ht, package):
-    if "Must be delivered with" in package.special_notes:
-        # Create a new list
-        associated_packages = [package]
-
-        # Find the IDs of other packages that this current Package must be delivered with
-        special_notes_commas_excluded = package.special_notes.replace(",", " ")
-        tokenized_special_notes = special_notes_commas_excluded.split()
-        package_ids_list = [int(i) for i in tokenized_special_notes if i.isdigit()]
-
-        # Append IDs of additional Packages that must be delivered with the Package passed in the parameter
-        for package_id in package_ids_list:
-            package = ht.lookup(package_id)
-            associated_packages.append(package)
-            additional_packages = find_directly_associated_packages(ht, package)
-
-            if additional_packages is not None:
-                for additional_package in additional_packages:
-                    if additional_package not in associated_packages:
-                        associated_packages.append(additional_package)
-
-        return associated_packages
-
-
-# Displays a menu of options for the end-user to select from to perform different actions
-def prompt_interactive_menu(ht, truck_list):
-    # Display the title of the application
-    print("===========================================")
-    print("Western Governors University Parcel Service")
-    print("===========================================")
-
-    # Display menu options
-    print("Please select a menu option to generate a report or retrieve package information.\n")
-    print("\t 1. General Report")
-    print("\t 2. Package Query")
-    print("\t 3. Exit")
-    valid_options = [1, 2, 3]
-
-    # Prompt the user for option selection:
-    option = None
-
-    while option is None:
-        user_input = input("\nEnter your option selection here: ")
-
-        if user_input.isdigit() and int(user_input) in valid_options:
-            option = int(user_input)
-        else:
-            print("Error: Invalid option provided.")
-
-    # Process the option selected by the end-user:
-    if option == 1: general_report(ht, truck_list)
-    if option == 2: query_specific_package(ht, truck_list)
-    if option == 3:
-        print("The program will now close.")
-        quit()
-
-
 # Prompts the user for a time and displays the status report of all Packages at the specified time
-def general_report(ht, truck_list):
+def general_report(timeline):
     # Prompt for a time to generate the report
     report_datetime = prompt_time()
 
@@ -446,97 +398,53 @@ def general_report(ht, truck_list):
     print("=========================================")
 
     # For each Package, print out all the delivery information and status at the requested time
-    for package in range(1, len(ht.package_table) + 1):
-        if package is not None:
-            display_package_query(ht, package, report_datetime)
+    for report_line in timeline.get_report_lines(seconds_since_midnight(report_datetime)):
+        print(report_line)
 
     # Print the total mileage of all Truck at the specified time
-    print_total_mileage_at_time(truck_list, report_datetime)
-
-    # Prompt the user for the next action to perform
-    prompt_interactive_menu(ht, truck_list)
-
+    print_total_mileage_at_time(timeline, report_datetime)
 
-# Returns the total mileage of all Trucks at the specified time
-def print_total_mileage_at_time(truck_list, report_datetime):
-    # Convert the specified time from datetime to timedelta to perform comparative operations
-    report_timedelta = timedelta(hours=report_datetime.hour, minutes=report_datetime.minute)
 
+# Space-Time Complexity: O(T log M + H)
+# Prints the mileage of each Truck, the handoffs of Drivers between Trucks and the total mileage of all Trucks at the
+# specified time
+def print_total_mileage_at_time(timeline, report_datetime):
     # Store the total mileage for all Trucks in a variable
     total_mileage = 0
 
     # For each truck, find the amount of distance covered closest to the specified report time
-    for truck in truck_list:
-        if len(truck.mileage_timestamps) > 0:
-            index = len(truck.mileage_timestamps) - 1
-
-            while index > 0:
-                # Respective mileage and timestamp extracted from the Truck's mileage_timestamp list
-                timestamp_mileage = truck.mileage_timestamps[index][0]
-                timestamp_timedelta = truck.mileage_timestamps[index][1]
-
-                if timestamp_timedelta <= report_timedelta:
-                    total_mileage += timestamp_mileage
-                    print("Truck %d's mileage: %0.2f miles" % (truck.id, timestamp_mileage))
-                    break
-                else:
-                    index = index - 1
-            if index == 0:
-                print("Truck %d's mileage: %0.2f miles" % (truck.id, 0.00))
+    for truck_id, mileage in timeline.get_fleet_mileage(seconds_since_midnight(report_datetime)):
+        total_mileage += mileage
+        print("Truck %d's mileage: %0.2f miles" % (truck_id, mileage))
+
+    # Show which Trucks the Drivers had moved between by the specified time
+    for handoff_seconds, driver_id, previous_truck_id, truck_id in \
+            timeline.get_handoffs(seconds_since_midnight(report_datetime)):
+        print("Driver %d moved from Truck %d to Truck %d at %s" % (driver_id, previous_truck_id, truck_id,
+                                                                 format_time_of_day(handoff_seconds)))
+
     # Print the total mileage at the specified time
     print("\nThe total mileage of all trucks at " + report_datetime.strftime("%I:%M %p") + " is %0.2f miles" %
         total_mileage)
 
 
 # Queries and displays Package information
-def query_specific_package(ht, truck_list):
+def query_specific_package(timeline):
     # Prompt the user for a time to generate a report and the specific Package to query
     report_datetime = prompt_time()
-    package_id = prompt_package_id(ht)
+    package_id = prompt_package_id(timeline)
 
     # Display information regarding the package at the specified time
     print("========================================")
     print("Querying package information at " + report_datetime.strftime("%I:%M %p"))
     print("========================================")
-    display_package_query(ht, package_id, report_datetime)
-
-    # Prompt the user for the next action to perform
-    prompt_interactive_menu(ht, truck_list)
+    display_package_query(timeline, package_id, report_datetime)
 
 
+# Space-Time Complexity: O(1)
 # Prints out information related to the specified Package at the specified time
-def display_package_query(ht, package_id, report_datetime):
-    # Retrieve the Package
-    package = ht.lookup(package_id)
-
-    # Convert the specified report's time from datetime type to timedelta type
-    report_timedelta = timedelta(hours=report_datetime.hour, minutes=report_datetime.minute)
-
-    # Build a String to print out for the current Package
-    package_info_status = "[Package ID = %d] " % package.id_number
-
-    # Generate the delivery status information
-    if package.en_route_timestamp > report_timedelta:
-        package_info_status += "\tDelivery Status: At the hub"
-    elif package.delivery_timestamp > report_timedelta:
-        # Convert the delivery timestamp from timedelta to datetime for printing purposes
-        delivery_timestamp_datetime = datetime.strptime(str(package.delivery_timestamp), "%H:%M:%S")
-        package_info_status += "\tDelivery Status: En route to delivery address, expected delivery at " + delivery_timestamp_datetime.strftime(
-            "%I:%M %p")
-    else:
-        # Convert the delivery timestamp from timedelta to datetime for printing purposes
-        delivery_timestamp_datetime = datetime.strptime(str(package.delivery_timestamp), "%H:%M:%S")
-        package_info_status += "\tDelivery Status: Delivered at " + delivery_timestamp_datetime.strftime("%I:%M %p")
-
-    # Build the Delivery Information
-    package_info_status += "\tAddress: " + package.delivery_address
-    package_info_status += "\tCity: " + package.delivery_city
-    package_info_status += "\tZIP Code: " + package.delivery_zip
-    package_info_status += "\tPackage Weight: " + package.package_mass + " kilograms"
-    package_info_status += "\tDelivery Deadline: " + package.delivery_deadline
-
-    # Display information regarding the package at the specified time
-    print(package_info_status)
+def display_package_query(timeline, package_id, report_datetime):
+    print(timeline.get_package_report_line(package_id, seconds_since_midnight(report_datetime)))
 
 
 # Prompts the user for a time used to generate reporting
@@ -555,7 +463,7 @@ def prompt_time():
 
 
 # Prompts the user for the ID of a Package
-def prompt_package_id(ht):
+def prompt_package_id(timeline):
     package_id = None
 
     # Prompt the user for a Package ID
@@ -563,7 +471,7 @@ def prompt_package_id(ht):
         user_input = input("Please enter the ID of the package you would like to view: ")
 
         if user_input.isdigit():
-            if ht.lookup(int(user_input)) is not None:
+            if timeline.has_package(int(user_input)):
                 package_id = int(user_input)
             else:
                 print("\tNo package found with the provided ID.\n")
@@ -572,35 +480,262 @@ def prompt_package_id(ht):
     return package_id
 
 
-def main():
-    # Initialize a HashTable and load the package data into the HashTable
+# Returns the routing strategy configured by the routing_strategy, route_improvement_time_budget and
+# multi_start_candidate_count globals
+def create_routing_strategy(name=None):
+    if name is None:
+        name = routing_strategy
+    return get_routing_strategy(name, route_improvement_time_budget, multi_start_candidate_count)
+
+
+# Simulates the delivery day of the Packages in the HashTable with the Trucks and the routing strategy
+# manifest_readers holds the ManifestReader of each manifest already read, keyed by path, so manifests appended during
+# the day are read from where they left off. rng and deadline are passed through to the strategy. Returns the
+# PackageStore of the day
+def run_delivery_day(ht, truck_list, distance_matrix, strategy, manifest_readers=None, rng=None, deadline=None):
+    if manifest_readers is None:
+        manifest_readers = {}
+
+    # Index the delivery constraints of the Packages once so assignment never has to rescan the HashTable
+    constraint_index = ConstraintIndex(ht)
+
+    # If there are any Packages arriving late at the depot, the last of the Trucks with a Driver will start at the
+    # delayed start time, unless its shift starts later
+    delayed_start_time = constraint_index.get_earliest_delayed_arrival_time()
+    driven_trucks = [truck for truck in truck_list if truck.driver is not None]
+
+    if len(driven_trucks) > 1 and delayed_start_time is not None:
+        last_truck = driven_trucks[len(driven_trucks) - 1]
+        last_truck.time_obj = max(last_truck.time_obj, delayed_start_time)
+
+    # Load the Trucks and deliver Packages until all Packages are delivered
+    return deliver_all_packages(ht, truck_list, distance_matrix, constraint_index, manifest_readers, strategy, rng,
+                                deadline)
+
+
+# Loads the Packages, creates the Trucks and simulates the delivery day over the DistanceMatrix with the routing
+# strategy, returning the HashTable of Packages, the list of Trucks and the PackageStore of the day. rng and deadline
+# are passed through to the strategy by the multi-start solver
+def simulate_day(distance_matrix, rng=None, deadline=None, strategy=None):
+    if strategy is None:
+        strategy = create_routing_strategy()
+
+    # Initialize a HashTable and load the package data into the HashTable. The manifest at the hub at the start of the
+    # day is complete, so a last row without a line break is read as well
     delivery_ht = HashTable()
-    load_package_data(delivery_ht)
+    manifest_readers = {package_manifest_file: ManifestReader(package_manifest_file)}
+    load_package_data(delivery_ht, manifest_readers[package_manifest_file], include_partial_line=True)
 
     # Create the Trucks and Drivers
-    truck_list, driver_list = initialize_trucks_drivers(num_trucks, num_drivers)
+    truck_list, driver_list = initialize_trucks_drivers(num_trucks, num_drivers, truck_profiles)
+
+    package_store = run_delivery_day(delivery_ht, truck_list, distance_matrix, strategy, manifest_readers, rng,
+                                     deadline)
+
+    return delivery_ht, truck_list, package_store
+
 
-    # If there are any Packages arriving late at the depot, one of the Trucks will start at the delayed start time
-    delayed_start_time = None
+# Loads the Package, address and distance data, simulates the delivery day and returns the HashTable of Packages, the
+# list of Trucks and the StatusTimeline of the day
+def plan_deliveries(num_starts=None, strategy_name=None):
+    if num_starts is None:
+        num_starts = multi_start_count
+    strategy = create_routing_strategy(strategy_name)
 
-    for package in delivery_ht.package_table:
-        if package is not None and package.get_delayed_arrival_time() is not None:
-            if delayed_start_time is None or delayed_start_time > package.get_delayed_arrival_time():
-                delayed_start_time = package.get_delayed_arrival_time()
+    # Parse the address and distance data once into the DistanceMatrix used for all distance lookups
+    distance_matrix = load_distance_matrix()
 
-    if len(truck_list) > 1:
-        last_truck_index = len(truck_list) - 1
-        truck_list[last_truck_index].time_obj = delayed_start_time
+    delivery_ht, truck_list, package_store = simulate_day(distance_matrix, strategy=strategy)
 
-    # Assign all the Packages to the Trucks
-    for truck in truck_list:
-        assign_packages(delivery_ht, truck)
+    # Keep the lowest-mileage feasible plan out of the randomized starts if it beats the deterministic plan
+    if num_starts > 0:
+        best_plan = solve_multi_start(partial(simulate_day, strategy=strategy), distance_matrix, num_starts,
+                                      multi_start_time_budget, multi_start_workers)
+        if best_plan is None:
+            print("Multi-start: none of the %d starts produced a plan that delivers every Package on time" % num_starts)
+        else:
+            (num_late_packages, total_mileage), seed, best_ht, best_truck_list = best_plan
+            print("Multi-start: best of %d starts (seed %d) travels %0.2f miles" % (num_starts, seed, total_mileage))
+            if (num_late_packages, total_mileage) < evaluate_plan(package_store, truck_list):
+                delivery_ht, truck_list = best_ht, best_truck_list
+
+    # Report the mileage saved on each Truck by the route improvement stage
+    if route_improvement_time_budget is not None:
+        for truck in truck_list:
+            print("Route improvement saved %0.2f miles on Truck %d" %
+                  (truck.miles_saved_by_route_improvement, truck.id))
+
+    # Index the status changes of every Package and the mileage of every Truck for the reports
+    timeline = StatusTimeline(delivery_ht, truck_list)
+
+    return delivery_ht, truck_list, timeline
+
+
+# Space-Time Complexity: O(S), where S is the total size of the input files and source code
+# Returns the SHA-256 digest of everything the plan of the day depends on: the contents of the address, distance and
+# manifest files, the planning configuration and the source code of the planner. It is the key of the saved plan
+def compute_plan_key(num_starts, strategy_name):
+    digest = hashlib.sha256()
+    source_paths = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py')))
+    manifest_paths = [package_manifest_file] + [manifest_path for _, manifest_path in appended_manifests]
+
+    distance_path = 'distances.csv' if distance_edges_file is None else distance_edges_file
+
+    for input_path in ['addresses.csv', distance_path] + manifest_paths + source_paths:
+        with open(input_path, 'rb') as input_file:
+            digest.update(hashlib.sha256(input_file.read()).digest())
+
+    planning_configuration = (num_trucks, num_drivers, sorted(truck_profiles.items()),
+                              sorted(address_corrections.items()), appended_manifests, delivery_updates, strategy_name,
+                              route_improvement_time_budget, num_starts, multi_start_time_budget,
+                              multi_start_candidate_count)
+    digest.update(repr(planning_configuration).encode("utf-8"))
+    return digest.digest()
+
+
+# Returns the StatusTimeline of the delivery day. The plan saved in plan_cache_file is loaded if it was made from the
+# same inputs, otherwise the day is planned and the new plan is saved for later runs. The saved plan is ignored if
+# reuse_plan is False
+def load_or_plan_deliveries(num_starts=None, strategy_name=None, reuse_plan=True):
+    if num_starts is None:
+        num_starts = multi_start_count
+    if strategy_name is None:
+        strategy_name = routing_strategy
+    plan_key = compute_plan_key(num_starts, strategy_name)
+
+    if reuse_plan:
+        timeline = StatusTimeline.load(plan_cache_file, plan_key)
+        if timeline is not None:
+            return timeline
+
+    delivery_ht, truck_list, timeline = plan_deliveries(num_starts, strategy_name)
+    timeline.save(plan_cache_file, plan_key)
+    return timeline
+
+
+# Space-Time Complexity: O(F), where F is the number of instrumented functions
+# Returns a Profiler that times the planning stages and counts the calls of the hot functions, the distance lookups,
+# HashTable probes and constraint index builds, along with the probe length of every HashTable lookup
+def create_profiler():
+    profiler = Profiler()
+    this_module = sys.modules[__name__]
+
+    for function_name in profiled_stages:
+        profiler.time_function(this_module, function_name)
+    for owner, attribute in ((StatusTimeline, "__init__"), (ConstraintIndex, "get_assignable_groups"),
+                             (RoutingStrategy, "finish_route"), (NearestNeighborStrategy, "load_truck"),
+                             (NearestNeighborStrategy, "assign_packages"),
+                             (NearestNeighborStrategy, "sort_truck_package_list"), (SavingsStrategy, "load_truck"),
+                             (SavingsStrategy, "partition_truck_loads")):
+        profiler.time_function(owner, attribute, owner.__name__ + "." + attribute)
+    profiler.time_function(RoutingStrategyModule, "schedule_deadlines")
+    profiler.time_function(RoutingStrategyModule, "improve_route")
+
+    for owner, attribute in ((DistanceMatrix, "distance"), (DistanceMatrix, "distance_between"),
+                             (ConstraintIndex, "__init__"), (ConstraintIndex, "add_package"),
+                             (NearestNeighborIndex, "nearest")):
+        profiler.count_function(owner, attribute, owner.__name__ + "." + attribute)
+    profiler.record_probe_lengths(HashTable)
+
+    return profiler
+
+
+# Parses the command-line arguments
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Western Governors University Parcel Service")
+    parser.add_argument("--batch", metavar="FILE", nargs="?", const="-",
+                        help="answer the JSONL queries in FILE (or standard input if FILE is omitted or '-') and write "
+                             "one JSON result per line to standard output instead of showing the interactive menu")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="serve JSONL queries, in the format answered by --batch, to concurrent clients over TCP "
+                             "instead of showing the interactive menu (default host: %s)" % status_server_host)
+    parser.add_argument("--multi-start", metavar="STARTS", type=int,
+                        help="also run STARTS randomized route constructions across a process pool and keep the "
+                             "lowest-mileage plan that delivers every Package on time")
+    parser.add_argument("--strategy", choices=sorted(routing_strategies),
+                        help="routing strategy used to load the Trucks (default: %s)" % routing_strategy)
+    parser.add_argument("--replan", action="store_true",
+                        help="plan the day again instead of loading the plan saved by an earlier run with the same "
+                             "inputs")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the planning stages, count the calls of hot functions and print a summary to "
+                             "standard error, planning the day again (also enabled by setting %s)" %
+                             profile_environment_variable)
+    parser.add_argument("--trace", metavar="FILE",
+                        help="profile the planning and write a Chrome trace-event JSON file (also enabled by setting "
+                             "%s to the file path)" % trace_environment_variable)
+    return parser.parse_args()
+
+
+# Stops the profiler, prints its summary to standard error and writes the Chrome trace if a path is provided
+def report_profile(profiler, trace_path):
+    if profiler is None:
+        return
+
+    profiler.stop()
+    for line in profiler.get_summary_lines():
+        print(line, file=sys.stderr)
+    if trace_path:
+        profiler.write_chrome_trace(trace_path)
+        print("Chrome trace written to " + trace_path, file=sys.stderr)
+
+
+# Serves status queries against the timeline on the [HOST:]PORT address until the program is interrupted
+def run_status_server(timeline, address):
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        sys.exit("Error: Invalid --serve address, expected [HOST:]PORT")
+
+    status_server = StatusServer(timeline, status_server_cache_size)
+
+    def on_listening(socket_addresses):
+        print("Serving status queries on " + ", ".join("%s:%d" % socket_address[:2]
+                                                       for socket_address in socket_addresses), file=sys.stderr)
+
+    try:
+        asyncio.run(status_server.serve(host or status_server_host, int(port), on_listening))
+    except KeyboardInterrupt:
+        print("Status server stopped after answering %d queries" % status_server.num_queries, file=sys.stderr)
 
-    # Deliver Packages until all Packages are delivered
-    deliver_all_packages(delivery_ht, truck_list)
 
-    # Display the menu options
-    prompt_interactive_menu(delivery_ht, truck_list)
+def main():
+    arguments = parse_arguments()
+
+    # Instrument the planning stages if profiling is switched on by a flag or an environment variable
+    trace_path = arguments.trace or os.environ.get(trace_environment_variable)
+    profiler = None
+    if arguments.profile or os.environ.get(profile_environment_variable, "0") not in ("", "0") or trace_path:
+        profiler = create_profiler()
+
+    # A saved plan is only reused when the planning stages are not being profiled
+    reuse_plan = not arguments.replan and profiler is None
+
+    if arguments.serve is not None:
+        with contextlib.redirect_stdout(sys.stderr):
+            timeline = load_or_plan_deliveries(arguments.multi_start, arguments.strategy, reuse_plan)
+        report_profile(profiler, trace_path)
+        run_status_server(timeline, arguments.serve)
+        return
+
+    if arguments.batch is None:
+        timeline = load_or_plan_deliveries(arguments.multi_start, arguments.strategy, reuse_plan)
+        report_profile(profiler, trace_path)
+
+        # Display the menu options
+        prompt_interactive_menu(timeline)
+        return
+
+    # In batch mode standard output only carries query results, so planning messages are sent to standard error
+    with contextlib.redirect_stdout(sys.stderr):
+        timeline = load_or_plan_deliveries(arguments.multi_start, arguments.strategy, reuse_plan)
+    report_profile(profiler, trace_path)
+
+    # Answer the queries against the single simulated day
+    if arguments.batch == "-":
+        run_batch_queries(timeline, sys.stdin, sys.stdout, flush=True)
+    else:
+        with open(arguments.batch) as query_file:
+            run_batch_queries(timeline, query_file, sys.stdout)
 
 
 if __name__ == "__main__":
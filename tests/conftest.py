@@ -0,0 +1,25 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+import main
+
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Returns a function that simulates the sample day from the repository's data files and returns the HashTable, Truck
+# list and PackageStore of the day. Keyword arguments override the settings of main with the same names for the rest of
+# the test, and the warnings printed while planning are discarded
+@pytest.fixture
+def simulate_sample_day(monkeypatch):
+    monkeypatch.chdir(repository_dir)
+
+    def simulate(strategy=None, **settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(main, name, value)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return main.simulate_day(main.load_distance_matrix(), strategy=strategy)
+
+    return simulate
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from ConstraintIndex import ConstraintIndex
+from HashTable import HashTable
+from Package import Package
+
+delayed_note = "Delayed on flight---will not arrive to depot until 9:05 am"
+
+
+def make_package(id_number, special_notes=""):
+    return Package(id_number, "%d Road" % id_number, "Salt Lake City", "UT", "84101", "EOD", "1", special_notes,
+                   "At the hub")
+
+
+def make_index(*packages):
+    ht = HashTable()
+    for package in packages:
+        ht.insert(package)
+    return ConstraintIndex(ht)
+
+
+# Returns the assignable groups as a dictionary of sorted Package ID tuples to their AssignableGroup
+def assignable_groups(constraint_index, truck_id, time):
+    return {tuple(sorted(package.id_number for package in group.packages)): group
+            for group in constraint_index.get_assignable_groups(truck_id, time)}
+
+
+def test_groups_are_offered_whole_once_every_package_arrives():
+    constraint_index = make_index(make_package(1), make_package(2, "Must be delivered with 1, 3"),
+                                  make_package(3, delayed_note), make_package(4))
+
+    assert list(assignable_groups(constraint_index, 1, timedelta(hours=8))) == [(4,)]
+    groups = assignable_groups(constraint_index, 1, timedelta(hours=9, minutes=5))
+    assert sorted(groups) == [(1, 2, 3), (4,)]
+    assert groups[(1, 2, 3)].size == 3
+    assert groups[(1, 2, 3)].arrival_time == timedelta(hours=9, minutes=5)
+    assert groups[(4,)].arrival_time is None
+    assert constraint_index.get_earliest_delayed_arrival_time() == timedelta(hours=9, minutes=5)
+
+
+def test_truck_restriction_applies_to_the_whole_group():
+    constraint_index = make_index(make_package(1, "Can only be on truck 2"),
+                                  make_package(2, "Must be delivered with 1"), make_package(3))
+
+    assert sorted(assignable_groups(constraint_index, 1, timedelta(hours=8))) == [(3,)]
+    groups = assignable_groups(constraint_index, 2, timedelta(hours=8))
+    assert sorted(groups) == [(1, 2), (3,)]
+    assert groups[(1, 2)].required_truck == 2
+
+
+def test_assigned_and_cancelled_packages_leave_the_group():
+    packages = [make_package(1), make_package(2, "Must be delivered with 1"),
+                make_package(3, "Must be delivered with 2")]
+    constraint_index = make_index(*packages)
+
+    packages[0].assigned_truck_id = 1
+    constraint_index.mark_assigned(1)
+    assert list(assignable_groups(constraint_index, 1, timedelta(hours=8))) == [(2, 3)]
+
+    packages[2].cancelled_timestamp = timedelta(hours=8)
+    constraint_index.update_group(3)
+    assert list(assignable_groups(constraint_index, 1, timedelta(hours=8))) == [(2,)]
+
+    packages[1].assigned_truck_id = 1
+    constraint_index.mark_assigned(2)
+    assert assignable_groups(constraint_index, 1, timedelta(hours=8)) == {}
+
+
+def test_package_added_later_joins_its_group():
+    constraint_index = make_index(make_package(1), make_package(2))
+    constraint_index.add_package(make_package(3, "Must be delivered with 1, 2"))
+    constraint_index.add_package(make_package(4, delayed_note))
+    constraint_index.add_package(make_package(5, "Must be delivered with 4"))
+
+    assert list(assignable_groups(constraint_index, 1, timedelta(hours=8))) == [(1, 2, 3)]
+    assert sorted(assignable_groups(constraint_index, 1, timedelta(hours=10))) == [(1, 2, 3), (4, 5)]
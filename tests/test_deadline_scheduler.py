@@ -0,0 +1,73 @@
+import random
+from datetime import timedelta
+
+import benchmark_routing
+from DeadlineScheduler import RouteSchedule, get_truck_schedule, schedule_deadlines
+from DistanceMatrix import DistanceMatrix
+from HashTable import HashTable
+from Package import Package
+from Truck import Truck
+
+start_time = timedelta(hours=8)
+
+
+def make_package(id_number, address, deadline="EOD"):
+    return Package(id_number, address, "Salt Lake City", "UT", "84101", deadline, "1", "", "At the hub")
+
+
+# Returns a random deadline between 8:30 AM and 11:30 AM, or "EOD" for about a third of the Packages
+def random_deadline(rng):
+    if rng.random() < 0.3:
+        return "EOD"
+    minutes = rng.randint(30, 210)
+    return "%d:%02d AM" % (8 + minutes // 60, minutes % 60)
+
+
+def test_late_order_is_repaired():
+    # The hub, an address 1 mile away and an address 20 miles away, all on one road
+    positions = [0, 1, 20]
+    distance_triangle = DistanceMatrix.empty_triangle(len(positions))
+    for i in range(len(positions)):
+        for j in range(i + 1):
+            distance_triangle[DistanceMatrix.triangle_index(i, j)] = abs(positions[i] - positions[j])
+    distance_matrix = DistanceMatrix(["Hub", "1 Near St", "20 Far St"], distance_triangle)
+
+    ht = HashTable()
+    truck = Truck(1, hub_address="Hub", shift_start=start_time)
+    for package in (make_package(1, "20 Far St"), make_package(2, "1 Near St", "8:10 AM")):
+        ht.insert(package)
+        truck.assign_package(package)
+
+    # Driving to the far address first delivers Package 2 more than two hours late
+    late_packages = get_truck_schedule(ht, truck, distance_matrix).get_late_packages()
+    assert [package.id_number for package in late_packages] == [2]
+    assert schedule_deadlines(ht, truck, distance_matrix) == []
+    assert truck.packages_id_list == [2, 1]
+
+
+def test_can_insert_matches_recomputing_the_route():
+    rng = random.Random(1)
+    distance_matrix = benchmark_routing.generate_distance_matrix(rng, 30)
+    address_list = distance_matrix.address_list
+    num_answers = {True: 0, False: 0}
+
+    for _ in range(40):
+        packages = [make_package(id_number, rng.choice(address_list[1:]), random_deadline(rng))
+                    for id_number in range(1, 9)]
+        route = [0] + [distance_matrix.index_of(package.delivery_address) for package in packages] + [0]
+        schedule = RouteSchedule(distance_matrix, route, [None] + packages + [None], start_time, 18)
+        late_ids = {package.id_number for package in schedule.get_late_packages()}
+
+        package = make_package(99, rng.choice(address_list[1:]), random_deadline(rng))
+        address_index = distance_matrix.index_of(package.delivery_address)
+        for position in range(len(route) - 1):
+            inserted = RouteSchedule(distance_matrix, route[:position + 1] + [address_index] + route[position + 1:],
+                                     [None] + packages[:position] + [package] + packages[position:] + [None],
+                                     start_time, 18)
+            # Stops that were already late do not count against an insertion
+            newly_late_ids = {late_package.id_number for late_package in inserted.get_late_packages()} - late_ids
+            expected = len(newly_late_ids) == 0
+            assert schedule.can_insert(position, address_index, package) == expected
+            num_answers[expected] += 1
+
+    assert num_answers[True] > 0 and num_answers[False] > 0
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+
+import main
+from BatchQueries import answer_query
+from Package import AddressCorrection, Cancellation, LateArrival
+from StatusTimeline import StatusTimeline
+
+
+# Returns a function that simulates the sample day with the provided Package updates and returns the HashTable, Truck
+# list and StatusTimeline
+@pytest.fixture
+def simulate_with_updates(simulate_sample_day):
+    def simulate(delivery_updates, strategy_name=None):
+        ht, truck_list, _ = simulate_sample_day(main.create_routing_strategy(strategy_name),
+                                                delivery_updates=delivery_updates)
+        return ht, truck_list, StatusTimeline(ht, truck_list)
+
+    return simulate
+
+
+def assert_others_delivered(ht, *skipped_ids):
+    for package in ht.values():
+        if package.id_number not in skipped_ids:
+            assert package.delivery_timestamp is not None, package.id_number
+
+
+def test_package_cancelled_on_a_truck(simulate_with_updates):
+    ht, truck_list, timeline = simulate_with_updates([(5, Cancellation(timedelta(hours=8, minutes=30)))])
+    package = ht.lookup(5)
+    assert package.en_route_timestamp == timedelta(hours=8)
+    assert package.delivery_timestamp is None
+    assert package.cancelled_timestamp == timedelta(hours=8, minutes=30)
+    assert_others_delivered(ht, 5)
+
+    # Between leaving the hub and the cancellation the Package is en route, with no delivery to expect
+    report_line = timeline.get_package_report_line(5, 8 * 3600 + 15 * 60)
+    assert "En route to delivery address, delivery cancelled at 08:30 AM" in report_line
+    assert "Cancelled at 08:30 AM" in timeline.get_package_report_line(5, 9 * 3600)
+    assert len(timeline.get_report_lines(8 * 3600 + 15 * 60)) == 40
+
+    result = answer_query(timeline, {"type": "package_status", "package_id": 5, "time": "8:15 AM"})
+    assert result["status"] == "en_route"
+    assert result["cancelled_time"] == "08:30 AM"
+    assert "delivery_time" not in result
+
+
+def test_package_cancelled_at_the_hub(simulate_with_updates):
+    ht, truck_list, timeline = simulate_with_updates([(6, Cancellation(timedelta(hours=8, minutes=30)))])
+    package = ht.lookup(6)
+    assert package.en_route_timestamp is None
+    assert package.delivery_timestamp is None
+    assert_others_delivered(ht, 6)
+    assert "At the hub" in timeline.get_package_report_line(6, 8 * 3600 + 15 * 60)
+
+
+def test_late_arrival_holds_the_package(simulate_with_updates):
+    ht, truck_list, timeline = simulate_with_updates([(2, LateArrival(timedelta(hours=8), timedelta(hours=11)))])
+    assert ht.lookup(2).en_route_timestamp >= timedelta(hours=11)
+    assert_others_delivered(ht)
+
+
+@pytest.mark.parametrize("strategy_name", ["nearest_neighbor", "savings"])
+def test_late_arrival_holds_the_whole_group(simulate_with_updates, strategy_name):
+    # Packages 14, 16 and 20 tie Package 19 to Packages 13 and 15, so all six wait for it
+    late_arrival = LateArrival(timedelta(hours=7, minutes=30), timedelta(hours=10))
+    ht, truck_list, timeline = simulate_with_updates([(19, late_arrival)], strategy_name)
+    group = [ht.lookup(id_number) for id_number in (13, 14, 15, 16, 19, 20)]
+    assert len({(package.assigned_truck_id, package.en_route_timestamp) for package in group}) == 1
+    assert group[0].en_route_timestamp >= timedelta(hours=10)
+    assert_others_delivered(ht)
+
+
+def test_address_corrected_on_a_truck(simulate_with_updates):
+    correction = AddressCorrection(timedelta(hours=8, minutes=5), "410 S State St", "Salt Lake City", "UT", "84111")
+    ht, truck_list, timeline = simulate_with_updates([(5, correction)])
+    package = ht.lookup(5)
+    assert package.en_route_timestamp == timedelta(hours=8)
+    assert package.delivery_address == "410 S State St"
+    assert package.delivery_timestamp > timedelta(hours=8, minutes=5)
+    assert_others_delivered(ht)
+
+
+@pytest.mark.parametrize("update", [Cancellation(timedelta(hours=8)), LateArrival(timedelta(hours=8),
+                                                                                     timedelta(hours=9))])
+def test_update_for_unknown_package_is_ignored(simulate_with_updates, update):
+    ht, truck_list, timeline = simulate_with_updates([(99, update)])
+    assert_others_delivered(ht)
@@ -0,0 +1,64 @@
+from array import array
+
+import pytest
+
+from DistanceMatrix import DistanceMatrix
+
+
+# Returns a DistanceMatrix of four addresses where the distance between addresses i and j is i + j + 0.5
+def make_matrix():
+    address_list = ["Hub", "1 A St", "2 B St", "3 C St"]
+    distance_triangle = DistanceMatrix.empty_triangle(len(address_list))
+    for i in range(len(address_list)):
+        for j in range(i):
+            distance_triangle[DistanceMatrix.triangle_index(i, j)] = i + j + 0.5
+    return DistanceMatrix(address_list, distance_triangle)
+
+
+def test_distance_is_symmetric_and_looked_up_by_address():
+    distance_matrix = make_matrix()
+    assert distance_matrix.index_of("2 B St") == 2
+    assert distance_matrix.distance(3, 1) == distance_matrix.distance(1, 3) == 4.5
+    assert distance_matrix.distance_between("Hub", "3 C St") == 3.5
+    assert distance_matrix.distance(2, 2) == 0
+
+
+def test_sorted_neighbors_orders_by_distance():
+    assert make_matrix().sorted_neighbors(3) == [3, 0, 1, 2]
+
+
+def test_cache_round_trip(tmp_path):
+    distance_matrix = make_matrix()
+    cache_path = str(tmp_path / "distances.bin")
+    distance_matrix.save(cache_path)
+
+    loaded_matrix = DistanceMatrix.load(cache_path)
+    assert loaded_matrix.address_list == distance_matrix.address_list
+    assert list(loaded_matrix.distance_triangle) == list(array('f', distance_matrix.distance_triangle))
+    assert loaded_matrix.distance_between("1 A St", "2 B St") == 3.5
+
+
+@pytest.mark.parametrize("contents", [b"", b"WGUD", b"XXXX" + bytes(100)])
+def test_invalid_cache_is_not_loaded(tmp_path, contents):
+    cache_path = tmp_path / "distances.bin"
+    cache_path.write_bytes(contents)
+    assert DistanceMatrix.load(str(cache_path)) is None
+
+
+def test_truncated_cache_is_not_loaded(tmp_path):
+    cache_path = tmp_path / "distances.bin"
+    make_matrix().save(str(cache_path))
+    cache_path.write_bytes(cache_path.read_bytes()[:-4])
+    assert DistanceMatrix.load(str(cache_path)) is None
+
+
+def test_dense_copy_is_capped(monkeypatch):
+    pytest.importorskip("numpy")
+    distance_matrix = make_matrix()
+    assert distance_matrix.dense()[3, 1] == 4.5
+    assert distance_matrix.route_length([0, 3, 1, 0]) == 3.5 + 4.5 + 1.5
+
+    monkeypatch.setattr("DistanceMatrix.max_dense_addresses", 3)
+    distance_matrix = make_matrix()
+    assert distance_matrix.dense() is None
+    assert distance_matrix.route_length([0, 3, 1, 0]) == 3.5 + 4.5 + 1.5
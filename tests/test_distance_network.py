@@ -0,0 +1,65 @@
+import pytest
+
+from DistanceNetwork import DistanceNetwork, neighbor_item_size, row_item_size
+
+grid_size = 30
+
+
+# Returns the address list and road edges of a grid of addresses where each road between neighbouring addresses is
+# 1 mile long plus a small amount that depends on its position, so most distances are distinct
+def make_grid():
+    address_list = ["%d %d St" % (row, column) for row in range(grid_size) for column in range(grid_size)]
+    edges = []
+    for row in range(grid_size):
+        for column in range(grid_size):
+            index = row * grid_size + column
+            if column + 1 < grid_size:
+                edges.append((index, index + 1, 1 + (index % 7) / 16))
+            if row + 1 < grid_size:
+                edges.append((index, index + grid_size, 1 + (index % 5) / 16))
+    return address_list, edges
+
+
+def test_shortest_paths_match_the_closure():
+    address_list, edges = make_grid()
+    network = DistanceNetwork(address_list, edges, 10 * row_item_size * len(address_list))
+    closure = DistanceNetwork(address_list, edges, 0)
+    closure.get_distance_triangle()
+
+    for address1_index, address2_index in ((0, 0), (0, 1), (0, 899), (450, 31), (899, 870)):
+        assert network.distance(address1_index, address2_index) == \
+            pytest.approx(closure.distance(address1_index, address2_index), abs=1e-4)
+    assert network.distance(0, grid_size + 1) == pytest.approx(2 + 1 / 16)
+
+
+def test_rows_and_neighbor_lists_stay_under_the_memory_cap():
+    address_list, edges = make_grid()
+    num_addresses = len(address_list)
+    memory_cap = 12 * row_item_size * num_addresses
+    network = DistanceNetwork(address_list, edges, memory_cap)
+
+    first_neighbors = list(network.sorted_neighbors(0))
+    for address_index in range(0, num_addresses, 9):
+        network.sorted_neighbors(address_index)
+        network.distance(address_index + 1, 7)
+        assert network.memory_used <= memory_cap
+
+    # Every neighbour list is kept with its row, and the bytes counted are the bytes held
+    assert set(network.sorted_neighbor_lists) <= set(network.distance_rows)
+    assert network.memory_used == row_item_size * num_addresses * len(network.distance_rows) + \
+        neighbor_item_size * num_addresses * len(network.sorted_neighbor_lists)
+    assert 0 not in network.sorted_neighbor_lists
+
+    # An evicted list is rebuilt the same, in order of distance
+    neighbors = network.sorted_neighbors(0)
+    assert list(neighbors) == first_neighbors
+    assert neighbors[0] == 0
+    distances = [network.distance(0, neighbor_index) for neighbor_index in neighbors]
+    assert distances == sorted(distances)
+
+
+def test_invalid_networks_are_rejected():
+    with pytest.raises(ValueError):
+        DistanceNetwork(["Hub", "1 A St"], [(0, 1, -1)], 1024)
+    with pytest.raises(ValueError):
+        DistanceNetwork(["Hub", "1 A St", "2 B St"], [(0, 1, 1)], 1024)
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from HashTable import HashTable, probing_strategies
+from Package import Package
+
+
+def make_package(id_number):
+    return Package(id_number, "%d Test St" % id_number, "Salt Lake City", "UT", "84101", "EOD", "1", "", "At the hub")
+
+
+@pytest.mark.parametrize("probing", probing_strategies)
+def test_insert_lookup_remove_matches_dict(probing):
+    ht = HashTable(initial_capacity=4, probing=probing)
+    expected = {}
+    rng = random.Random(probing)
+
+    for _ in range(2000):
+        key = rng.randrange(300)
+        action = rng.random()
+        if action < 0.5:
+            package = make_package(key)
+            ht.insert(package)
+            expected[key] = package
+        elif action < 0.8:
+            assert ht.remove(key) is expected.pop(key, None)
+        else:
+            assert ht.lookup(key) is expected.get(key)
+
+    assert len(ht) == len(expected)
+    assert sorted(ht) == sorted(expected)
+    for key, package in expected.items():
+        assert ht.lookup(key) is package
+
+
+@pytest.mark.parametrize("probing", probing_strategies)
+def test_table_grows_within_load_factor(probing):
+    ht = HashTable(initial_capacity=1, probing=probing)
+    for id_number in range(1, 101):
+        ht.insert(make_package(id_number))
+        assert ht.num_packages + ht.num_removed_buckets <= ht.max_load_factor * len(ht.package_table)
+    assert len(ht.package_table) & (len(ht.package_table) - 1) == 0
+
+
+def test_reserve_grows_once():
+    ht = HashTable()
+    ht.reserve(1000)
+    capacity = len(ht.package_table)
+    for id_number in range(1000):
+        ht.insert(make_package(id_number))
+    assert len(ht.package_table) == capacity
+
+
+def test_unknown_probing_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        HashTable(probing="cuckoo")
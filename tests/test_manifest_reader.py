@@ -0,0 +1,65 @@
+import pytest
+
+from ManifestReader import ManifestReader, split_records
+
+rows = [
+    b'1,195 W Oakland Ave,Salt Lake City,UT,84115,10:30 AM,21,\n',
+    b'2,"2530 S 500 E\nSuite 4",Salt Lake City,UT,84106,EOD,44,"Must be delivered with 13, 15"\n',
+    b'3,233 Canyon Rd,Salt Lake City,UT,84103,EOD,2,Can only be on truck 2\n',
+]
+
+
+def write_manifest(tmp_path, contents):
+    manifest_path = tmp_path / "packages.csv"
+    manifest_path.write_bytes(contents)
+    return manifest_path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 64 * 1024])
+def test_rows_are_the_same_for_every_chunk_size(tmp_path, chunk_size):
+    manifest_path = write_manifest(tmp_path, b"".join(rows))
+    read_rows = list(ManifestReader(str(manifest_path), chunk_size).read_rows())
+
+    assert [row[0] for row in read_rows] == ["1", "2", "3"]
+    assert read_rows[1][1] == "2530 S 500 E\nSuite 4"
+    assert read_rows[1][7] == "Must be delivered with 13, 15"
+
+
+def test_partial_last_row_waits_for_the_rest(tmp_path):
+    manifest_path = write_manifest(tmp_path, rows[0] + rows[2][:20])
+    manifest_reader = ManifestReader(str(manifest_path), chunk_size=16)
+    assert [row[0] for row in manifest_reader.read_rows()] == ["1"]
+
+    # The rest of the row is appended later in the day
+    with open(manifest_path, "ab") as manifest_file:
+        manifest_file.write(rows[2][20:])
+    assert [row[2] for row in manifest_reader.read_rows()] == ["Salt Lake City"]
+    assert list(manifest_reader.read_rows()) == []
+
+
+def test_open_quote_waits_for_the_rest(tmp_path):
+    manifest_path = write_manifest(tmp_path, rows[1][:20])
+    manifest_reader = ManifestReader(str(manifest_path))
+    assert list(manifest_reader.read_rows()) == []
+
+    with open(manifest_path, "ab") as manifest_file:
+        manifest_file.write(rows[1][20:])
+    assert [row[1] for row in manifest_reader.read_rows()] == ["2530 S 500 E\nSuite 4"]
+
+
+def test_complete_manifest_reads_last_row_without_line_break(tmp_path):
+    manifest_path = write_manifest(tmp_path, rows[0] + rows[2].rstrip(b"\n"))
+    read_rows = list(ManifestReader(str(manifest_path)).read_rows(include_partial_line=True))
+    assert [row[0] for row in read_rows] == ["1", "3"]
+
+
+def test_invalid_rows_are_skipped_with_their_line_number(tmp_path, capsys):
+    manifest_path = write_manifest(tmp_path, rows[1] + b"\nx,no id\n" + rows[2])
+    manifest_reader = ManifestReader(str(manifest_path))
+    assert [row[0] for row in manifest_reader.read_rows()] == ["2", "3"]
+    assert manifest_reader.num_invalid_rows == 1
+    assert "line 4" in capsys.readouterr().out
+
+
+def test_split_records_keeps_quoted_line_breaks():
+    assert split_records(b'a,"b\nc"\nd\n"e') == ([b'a,"b\nc"', b"d"], b'"e')
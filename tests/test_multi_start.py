@@ -0,0 +1,32 @@
+import random
+from array import array
+
+from DistanceMatrix import DistanceMatrix
+from HashTable import HashTable
+from MultiStartSolver import solve_multi_start
+from PackageStore import PackageStore
+from Truck import Truck
+
+
+# Stand-in for main.simulate_day run in the worker processes. The plan of each start travels the distance between the
+# first two addresses times the start's first random number, so the start with the lowest number wins
+def simulate_distance(distance_matrix, rng, deadline):
+    truck = Truck(1)
+    truck.total_distance_traveled = distance_matrix.distance(0, 1) * rng.random()
+    ht = HashTable()
+    return ht, [truck], PackageStore(ht, distance_matrix)
+
+
+def test_workers_read_the_shared_distances(tmp_path):
+    distance_triangle = array('d', [0, 2.5, 0])
+    distance_matrix = DistanceMatrix(["Hub", "1 A St"], distance_triangle)
+
+    # The float32 triangle memory-mapped from a cache is widened to float64 for the workers
+    cache_path = str(tmp_path / "distances.bin")
+    distance_matrix.save(cache_path)
+
+    for matrix in (distance_matrix, DistanceMatrix.load(cache_path)):
+        score, seed, ht, truck_list = solve_multi_start(simulate_distance, matrix, 4, 60, num_workers=2)
+        expected = min(2.5 * random.Random(seed).random() for seed in range(4))
+        assert score == (0, expected)
+        assert truck_list[0].total_distance_traveled == expected
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from Package import AddressCorrection, Package, parse_time_of_day, wrong_address_hold_time
+
+
+def make_package(special_notes, deadline="EOD", address_correction=None):
+    return Package(1, "300 State St", "Salt Lake City", "UT", "84103", deadline, "2", special_notes, "At the hub",
+                   address_correction)
+
+
+def test_parse_time_of_day():
+    assert parse_time_of_day("10:30 AM") == timedelta(hours=10, minutes=30)
+    assert parse_time_of_day("12:00 PM") == timedelta(hours=12)
+    assert parse_time_of_day("until 9:05 am") == timedelta(hours=9, minutes=5)
+    assert parse_time_of_day("EOD") is None
+
+
+def test_special_notes_are_parsed_once():
+    assert make_package("Can only be on truck 2").required_truck == 2
+    assert make_package("Must be delivered with 13, 15").co_delivery_ids == (13, 15)
+    assert make_package("Delayed on flight---will not arrive to depot until 9:05 am").available_at == \
+        timedelta(hours=9, minutes=5)
+    assert make_package("", deadline="10:30 AM").deadline == timedelta(hours=10, minutes=30)
+
+
+def test_wrong_address_waits_for_its_correction():
+    correction = AddressCorrection(timedelta(hours=11), "410 S State St", "Salt Lake City", "UT", "84111")
+    package = make_package("Wrong address listed", address_correction=correction)
+    assert package.available_at == timedelta(hours=11)
+
+
+def test_wrong_address_without_correction_is_held():
+    assert make_package("Wrong address listed").available_at == wrong_address_hold_time
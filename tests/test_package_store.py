@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from DistanceMatrix import DistanceMatrix
+from HashTable import HashTable
+from Package import Package
+from PackageStore import PackageStore, no_address, no_truck
+
+address_list = ["Hub", "1 A St", "2 B St"]
+
+
+def make_store(*packages):
+    ht = HashTable()
+    for package in packages:
+        ht.insert(package)
+    distance_matrix = DistanceMatrix(address_list, DistanceMatrix.empty_triangle(len(address_list)))
+    return PackageStore(ht, distance_matrix)
+
+
+def make_package(id_number, address, deadline="EOD"):
+    return Package(id_number, address, "Salt Lake City", "UT", "84101", deadline, "1", "", "At the hub")
+
+
+def test_counters_follow_the_day():
+    store = make_store(make_package(1, "1 A St", "10:30 AM"), make_package(2, "2 B St", "9:00 AM"),
+                       make_package(3, "1 A St"), make_package(4, "9 Wrong St"))
+    assert list(store.address_indices) == [1, 2, 1, no_address]
+    assert store.num_unassigned == 4
+    assert store.get_undelivered_ids() == [1, 2, 3, 4]
+
+    store.mark_assigned([1, 2, 3], 1)
+    store.mark_en_route([1, 2, 3], timedelta(hours=8))
+    assert store.num_unassigned == 1
+    assert store.get_carrying_truck_id(2) == 1
+
+    store.mark_delivered([1], timedelta(hours=9))
+    store.mark_delivered([2], timedelta(hours=9, minutes=30))
+    store.mark_cancelled(3, timedelta(hours=9, minutes=45))
+    assert store.get_carrying_truck_id(2) is None
+    assert store.get_undelivered_ids() == [4]
+    assert store.count_delivered_before(9 * 3600 + 15 * 60) == 1
+    assert store.count_late() == 1
+    assert not store.all_delivered()
+
+    # A Package cancelled at the hub is never assigned to a Truck
+    store.set_address(4, "2 B St")
+    store.mark_cancelled(4, timedelta(hours=10))
+    assert store.address_indices[3] == 2
+    assert store.truck_ids[3] == no_truck
+    assert store.num_unassigned == 0
+    assert store.all_delivered()
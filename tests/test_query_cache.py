@@ -0,0 +1,20 @@
+from QueryCache import QueryCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    assert (cache.num_hits, cache.num_misses) == (3, 1)
+
+
+def test_empty_cache_stores_nothing():
+    cache = QueryCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,57 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+import benchmark_routing
+from Package import Package
+from RouteImprover import improve_route
+from Stop import group_stops
+from Truck import Truck
+
+
+# Returns the miles driven and the number of late Packages when the Truck visits its Stops in order from the hub and
+# returns there, timing every leg the way the Truck does
+def drive_stops(truck, distance_matrix):
+    addresses = [truck.hub_address] + [stop.address for stop in truck.stops] + [truck.hub_address]
+    miles = 0
+    arrival_time = truck.time_obj
+    num_late_packages = 0
+    for stop_index in range(1, len(addresses)):
+        leg_miles = distance_matrix.distance_between(addresses[stop_index - 1], addresses[stop_index])
+        miles += leg_miles
+        arrival_time += truck.travel_time(leg_miles)
+        if stop_index < len(addresses) - 1:
+            num_late_packages += sum(1 for package in truck.stops[stop_index - 1].packages
+                                     if package.deadline is not None and arrival_time > package.deadline)
+    return miles, num_late_packages
+
+
+def test_improvement_never_adds_miles_or_late_packages():
+    rng = random.Random(2)
+    distance_matrix = benchmark_routing.generate_distance_matrix(rng, 40)
+    address_list = distance_matrix.address_list
+    total_miles_saved = 0
+
+    for _ in range(25):
+        packages = []
+        for id_number in range(1, 17):
+            deadline = rng.choice(("EOD", "EOD", "9:00 AM", "10:30 AM", "12:00 PM"))
+            packages.append(Package(id_number, rng.choice(address_list[1:]), "Salt Lake City", "UT", "84101",
+                                    deadline, "1", "", "At the hub"))
+        # Visiting the Packages by deadline first keeps most deadlines, the way the Truck's load is ordered before its
+        # route is improved, so many of the shorter orders would make Packages late
+        packages.sort(key=lambda package: package.deadline or timedelta(days=1))
+        truck = Truck(1, hub_address=address_list[0], shift_start=timedelta(hours=8))
+        truck.set_stops(group_stops(distance_matrix, packages))
+        miles, num_late_packages = drive_stops(truck, distance_matrix)
+
+        miles_saved = improve_route(truck, distance_matrix, 5)
+        improved_miles, improved_num_late_packages = drive_stops(truck, distance_matrix)
+        assert improved_miles <= miles + 1e-9
+        assert improved_miles == pytest.approx(miles - miles_saved)
+        assert improved_num_late_packages <= num_late_packages
+        assert sorted(truck.packages_id_list) == list(range(1, 17))
+        total_miles_saved += miles_saved
+
+    assert total_miles_saved > 0
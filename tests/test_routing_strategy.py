@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+import benchmark_routing
+from ConstraintIndex import ConstraintIndex
+from RoutingStrategy import RoutingStrategy, get_routing_strategy, routing_strategies
+
+
+class IncompleteStrategy(RoutingStrategy):
+    pass
+
+
+def test_strategy_without_load_truck_cannot_be_created():
+    with pytest.raises(TypeError):
+        IncompleteStrategy()
+    with pytest.raises(TypeError):
+        RoutingStrategy()
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        get_routing_strategy("teleport")
+
+
+@pytest.mark.parametrize("strategy_name", sorted(routing_strategies))
+def test_sample_day_is_delivered_on_time(simulate_sample_day, strategy_name):
+    ht, truck_list, _ = simulate_sample_day(get_routing_strategy(strategy_name))
+
+    assert len(ht) == 40
+    for package in ht.values():
+        assert package.delivery_timestamp is not None
+        assert package.deadline is None or package.delivery_timestamp <= package.deadline
+        if package.required_truck is not None:
+            assert package.assigned_truck_id == package.required_truck
+    assert sum(truck.total_distance_traveled for truck in truck_list) < 140
+    for truck in truck_list:
+        assert truck.stops == [] and truck.packages_id_list == []
+        # Packages sharing an address are delivered at a single stop
+        assert all(address != next_address for address, next_address in
+                   zip(truck.route_addresses, truck.route_addresses[1:]))
+
+
+@pytest.mark.parametrize("strategy_name", sorted(routing_strategies))
+def test_groups_stay_on_one_truck_and_trip(strategy_name):
+    rng = random.Random(0)
+    distance_matrix = benchmark_routing.generate_distance_matrix(rng, 40)
+    rows = benchmark_routing.generate_package_rows(rng, distance_matrix.address_list, 150, 0.5, 3)
+    ht, truck_list, _ = benchmark_routing.simulate(strategy_name, distance_matrix, rows, 3)
+
+    constraint_index = ConstraintIndex(ht)
+    groups = {}
+    for package in ht.values():
+        groups.setdefault(constraint_index.find(package.id_number), []).append(package)
+    assert sum(1 for group in groups.values() if len(group) > 1) >= 10
+    # A group left at the hub, such as one whose Packages are restricted to different Trucks, is not split either
+    for group in groups.values():
+        assert len({(package.assigned_truck_id, package.en_route_timestamp) for package in group}) == 1
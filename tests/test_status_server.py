@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import json
+
+import pytest
+
+from BatchQueries import answer_query
+from StatusServer import StatusServer, max_query_line_bytes
+from StatusTimeline import StatusTimeline
+
+
+@pytest.fixture
+def timeline(simulate_sample_day):
+    ht, truck_list, _ = simulate_sample_day()
+    return StatusTimeline(ht, truck_list)
+
+
+# Starts the server on a free local port, runs the client coroutine with the port and stops the server afterwards
+def run_with_server(server, client):
+    async def run():
+        listening = asyncio.get_running_loop().create_future()
+        serve_task = asyncio.ensure_future(server.serve("127.0.0.1", 0, listening.set_result))
+        try:
+            port = (await listening)[0][1]
+            return await client(port)
+        finally:
+            serve_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await serve_task
+
+    return asyncio.run(run())
+
+
+# Sends the query lines on one connection and returns the decoded result lines, read until the server closes it
+async def send_lines(port, lines):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(line + b"\n" for line in lines))
+    await writer.drain()
+    writer.write_eof()
+    results = [json.loads(line) for line in (await reader.read()).splitlines()]
+    writer.close()
+    return results
+
+
+def test_concurrent_clients_get_their_results_in_order(timeline):
+    server = StatusServer(timeline, 64)
+    queries = [[{"id": number, "type": "package_status", "package_id": (client_id + number) % 40 + 1,
+                 "time": "%d:%02d AM" % (8 + number % 4, number)} for number in range(20)] +
+               [{"id": 20, "type": "fleet_mileage", "time": "10:30 AM"}]
+               for client_id in range(8)]
+
+    async def client(port):
+        return await asyncio.gather(*[send_lines(port, [json.dumps(query).encode("utf-8") for query in client_queries])
+                                      for client_queries in queries])
+
+    results = run_with_server(server, client)
+    for client_queries, client_results in zip(queries, results):
+        assert client_results == [answer_query(timeline, query) for query in client_queries]
+
+    # Every client asked for the fleet mileage at the same minute, which was computed once and then shared
+    assert server.cache.num_hits >= len(queries) - 1
+    assert server.num_queries == sum(len(client_queries) for client_queries in queries)
+    assert server.num_connections == 0
+
+
+def test_blank_and_invalid_lines(timeline):
+    results = run_with_server(StatusServer(timeline, 0), lambda port: send_lines(port, [
+        b"", b"not json", b"[1, 2]", b'{"type": "package_status", "package_id": 1, "time": "25:00"}',
+        b'{"type": "teleport", "time": "10:30 AM"}']))
+    assert len(results) == 4
+    assert results[0] == results[1] == {"error": "Query is not a JSON object"}
+    assert "time" in results[2]["error"]
+    assert "Unknown query type" in results[3]["error"]
+
+
+def test_too_long_line_closes_the_connection(timeline):
+    query_line = json.dumps({"type": "fleet_mileage", "time": "10:30 AM"}).encode("utf-8")
+    results = run_with_server(StatusServer(timeline, 0), lambda port: send_lines(port, [
+        query_line, b"x" * (max_query_line_bytes + 1), query_line]))
+    assert len(results) == 2
+    assert "total_mileage" in results[0]
+    assert results[1] == {"error": "Query line is too long"}
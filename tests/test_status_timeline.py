@@ -0,0 +1,113 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+
+from BatchQueries import answer_query, run_batch_queries
+from StatusTimeline import StatusTimeline
+from Truck import TruckProfile
+
+plan_key = bytes(range(32))
+
+
+@pytest.fixture
+def simulated_day(simulate_sample_day):
+    ht, truck_list, _ = simulate_sample_day()
+    return ht, truck_list, StatusTimeline(ht, truck_list)
+
+
+def test_save_and_load_round_trip(simulated_day, tmp_path):
+    _, truck_list, timeline = simulated_day
+    plan_path = str(tmp_path / "plan.bin")
+    timeline.save(plan_path, plan_key)
+    loaded_timeline = StatusTimeline.load(plan_path, plan_key)
+
+    assert loaded_timeline is not None
+    assert loaded_timeline.package_ids == timeline.package_ids
+    assert loaded_timeline.truck_ids == timeline.truck_ids
+    for seconds in (9 * 3600 + 30 * 60, 10 * 3600 + 30 * 60, 14 * 3600):
+        assert loaded_timeline.get_report_lines(seconds) == timeline.get_report_lines(seconds)
+        assert loaded_timeline.get_fleet_mileage(seconds) == pytest.approx(timeline.get_fleet_mileage(seconds))
+    for truck in truck_list:
+        assert loaded_timeline.get_truck_route(truck.id, 24 * 3600) == timeline.get_truck_route(truck.id, 24 * 3600)
+
+
+def test_routes_follow_the_trucks(simulated_day):
+    _, truck_list, timeline = simulated_day
+    for truck in truck_list:
+        route = timeline.get_truck_route(truck.id, 24 * 3600)
+        assert [address for _, _, address in route] == truck.route_addresses
+        assert len(route) == len(truck.mileage_timestamps)
+        # Every Truck that left the hub ends its day back there
+        if len(route) > 0:
+            assert route[-1][2] == truck.hub_address
+    assert any(len(truck.route_addresses) > 0 for truck in truck_list)
+
+    assert timeline.get_truck_route(truck_list[0].id, 0) == []
+    result = answer_query(timeline, {"type": "truck_route", "truck_id": truck_list[0].id, "time": "11:59 PM"})
+    assert len(result["stops"]) == len(truck_list[0].route_addresses)
+    assert "error" in answer_query(timeline, {"type": "truck_route", "truck_id": 99, "time": "10:30 AM"})
+
+
+def test_statuses_at_many_times_match_single_lookups(simulated_day):
+    timeline = simulated_day[2]
+    report_seconds_list = [14 * 3600, 8 * 3600, 9 * 3600 + 5 * 60, 10 * 3600 + 20 * 60, 8 * 3600]
+    swept = list(timeline.get_statuses_at_times(report_seconds_list))
+
+    assert [seconds for seconds, _ in swept] == sorted(report_seconds_list)
+    for seconds, statuses in swept:
+        assert statuses == [timeline.get_status(position, seconds) for position in range(len(timeline.package_ids))]
+
+
+def test_batch_reports_match_single_queries(simulated_day):
+    timeline = simulated_day[2]
+    queries = [{"id": 1, "type": "report", "time": "10:30 AM"},
+               {"id": 2, "type": "package_status", "package_id": 9, "time": "9:00 AM"},
+               {"id": 3, "type": "report", "time": "8:45 AM"},
+               {"id": 4, "type": "report", "time": "10:30 AM"},
+               {"id": 5, "type": "report", "time": "25:00"}]
+    input_lines = [json.dumps(query) for query in queries] + ["", "not json"]
+    output_file = io.StringIO()
+    run_batch_queries(timeline, io.StringIO("\n".join(input_lines) + "\n"), output_file)
+
+    results = [json.loads(line) for line in output_file.getvalue().splitlines()]
+    assert results == [answer_query(timeline, query) for query in queries] + [{"error": "Query is not a JSON object"}]
+
+
+def test_handoffs_are_reported_and_saved(simulate_sample_day, tmp_path):
+    # A fourth, larger and faster Truck starting at 11:00 AM draws a Driver off their Truck
+    ht, truck_list, _ = simulate_sample_day(num_trucks=4, truck_profiles={
+        4: TruckProfile("4001 South 700 East", 30, 40, timedelta(hours=11))})
+    timeline = StatusTimeline(ht, truck_list)
+
+    handoffs = timeline.get_handoffs(24 * 3600)
+    assert len(handoffs) > 0
+    assert all(handoff_seconds >= 11 * 3600 and truck_id == 4 for handoff_seconds, _, _, truck_id in handoffs)
+    assert timeline.get_handoffs(10 * 3600) == []
+
+    plan_path = str(tmp_path / "plan.bin")
+    timeline.save(plan_path, plan_key)
+    assert StatusTimeline.load(plan_path, plan_key).get_handoffs(24 * 3600) == handoffs
+
+
+def test_load_rejects_a_different_key(simulated_day, tmp_path):
+    timeline = simulated_day[2]
+    plan_path = str(tmp_path / "plan.bin")
+    timeline.save(plan_path, plan_key)
+    assert StatusTimeline.load(plan_path, bytes(32)) is None
+
+
+def test_load_rejects_a_truncated_plan(simulated_day, tmp_path):
+    timeline = simulated_day[2]
+    plan_path = str(tmp_path / "plan.bin")
+    timeline.save(plan_path, plan_key)
+    with open(plan_path, "rb") as plan_file:
+        plan_data = plan_file.read()
+    with open(plan_path, "wb") as plan_file:
+        plan_file.write(plan_data[:-6])
+    assert StatusTimeline.load(plan_path, plan_key) is None
+
+
+def test_load_of_a_missing_plan(tmp_path):
+    assert StatusTimeline.load(str(tmp_path / "missing.bin"), plan_key) is None
@@ -0,0 +1,58 @@
+import random
+
+from DistanceMatrix import DistanceMatrix
+from Package import Package
+from Truck import Truck
+from TruckPartitioner import NeighborSavings, get_savings, partition_packages
+
+
+# Returns a DistanceMatrix of a hub at 0 and addresses at 1, 2, ... miles along a straight road out of it
+def make_road(num_addresses):
+    address_list = ["%d Road" % index for index in range(num_addresses)]
+    distance_triangle = DistanceMatrix.empty_triangle(num_addresses)
+    for i in range(num_addresses):
+        for j in range(i):
+            distance_triangle[DistanceMatrix.triangle_index(i, j)] = i - j
+    return DistanceMatrix(address_list, distance_triangle)
+
+
+def make_package(id_number, address):
+    return Package(id_number, address, "Salt Lake City", "UT", "84101", "EOD", "1", "", "At the hub")
+
+
+def test_units_are_split_into_loads_that_fit():
+    distance_matrix = make_road(30)
+    units = [([make_package(index, "%d Road" % index)], None) for index in range(1, 30)]
+    trucks = [Truck(1, max_num_packages=10), Truck(2, max_num_packages=10)]
+
+    truck_loads = partition_packages(distance_matrix, NeighborSavings(distance_matrix, 0, 3), units, trucks)
+    assert sorted(truck_loads) == [1, 2]
+    loaded_ids = [package.id_number for packages in truck_loads.values() for package in packages]
+    assert len(loaded_ids) == len(set(loaded_ids)) == 20
+    for packages in truck_loads.values():
+        assert len(packages) == 10
+
+
+def test_groups_and_truck_restrictions_are_kept():
+    distance_matrix = make_road(10)
+    group = [make_package(1, "2 Road"), make_package(2, "9 Road")]
+    units = [(group, 2), ([make_package(3, "3 Road")], None), ([make_package(4, "8 Road")], None)]
+    trucks = [Truck(1, max_num_packages=3), Truck(2, max_num_packages=3)]
+
+    truck_loads = partition_packages(distance_matrix, NeighborSavings(distance_matrix, 0), units, trucks,
+                                     random.Random(1))
+    assert group[0] in truck_loads[2] and group[1] in truck_loads[2]
+    assert len(truck_loads[2]) <= 3
+
+
+def test_savings_are_limited_to_the_nearest_addresses():
+    distance_matrix = make_road(200)
+    neighbor_savings = NeighborSavings(distance_matrix, 0, 4)
+    clusters_at_end = {address_index: [address_index - 1] for address_index in range(1, 200)}
+
+    savings = get_savings(neighbor_savings, clusters_at_end)
+    # Each address has savings to itself and its 4 nearest addresses, and each pair is listed once
+    assert len(savings) <= 199 * 5
+    assert all(abs(address1_index - address2_index) <= 4 for _, address1_index, address2_index in savings)
+    assert [entry[0] for entry in savings] == sorted((entry[0] for entry in savings), reverse=True)
+    assert len(neighbor_savings.address_savings) == 199